@@ -0,0 +1,250 @@
+# benchmark.py
+# Micro and macro benchmarks for the rules engine, with a stored baseline to catch slowdowns.
+#
+#   python Benchmark.py                              # run everything, print ops/sec and memory
+#   python Benchmark.py --save-baseline              # store the results in benchmark_baseline.json
+#   python Benchmark.py --check --tolerance 0.2      # exit 1 if a case is >20% slower than the baseline
+#                                                    # (twice in a row) or has no baseline entry
+#   python Benchmark.py --only round                 # cases whose name contains "round"
+#
+# Every case is a (setup, op) pair: setup builds the state once, op is timed in a loop with the
+# garbage collector paused. Rates are the median of --repeat timed runs. "KiB/op" is the tracemalloc peak of a single op above what was
+# allocated before it, a stable stand-in for the allocation cost of one round or effect.
+
+import argparse
+import gc
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from Logic import (
+    Player, Deck, GameRound, RoundUI, ImmediateScheduler, CARD_PROTOTYPES, load_card_prototypes
+)
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+
+class _StopAfterDraw(ImmediateScheduler):
+    # Leaves the round right after the first draw, so start_round can be timed on its own.
+    def think(self, compute, on_done, min_delay):
+        return None
+
+
+class _FirstChoice:
+    # Stands in for GameRound.rng in the effect cases: CPU choices (RandomPolicy) always take the
+    # first option, so every op plays the same targets and guesses.
+    def choice(self, options):
+        return options[0]
+
+
+def _new_round(num_players, rng, scheduler=None):
+    players = [Player(id_num=i, name=f"CPU {i}", is_cpu=True) for i in range(num_players)]
+    deck = Deck(num_players, rng=rng)
+    deck.burn_one_card(num_players)
+    return GameRound(players, deck, None, None, RoundUI(),
+                     scheduler=scheduler if scheduler is not None else ImmediateScheduler(), rng=rng)
+
+
+def _deck_case(num_players):
+    def setup():
+        rng = random.Random(1)
+        return lambda: Deck(num_players, rng=rng)
+    return f"deck_build_shuffle_{num_players}p", setup
+
+
+def _start_round_case(num_players):
+    def setup():
+        rng = random.Random(2)
+        scheduler = _StopAfterDraw()
+
+        def op():
+            _new_round(num_players, rng, scheduler).start_round()
+        return op
+    return f"start_round_{num_players}p", setup
+
+
+def _full_round_case(num_players):
+    def setup():
+        rng = random.Random(3)
+        players = [Player(id_num=i, name=f"CPU {i}", is_cpu=True) for i in range(num_players)]
+        ui = RoundUI()
+        scheduler = ImmediateScheduler()
+
+        def op():
+            deck = Deck(num_players, rng=rng)
+            deck.burn_one_card(num_players)
+            GameRound(players, deck, None, None, ui, scheduler=scheduler, rng=rng).start_round()
+        return op
+    return f"full_round_{num_players}p", setup
+
+
+def _effect_case(card_name):
+    # Plays the card's effect from a fixed mid-turn position (acting seat holds one other card),
+    # restoring the snapshot before every play so each op sees the same state.
+    def setup():
+        proto = CARD_PROTOTYPES[card_name]
+        num_players = 4 if proto.count_classic > 0 else 6
+        rng = random.Random(4)
+        game_round = _new_round(num_players, rng, _StopAfterDraw())
+        game_round.start_round()
+        player = game_round.players[game_round.current_player_idx]
+        player.hand = [hand_card for hand_card in player.hand[:1] if hand_card.name != card_name] or [
+            CARD_PROTOTYPES['Guard']]
+        player.discard_pile.append(proto)
+        state = game_round.snapshot()
+        game_round.rng = _FirstChoice()  # restore() leaves the rng alone; this keeps every op on one path
+
+        def op():
+            game_round.restore(state)
+            game_round._execute_card_effect(player, proto)
+        return op
+    return f"effect_{card_name.lower().replace(' ', '_')}", setup
+
+
+def _deck_empty_tie_case():
+    # Deck-out with every survivor on the same card value and two sharing the best discard sum,
+    # so both tie-break stages run.
+    def setup():
+        rng = random.Random(5)
+        game_round = _new_round(4, rng, _StopAfterDraw())
+        game_round.start_round()
+        cards = CARD_PROTOTYPES
+        discards = ([cards['Guard'], cards['Baron']], [cards['Priest'], cards['Priest']],
+                    [cards['Guard'], cards['Guard']], [cards['Handmaid']])
+        for player, discard_pile in zip(game_round.players, discards):
+            player.hand = [cards['King']]
+            player.discard_pile = list(discard_pile)
+        game_round.deck.card_ids = game_round.deck.card_ids[:0]
+        state = game_round.snapshot()
+        game_round.rng = _FirstChoice()
+
+        def op():
+            game_round.restore(state)
+            game_round._end_round_deck_empty()
+        return op
+    return "end_round_deck_empty_tiebreak", setup
+
+
+def benchmark_cases():
+    cases = [_deck_case(4), _deck_case(6), _start_round_case(4)]
+    cases += [_full_round_case(n) for n in (2, 4, 6, 8)]
+    cases += [_effect_case(name) for name, proto in CARD_PROTOTYPES.items()
+              if name != 'Princess' and (proto.count_classic > 0 or proto.count_large > 0)]
+    cases.append(_deck_empty_tie_case())
+    return cases
+
+
+def _rate(op, min_time):
+    # Ops per second over at least min_time seconds, growing the batch until it is long enough.
+    batch = 1
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while True:
+            start = time.perf_counter()
+            for _ in range(batch):
+                op()
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                return batch / elapsed
+            batch = batch * 2 if elapsed < min_time / 8 else int(batch * min_time / elapsed) + 1
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _peak_kib(op, samples=20):
+    tracemalloc.start()
+    try:
+        total = 0
+        for _ in range(samples):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            op()
+            total += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return total / samples / 1024
+
+
+def run_benchmarks(only=None, min_time=0.2, repeat=5, names=None):
+    if not CARD_PROTOTYPES:
+        load_card_prototypes()
+    results = {}
+    for name, setup in benchmark_cases():
+        if only and only not in name or names is not None and name not in names:
+            continue
+        op = setup()
+        op()  # Warm caches (rulesets, deck templates) before timing
+        ops_per_sec = statistics.median(_rate(op, min_time) for _ in range(repeat))
+        results[name] = {'ops_per_sec': ops_per_sec, 'kib_per_op': _peak_kib(op)}
+    return results
+
+
+def compare(results, baseline, tolerance):
+    # Returns the cases whose rate fell more than `tolerance` (a fraction) below the baseline.
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        ratio = result['ops_per_sec'] / base['ops_per_sec']
+        if ratio < 1.0 - tolerance:
+            regressions.append((name, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Love Letter rules engine.")
+    parser.add_argument('--only', default=None, help="Run only cases whose name contains this text.")
+    parser.add_argument('--min-time', type=float, default=0.2, help="Seconds per timed run.")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true', help="Store these results as the baseline.")
+    parser.add_argument('--check', action='store_true',
+                        help="Exit 1 if a case regressed against the baseline or is missing from it.")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed slowdown before --check fails.")
+    args = parser.parse_args(argv)
+    if args.check and not args.save_baseline and not os.path.exists(args.baseline):
+        parser.error(f"--check needs a baseline, but {args.baseline} does not exist (run with --save-baseline)")
+
+    results = run_benchmarks(args.only, args.min_time, args.repeat)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+
+    print(f"{'case':34s} {'ops/sec':>12s} {'KiB/op':>9s} {'vs base':>8s}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        change = f"{result['ops_per_sec'] / base['ops_per_sec'] - 1:+.0%}" if base else "-"
+        print(f"{name:34s} {result['ops_per_sec']:12,.0f} {result['kib_per_op']:9.2f} {change:>8s}")
+
+    if args.save_baseline:
+        baseline.update(results)
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump({'python': sys.version.split()[0], 'results': baseline}, baseline_file, indent=1, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+    if args.check:
+        missing = [name for name in results if name not in baseline]
+        for name in missing:
+            print(f"MISSING: {name} has no entry in {args.baseline} (run with --save-baseline)")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            # A slow burst on a shared machine can cost a short case 20% or more; only a case that is
+            # slow again when measured a second time counts.
+            rerun = run_benchmarks(min_time=args.min_time, repeat=args.repeat,
+                                   names={name for name, _ in regressions})
+            regressions = compare(rerun, baseline, args.tolerance)
+        for name, ratio in regressions:
+            print(f"REGRESSION: {name} runs at {ratio:.0%} of the baseline rate")
+        if missing or regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,536 @@
+# endgame.py
+# Exact solver for the last few cards of a round, plus a reference implementation of the deck-out
+# showdown used to check GameRound._end_round_deck_empty.
+#
+#   python Endgame.py --players 4 --deck 2 --rounds 100 --memory
+#   python Endgame.py --players 6 --oracle 20000
+#
+# The solver drives a private GameRound through snapshot/restore. Every draw is a chance node over
+# the distinct cards left in the deck; every choice (card, target, guess) is a max^n node where the
+# chooser maximizes its own share of the round win. Values are cached in a transposition table
+# keyed on a packed byte string of the state (deck as card counts, so draw order does not matter).
+#
+# Within one deal the game is solved with all hands visible. For a CPU decision the hidden hands
+# and burned card are enumerated exhaustively and the acting player's whole turn is chosen to
+# maximize the average over those deals; later turns are played with full information.
+
+import argparse
+import random
+import time
+import tracemalloc
+from array import array
+
+from Logic import (
+    Player, Deck, GameRound, RoundUI, ImmediateScheduler, CpuPolicy, RandomPolicy,
+    CARDS_DATA_RAW, CARD_BY_ID, CARD_PROTOTYPES, PHASE_TURN_START, PHASE_CPU_THINKING, load_card_prototypes
+)
+from Policy import BeliefTracker, HeuristicPolicy, hidden_hand_seats
+
+_KIND_TURN_START = 0
+_KIND_DECISION = 1
+_NUM_CARD_IDS = len(CARDS_DATA_RAW)
+_COUNT_ID = list(CARDS_DATA_RAW).index('Count')
+_SHERIFF_ID = list(CARDS_DATA_RAW).index('Sheriff')
+
+
+def showdown_winners(players, count_in_deck):
+    # Reference for the deck-out comparison: highest hand value wins, +1 for every Count in the
+    # player's discard pile; ties go to the highest discard sum; remaining ties all win.
+    contenders = [p for p in players if not p.is_eliminated and p.hand]
+    if not contenders:
+        return []
+
+    def strength(player):
+        bonus = sum(1 for c in player.discard_pile if c.name == 'Count') if count_in_deck else 0
+        return player.hand[0].value + bonus
+
+    best = max(strength(p) for p in contenders)
+    tied = [p for p in contenders if strength(p) == best]
+    if len(tied) == 1:
+        return tied
+    best_sum = max(sum(c.value for c in p.discard_pile) for p in tied)
+    return [p for p in tied if sum(c.value for c in p.discard_pile) == best_sum]
+
+
+def _state_key(game_round, kind):
+    # Only what can still change the outcome: deck contents (not order), hands, flags, and the
+    # discard pile reduced to its value sum, Count copies and Sheriff.
+    burned = game_round.shared_burned_card_ref['card']
+    key = bytearray((kind, game_round.current_player_idx, burned.card_id + 1 if burned is not None else 0))
+    key += bytes(_NUM_CARD_IDS)
+    for card_id in game_round.deck.card_ids:
+        key[3 + card_id] += 1
+    for p in game_round.players:
+        discard_sum = counts_discarded = sheriff = 0
+        for card in p.discard_pile:
+            discard_sum += card.value
+            if card.card_id == _COUNT_ID:
+                counts_discarded += 1
+            elif card.card_id == _SHERIFF_ID:
+                sheriff = 8
+        hand = p.hand
+        jester = p.jester_on_player_id
+        key += bytes((p.is_eliminated | p.is_protected << 1 | p.sycophant_target_self << 2 | sheriff,
+                      discard_sum, counts_discarded, jester + 1 if jester is not None else 0, len(hand)))
+        if len(hand) == 1:
+            key.append(hand[0].card_id)
+        elif hand:
+            key += bytes(sorted(card.card_id for card in hand))
+    return bytes(key)
+
+
+def _move_to_top(card_ids, card_id):
+    # The deck draws from the end.
+    index = len(card_ids) - 1 - card_ids[::-1].index(card_id)
+    card_ids[index], card_ids[-1] = card_ids[-1], card_ids[index]
+
+
+def _distinct_draws(card_ids):
+    # (card id, probability) for the next card drawn.
+    counts = {}
+    for card_id in card_ids:
+        counts[card_id] = counts.get(card_id, 0) + 1
+    total = len(card_ids)
+    return [(card_id, n / total) for card_id, n in counts.items()]
+
+
+class _Branch(Exception):
+    # Raised by _ReplayPolicy at the first choice not covered by the line being replayed.
+    def __init__(self, player_id, options):
+        Exception.__init__(self)
+        self.player_id = player_id
+        self.options = options
+
+
+class _OutOfBudget(Exception):
+    # Raised at the next new node or deal once solve's node or time budget is spent, or on cancel().
+    pass
+
+
+class _TooManyDeals(Exception):
+    pass
+
+
+class _ReplayPolicy(CpuPolicy):
+    # Plays back a line of choice keys (card name, target id, guessed value).
+    def __init__(self):
+        self.line = ()
+        self.position = 0
+
+    def _pick(self, player, options, key):
+        if self.position < len(self.line):
+            wanted = self.line[self.position]
+            self.position += 1
+            for option in options:
+                if key(option) == wanted:
+                    return option
+        keys = []
+        for option in options:
+            option_key = key(option)
+            if option_key not in keys:
+                keys.append(option_key)
+        raise _Branch(player.id, keys)
+
+    def choose_card(self, game_round, player, playable_cards):
+        return self._pick(player, playable_cards, lambda card: card.name)
+
+    def choose_target(self, game_round, player, card_played, valid_targets):
+        return self._pick(player, valid_targets, lambda target: target.id)
+
+    def choose_guess(self, game_round, player, target_player, possible_values):
+        return self._pick(player, possible_values, lambda value: value)
+
+
+class _PausingScheduler(ImmediateScheduler):
+    # Leaves the round in PHASE_CPU_THINKING after the draw so the solver can branch there.
+    def think(self, compute, on_done, min_delay):
+        return None
+
+
+class _SolverRound(GameRound):
+    # Stops at every turn start so the solver can branch on the card drawn.
+    def _process_current_player_turn_start(self):
+        if self.round_active:
+            self.phase = PHASE_TURN_START
+
+
+class EndgameSolver:
+    def __init__(self, num_players, check_showdowns=False, max_table_entries=500000):
+        self._replay = _ReplayPolicy()
+        players = [Player(id_num=i, name=f"Solver {i}", is_cpu=True, policy=self._replay)
+                   for i in range(num_players)]
+        deck = Deck(num_players, rng=random.Random(0))
+        self.round = _SolverRound(players, deck, None, None, RoundUI(),
+                                  scheduler=_PausingScheduler())
+        self.table = {}  # packed state -> value tuple (round win share per seat)
+        self.max_table_entries = max_table_entries
+        self.check_showdowns = check_showdowns
+        self.showdown_checks = 0
+        self.showdown_mismatches = []  # (engine winner ids, reference winner ids)
+        self.solves = 0
+        self.abandoned = 0  # Solves that ran out of budget
+        self.nodes = 0
+        self.table_hits = 0
+        self.elapsed = 0.0
+        self._node_limit = float('inf')  # Only finite while solve runs
+        self._deadline = float('inf')
+        self._cancel_requested = False
+
+    def cancel(self):
+        # May be called from another thread; the solve in progress gives up at its next node or deal.
+        self._cancel_requested = True
+
+    def _check_time(self):
+        if self._cancel_requested or time.perf_counter() > self._deadline:
+            raise _OutOfBudget()
+
+    def _count_node(self):
+        # Table entries are only stored once complete, so giving up here leaves the table valid.
+        self.nodes += 1
+        if self.nodes > self._node_limit:
+            raise _OutOfBudget()
+        self._check_time()
+
+    def _run_line(self, state, line, top_card_id=None):
+        # Replays one turn from a decision state. Returns a _Branch if the line is incomplete,
+        # otherwise None with the round stopped at the next turn start or the end of the round.
+        game_round = self.round
+        game_round.restore(state)
+        if top_card_id is not None:
+            _move_to_top(game_round.deck.card_ids, top_card_id)
+        replay = self._replay
+        replay.line = line
+        replay.position = 0
+        try:
+            game_round._queue_step(game_round._cpu_play_turn, game_round.players[game_round.current_player_idx])
+        except _Branch as branch:
+            return branch
+        return None
+
+    def _terminal_value(self):
+        game_round = self.round
+        value = [0.0] * len(game_round.players)
+        winners = game_round.round_winners
+        for winner in winners:
+            value[winner.id] = 1.0 / len(winners)
+        if self.check_showdowns and sum(1 for p in game_round.players if not p.is_eliminated) > 1:
+            self.showdown_checks += 1
+            engine_ids = sorted(p.id for p in winners)
+            reference_ids = sorted(p.id for p in showdown_winners(game_round.players, game_round.rules.has('Count')))
+            if engine_ids != reference_ids:
+                self.showdown_mismatches.append((engine_ids, reference_ids))
+        return tuple(value)
+
+    def _after_turn_value(self):
+        game_round = self.round
+        if not game_round.round_active:
+            return self._terminal_value()
+        if game_round.phase == PHASE_CPU_THINKING:
+            return self._decision_value(game_round.snapshot())
+        return self._turn_start_value(game_round.snapshot())
+
+    def _turn_start_value(self, state):
+        game_round = self.round
+        game_round.restore(state)
+        key = _state_key(game_round, _KIND_TURN_START)
+        value = self.table.get(key)
+        if value is not None:
+            self.table_hits += 1
+            return value
+        self._count_node()
+        if not state.deck_card_ids:
+            GameRound._process_current_player_turn_start(game_round)  # Deck-out showdown
+            value = self._after_turn_value()
+        else:
+            totals = [0.0] * len(game_round.players)
+            for card_id, probability in _distinct_draws(state.deck_card_ids):
+                game_round.restore(state)
+                _move_to_top(game_round.deck.card_ids, card_id)
+                GameRound._process_current_player_turn_start(game_round)
+                for seat, share in enumerate(self._after_turn_value()):
+                    totals[seat] += probability * share
+            value = tuple(totals)
+        self.table[key] = value
+        return value
+
+    def _decision_value(self, state):
+        self.round.restore(state)
+        key = _state_key(self.round, _KIND_DECISION)
+        value = self.table.get(key)
+        if value is not None:
+            self.table_hits += 1
+            return value
+        self._count_node()
+        value = self._best_line(state, ())[0]
+        self.table[key] = value
+        return value
+
+    def _line_outcome_value(self, state, line):
+        # Call right after a complete _run_line(state, line). Draws made during the turn (Prince,
+        # Assassin) are chance events: replay the line once per distinct top card.
+        game_round = self.round
+        if len(game_round.deck.card_ids) == len(state.deck_card_ids):
+            return self._after_turn_value()
+        draws = _distinct_draws(state.deck_card_ids)
+        if len(draws) == 1:
+            return self._after_turn_value()
+        totals = [0.0] * len(game_round.players)
+        for card_id, probability in draws:
+            self._run_line(state, line, card_id)
+            for seat, share in enumerate(self._after_turn_value()):
+                totals[seat] += probability * share
+        return tuple(totals)
+
+    def _best_line(self, state, line):
+        branch = self._run_line(state, line)
+        if branch is None:
+            return self._line_outcome_value(state, line), line
+        best = None
+        for option in branch.options:
+            result = self._best_line(state, line + (option,))
+            if best is None or result[0][branch.player_id] > best[0][branch.player_id]:
+                best = result
+        return best
+
+    def _root_line(self, deals, player_id, line):
+        # Like _best_line, but each choice of the acting player is scored by its average over all deals.
+        expected = 0.0
+        for state, weight in deals:
+            self._check_time()
+            branch = self._run_line(state, line)
+            if branch is not None:
+                break
+            expected += weight * self._line_outcome_value(state, line)[player_id]
+        else:
+            return expected, line
+        best = None
+        for option in branch.options:
+            result = self._root_line(deals, player_id, line + (option,))
+            if best is None or result[0] > best[0]:
+                best = result
+        return best
+
+    def deals(self, state, observer_id, known_hands, max_deals=None):
+        # Every way to place the cards the observer has not seen, as (snapshot, probability), or None
+        # as soon as there turn out to be more than max_deals of them.
+        pool = {}
+        for card_id in state.deck_card_ids:
+            pool[card_id] = pool.get(card_id, 0) + 1
+        burned = state.burned_card
+        if burned is not None:
+            pool[burned.card_id] = pool.get(burned.card_id, 0) + 1
+        hidden_seats = hidden_hand_seats([player_state[0] for player_state in state.player_states],
+                                         observer_id, known_hands)
+        for seat in hidden_seats:
+            for card in state.player_states[seat][0]:
+                pool[card.card_id] = pool.get(card.card_id, 0) + 1
+        slots = [seat for seat in hidden_seats for _ in state.player_states[seat][0]]
+        if burned is not None:
+            slots.append(None)  # The burned card
+
+        results = []
+        total = sum(pool.values())
+
+        def place(slot_index, chosen, remaining, probability):
+            if slot_index == len(slots):
+                hands = {}
+                burned_card = None
+                for slot, card_id in zip(slots, chosen):
+                    if slot is None:
+                        burned_card = CARD_BY_ID[card_id]
+                    else:
+                        hands.setdefault(slot, []).append(CARD_BY_ID[card_id])
+                player_states = tuple((tuple(hands[seat]),) + player_state[1:] if seat in hands else player_state
+                                      for seat, player_state in enumerate(state.player_states))
+                if max_deals is not None and len(results) >= max_deals:
+                    raise _TooManyDeals()
+                deck_ids = array('b', [card_id for card_id, n in pool.items() for _ in range(n)])
+                results.append((state._replace(deck_card_ids=deck_ids, burned_card=burned_card,
+                                               player_states=player_states), probability))
+                return
+            self._check_time()
+            for card_id, n in list(pool.items()):
+                if n == 0:
+                    continue
+                pool[card_id] = n - 1
+                chosen.append(card_id)
+                place(slot_index + 1, chosen, remaining - 1, probability * n / remaining)
+                chosen.pop()
+                pool[card_id] = n
+
+        try:
+            place(0, [], total, 1.0)
+        except _TooManyDeals:
+            return None
+        return results
+
+    def solve(self, game_round, player, known_hands=None, max_deals=None, max_nodes=None, time_budget=None):
+        # Best line (card name, then target id / guessed value as needed) for the player whose card
+        # choice is pending in game_round, and its expected round win share. None if there are more
+        # than max_deals ways to deal the hidden cards, or if solving needs more than max_nodes new
+        # nodes or time_budget seconds.
+        start = time.perf_counter()
+        self._cancel_requested = False
+        self._node_limit = self.nodes + max_nodes if max_nodes is not None else float('inf')
+        self._deadline = start + time_budget if time_budget is not None else float('inf')
+        try:
+            deals = self.deals(game_round.snapshot(), player.id, known_hands or {}, max_deals)
+            if deals is None:
+                return None
+            if len(self.table) > self.max_table_entries:
+                self.table.clear()
+            value, line = self._root_line(deals, player.id, ())
+        except _OutOfBudget:
+            self.abandoned += 1
+            return None
+        finally:
+            self._node_limit = self._deadline = float('inf')
+            self.elapsed += time.perf_counter() - start
+        self.solves += 1
+        return line, value
+
+    def report(self):
+        rate = self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+        return (f"Endgame solver: {self.solves} solves, {self.abandoned} over budget, {self.nodes} nodes, "
+                f"{self.table_hits} table hits, {len(self.table)} entries, {self.elapsed:.2f}s ({rate:,.0f} nodes/sec)")
+
+
+class EndgamePolicy(CpuPolicy):
+    # Plays solved lines once the deck has `threshold` cards or fewer, otherwise defers to fallback,
+    # as it also does when a solve needs more than max_nodes new nodes or time_budget seconds. The
+    # node budget keeps seeded simulations repeatable; the time budget bounds a move in the UI.
+    uses_beliefs = True
+
+    def __init__(self, fallback=None, threshold=2, max_deals=400, max_nodes=2000, time_budget=None):
+        self.fallback = fallback if fallback is not None else HeuristicPolicy()
+        self.threshold = threshold
+        self.max_deals = max_deals
+        self.max_nodes = max_nodes
+        self.time_budget = time_budget
+        self._solvers = {}  # player count -> EndgameSolver
+        self._line = None
+        self._line_turn = None
+
+    def cancel(self):
+        for solver in list(self._solvers.values()):
+            solver.cancel()
+        self.fallback.cancel()
+
+    def solver(self, num_players):
+        solver = self._solvers.get(num_players)
+        if solver is None:
+            solver = self._solvers[num_players] = EndgameSolver(num_players)
+        return solver
+
+    def choose_card(self, game_round, player, playable_cards):
+        self._line = None
+        if game_round.deck.count() <= self.threshold:
+            tracker = game_round.belief_tracker
+            belief = tracker.states.get(player.id) if tracker is not None else None
+            solved = self.solver(len(game_round.players)).solve(
+                game_round, player, belief.known_hands if belief is not None else None, self.max_deals,
+                self.max_nodes, self.time_budget)
+            if solved is not None:
+                line = solved[0]
+                for card in playable_cards:
+                    if card.name == line[0]:
+                        self._line = line
+                        self._line_position = 1
+                        self._line_turn = (game_round, game_round.turn_count, player.id)
+                        return card
+        return self.fallback.choose_card(game_round, player, playable_cards)
+
+    def _planned(self, game_round, player, options, key):
+        line = self._line
+        if line is None or self._line_turn != (game_round, game_round.turn_count, player.id) \
+                or self._line_position >= len(line):
+            return None
+        wanted = line[self._line_position]
+        self._line_position += 1
+        for option in options:
+            if key(option) == wanted:
+                return option
+        return None
+
+    def choose_target(self, game_round, player, card_played, valid_targets):
+        choice = self._planned(game_round, player, valid_targets, lambda target: target.id)
+        if choice is None:
+            return self.fallback.choose_target(game_round, player, card_played, valid_targets)
+        return choice
+
+    def choose_guess(self, game_round, player, target_player, possible_values):
+        choice = self._planned(game_round, player, possible_values, lambda value: value)
+        if choice is None:
+            return self.fallback.choose_guess(game_round, player, target_player, possible_values)
+        return choice
+
+
+def check_showdowns(num_players, num_rounds, seed=None):
+    # Plays random rounds and compares every deck-out result with showdown_winners.
+    rng = random.Random(seed)
+    checked = 0
+    mismatches = []
+    for _ in range(num_rounds):
+        players = [Player(id_num=i, name=f"CPU {i}", is_cpu=True) for i in range(num_players)]
+        deck = Deck(num_players, rng=rng)
+        deck.burn_one_card(num_players)
+        game_round = GameRound(players, deck, None, None, scheduler=ImmediateScheduler(), rng=rng)
+        game_round.start_round()
+        if sum(1 for p in players if not p.is_eliminated) > 1:
+            checked += 1
+            engine_ids = sorted(p.id for p in game_round.round_winners)
+            reference_ids = sorted(p.id for p in showdown_winners(players, game_round.rules.has('Count')))
+            if engine_ids != reference_ids:
+                mismatches.append((engine_ids, reference_ids, [repr(p) for p in players]))
+    return checked, mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the endgame solver or check deck-out tie-breaks.")
+    parser.add_argument('--players', type=int, default=4, choices=range(2, 9))
+    parser.add_argument('--deck', type=int, default=2, help="Solve once the deck has this many cards or fewer.")
+    parser.add_argument('--rounds', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--memory', action='store_true', help="Trace peak memory (slower).")
+    parser.add_argument('--max-nodes', type=int, default=None, help="Fall back to the heuristic after this many "
+                                                                   "new nodes in one solve (default: no limit).")
+    parser.add_argument('--budget', type=float, default=None, help="Same, after this many seconds.")
+    parser.add_argument('--oracle', type=int, default=0, metavar='ROUNDS',
+                        help="Instead of benchmarking, check ROUNDS deck-out showdowns against the reference.")
+    args = parser.parse_args(argv)
+
+    if not CARD_PROTOTYPES:
+        load_card_prototypes()
+    if args.oracle:
+        checked, mismatches = check_showdowns(args.players, args.oracle, args.seed)
+        print(f"Checked {checked} deck-out showdowns: {len(mismatches)} mismatches")
+        for engine_ids, reference_ids, hands in mismatches[:10]:
+            print(f"  engine {engine_ids} vs reference {reference_ids}: {hands}")
+        return
+
+    rng = random.Random(args.seed)
+    solver_policy = EndgamePolicy(threshold=args.deck, max_nodes=args.max_nodes, time_budget=args.budget)
+    players = [Player(id_num=0, name="Endgame", is_cpu=True, policy=solver_policy)]
+    players += [Player(id_num=i, name=f"CPU {i}", is_cpu=True, policy=RandomPolicy()) for i in range(1, args.players)]
+    if args.memory:
+        tracemalloc.start()
+    wins = 0.0
+    for _ in range(args.rounds):
+        deck = Deck(args.players, rng=rng)
+        deck.burn_one_card(args.players)
+        game_round = GameRound(players, deck, None, None, scheduler=ImmediateScheduler(), rng=rng,
+                               belief_tracker=BeliefTracker())
+        game_round.start_round()
+        if players[0] in game_round.round_winners:
+            wins += 1.0 / len(game_round.round_winners)
+    solver = solver_policy.solver(args.players)
+    print(f"Seat 0 round share: {wins / args.rounds:.2%} (fair share {1 / args.players:.2%})")
+    print(solver.report())
+    if args.memory:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"Memory: {current / 1024:.0f} KiB held, {peak / 1024:.0f} KiB peak")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,253 @@
+# events.py
+# Typed records GameRound emits while a round is played. Events hold player ids and Card prototypes,
+# never text. render_event turns one into log lines for a given viewer, only when a subscriber asks.
+#
+# GameRound builds an event only when its EventStream has subscribers, so a round nobody listens to
+# pays one attribute check per action and formats nothing.
+
+from collections import namedtuple
+
+ROUND_END_ELIMINATION = 'elimination'
+ROUND_END_DECK_OUT = 'deck_out'
+
+RoundStarted = namedtuple('RoundStarted', ['first_player_id'])
+TurnStarted = namedtuple('TurnStarted', ['player_id'])
+CardDrawn = namedtuple('CardDrawn', ['player_id', 'card', 'hand_size'])  # card is private to player_id
+CardPlayed = namedtuple('CardPlayed', ['player_id', 'card'])
+CardDiscarded = namedtuple('CardDiscarded', ['player_id', 'card'])  # Forced discard (Prince, Assassin)
+Eliminated = namedtuple('Eliminated', ['player_id', 'cause'])
+GuardGuess = namedtuple('GuardGuess', ['player_id', 'target_id', 'value', 'revealed_card'])  # revealed_card None if wrong
+AssassinRevealed = namedtuple('AssassinRevealed', ['player_id', 'guard_player_id'])
+# card is private to player_id; source is the card that allowed the look (Priest, Baroness, Cardinal)
+HandSeen = namedtuple('HandSeen', ['player_id', 'target_id', 'card', 'source'])
+# Baron (lower card is out) and Queen Mother (higher card is out); source is the card that was played
+BaronCompare = namedtuple('BaronCompare', ['player_id', 'target_id', 'player_card', 'target_card', 'loser_id',
+                                           'source'])
+Protected = namedtuple('Protected', ['player_id'])
+PrinceTarget = namedtuple('PrinceTarget', ['player_id', 'target_id'])
+Swap = namedtuple('Swap', ['player_id', 'target_id', 'player_received', 'target_received'])
+TokenGained = namedtuple('TokenGained', ['player_id', 'card'])  # Token earned from a card (Sheriff, Bishop, Jester)
+JesterMarked = namedtuple('JesterMarked', ['player_id', 'target_id'])
+SycophantMarked = namedtuple('SycophantMarked', ['player_id', 'target_id'])
+CardinalSwap = namedtuple('CardinalSwap', ['player_id', 'first_id', 'second_id'])
+BishopGuess = namedtuple('BishopGuess', ['player_id', 'target_id', 'value', 'correct'])
+# entries: (player id, hand card, effective value, discard sum) for every player still holding a card
+Showdown = namedtuple('Showdown', ['entries', 'winner_ids'])
+RoundEnded = namedtuple('RoundEnded', ['reason', 'winner_ids'])
+Message = namedtuple('Message', ['text'])  # Rule hints, fizzles and errors that have no structure worth keeping
+
+
+class EventStream:
+    def __init__(self):
+        self.subscribers = []
+        self.enabled = False  # GameRound checks this before building an event
+
+    def subscribe(self, subscriber):
+        self.subscribers.append(subscriber)
+        self.enabled = True
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        self.subscribers.remove(subscriber)
+        self.enabled = bool(self.subscribers)
+
+    def emit(self, event):
+        for subscriber in self.subscribers:
+            subscriber(event)
+
+
+# --- Text rendering ---
+# Each renderer returns the log lines for one event; `names` maps player id -> display name and
+# viewer_id is the human seat (None for a spectator), which decides what private cards are shown.
+
+def _render_round_started(event, names, viewer_id):
+    return ["--- Starting New Round (GameRound) ---", f"Round started. {names[event.first_player_id]} goes first."]
+
+
+def _render_turn_started(event, names, viewer_id):
+    if event.player_id == viewer_id:
+        return [f"--- Your turn ({names[event.player_id]}) ---"]
+    return [f"--- {names[event.player_id]}'s turn ---"]
+
+
+def _render_card_drawn(event, names, viewer_id):
+    if event.player_id == viewer_id:
+        return [f"You ({names[event.player_id]}) drew {event.card.name}."]
+    return [f"{names[event.player_id]} drew a card. Hand size: {event.hand_size}."]
+
+
+def _render_card_played(event, names, viewer_id):
+    return [f"{names[event.player_id]} plays {event.card.name}."]
+
+
+def _render_card_discarded(event, names, viewer_id):
+    return [f"{names[event.player_id]} discards {event.card.name}."]
+
+
+def _render_eliminated(event, names, viewer_id):
+    name = names[event.player_id]
+    if event.cause == 'Forfeit':
+        return [f"{name} forfeits the round."]
+    if event.cause == 'Princess':
+        return [f"{name} discarded the Princess and is eliminated!"]
+    return [f"{name} has been eliminated!"]
+
+
+def _render_guard_guess(event, names, viewer_id):
+    target = names[event.target_id]
+    lines = [f"{names[event.player_id]} (Guard) guesses value {event.value} for {target}."]
+    if event.revealed_card is not None:
+        lines.append(f"Correct! {target} had {event.revealed_card.name}. Eliminated.")
+    else:
+        lines.append(f"Incorrect guess. {target} did not have value {event.value}.")
+    return lines
+
+
+def _render_assassin_revealed(event, names, viewer_id):
+    return [f"{names[event.player_id]} reveals Assassin! {names[event.guard_player_id]} is eliminated!"]
+
+
+def _render_hand_seen(event, names, viewer_id):
+    viewer, target, source = names[event.player_id], names[event.target_id], event.source.name
+    if event.player_id == viewer_id:
+        return [f"You ({viewer}) use {source} on {target} and see their {event.card.name}."]
+    if event.target_id == viewer_id:
+        return [f"{viewer} ({source}) looks at your hand and sees your {event.card.name}."]
+    return [f"{viewer} ({source}) looks at {target}'s hand."]
+
+
+def _render_baron_compare(event, names, viewer_id):
+    player, target = names[event.player_id], names[event.target_id]
+    line = (f"{event.source.name}: {player}({event.player_card.name} V:{event.player_card.value}) vs "
+            f"{target}({event.target_card.name} V:{event.target_card.value}). ")
+    if event.loser_id is None:
+        return [line + "Tie. No one eliminated."]
+    return [line + f"{names[event.loser_id]} is eliminated."]
+
+
+def _render_protected(event, names, viewer_id):
+    return [f"{names[event.player_id]} plays Handmaid and is protected."]
+
+
+def _render_prince_target(event, names, viewer_id):
+    return [f"{names[event.player_id]} (Prince) targets {names[event.target_id]} to discard and draw."]
+
+
+def _render_swap(event, names, viewer_id):
+    player, target = names[event.player_id], names[event.target_id]
+    return [f"{player} (King) swaps hand with {target}. "
+            f"{player} gets {event.player_received.name}, {target} gets {event.target_received.name}."]
+
+
+def _render_token_gained(event, names, viewer_id):
+    name = names[event.player_id]
+    if event.card.name == 'Bishop':
+        return [f"{name} named the right card with the Bishop and gains a token!"]
+    if event.card.name == 'Jester':
+        return [f"{name} bet on the round winner with the Jester and gains a token!"]
+    return [f"{name} had {event.card.name} in discard and gains a token!"]
+
+
+def _render_jester_marked(event, names, viewer_id):
+    return [f"{names[event.player_id]} (Jester) bets on {names[event.target_id]} winning the round."]
+
+
+def _render_sycophant_marked(event, names, viewer_id):
+    return [f"{names[event.player_id]} (Sycophant): {names[event.target_id]} must target themselves "
+            f"with their next card."]
+
+
+def _render_cardinal_swap(event, names, viewer_id):
+    return [f"{names[event.player_id]} (Cardinal) makes {names[event.first_id]} and {names[event.second_id]} "
+            f"swap hands."]
+
+
+def _render_bishop_guess(event, names, viewer_id):
+    target = names[event.target_id]
+    lines = [f"{names[event.player_id]} (Bishop) guesses value {event.value} for {target}."]
+    if event.correct:
+        lines.append(f"Correct! {target} may discard their card and draw a new one.")
+    else:
+        lines.append(f"Incorrect guess. {target} did not have value {event.value}.")
+    return lines
+
+
+def _render_showdown(event, names, viewer_id):
+    lines = ["Round ends: deck is empty. Comparing hands of remaining active players."]
+    for player_id, card, effective_value, discard_sum in event.entries:
+        if effective_value != card.value:
+            lines.append(f"{names[player_id]} has {effective_value - card.value} Count(s) in discard. "
+                         f"Hand: {card.name}, Effective Value: {effective_value}")
+    highest = max(entry[2] for entry in event.entries)
+    tied = [entry for entry in event.entries if entry[2] == highest]
+    if len(tied) == 1:
+        player_id, card, effective_value, _ = tied[0]
+        lines.append(f"{names[player_id]} has the highest card ({card.name}, effective value {effective_value}) and wins!")
+        return lines
+    lines.append(f"Tie in card values at {highest}. Comparing sum of discarded card values.")
+    for player_id, card, effective_value, discard_sum in tied:
+        lines.append(f"{names[player_id]} (Card: {card.name}, Eff: {effective_value}) discard sum: {discard_sum}")
+    if len(event.winner_ids) == 1:
+        winner_sum = next(entry[3] for entry in tied if entry[0] == event.winner_ids[0])
+        lines.append(f"{names[event.winner_ids[0]]} wins the tie-breaker with highest discard sum ({winner_sum})!")
+    else:
+        lines.append(f"Still a tie! {[names[player_id] for player_id in event.winner_ids]} win this round.")
+    return lines
+
+
+def _render_round_ended(event, names, viewer_id):
+    if event.reason == ROUND_END_DECK_OUT:
+        if event.winner_ids:
+            return []  # The Showdown event already told the story
+        return ["Round ends: deck is empty. No active players with cards remaining. No winner this round."]
+    lines = ["Round ends: one or zero players remain active."]
+    if event.winner_ids:
+        lines.append(f"{names[event.winner_ids[0]]} is the last player remaining and wins the round!")
+    else:
+        lines.append("All players were eliminated simultaneously! No winner this round from eliminations.")
+    return lines
+
+
+def _render_message(event, names, viewer_id):
+    return [event.text]
+
+
+_RENDERERS = {
+    RoundStarted: _render_round_started,
+    TurnStarted: _render_turn_started,
+    CardDrawn: _render_card_drawn,
+    CardPlayed: _render_card_played,
+    CardDiscarded: _render_card_discarded,
+    Eliminated: _render_eliminated,
+    GuardGuess: _render_guard_guess,
+    AssassinRevealed: _render_assassin_revealed,
+    HandSeen: _render_hand_seen,
+    BaronCompare: _render_baron_compare,
+    Protected: _render_protected,
+    PrinceTarget: _render_prince_target,
+    Swap: _render_swap,
+    TokenGained: _render_token_gained,
+    JesterMarked: _render_jester_marked,
+    SycophantMarked: _render_sycophant_marked,
+    CardinalSwap: _render_cardinal_swap,
+    BishopGuess: _render_bishop_guess,
+    Showdown: _render_showdown,
+    RoundEnded: _render_round_ended,
+    Message: _render_message,
+}
+
+
+def render_event(event, names, viewer_id=None):
+    return _RENDERERS[type(event)](event, names, viewer_id)
+
+
+class TextLog:
+    # Subscriber that renders events as log lines and passes them to log_callback (e.g. the UI log).
+    def __init__(self, log_callback, players, viewer_id=None):
+        self.log_callback = log_callback
+        self.names = {p.id: p.name for p in players}
+        self.viewer_id = viewer_id
+
+    def __call__(self, event):
+        for line in render_event(event, self.names, self.viewer_id):
+            self.log_callback(line)
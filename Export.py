@@ -0,0 +1,221 @@
+# export.py
+# Columnar per-turn export for balance analysis. TurnExporter listens to a round's events and
+# writes one row per card played into a directory holding one raw file per column (plus
+# columns.json with the type codes). Rows are buffered in array('b'/'I') columns and appended to
+# the files every chunk_rows rows, so memory stays bounded however long the run is, and a reader
+# loads only the columns it asks for. numpy is optional (requirements-analysis.txt):
+# load_columns(..., as_numpy=True).
+#
+#   python Simulation.py --sessions 10000 --export turns      # writes turns.00000/, turns.00001/, ...
+#   python Export.py turns.*
+#
+# Card ids are positions in CARDS_DATA_RAW (Card.card_id). -1 means "none" in the seat/value columns.
+
+import argparse
+import json
+import os
+from array import array
+from collections import Counter
+
+from Events import (
+    RoundStarted, CardPlayed, Eliminated, GuardGuess, AssassinRevealed, HandSeen, BaronCompare, Protected,
+    PrinceTarget, Swap, JesterMarked, SycophantMarked, CardinalSwap, BishopGuess
+)
+from Logic import CARDS_DATA_RAW
+
+OUTCOME_NONE = 0  # No effect, or the effect fizzled
+OUTCOME_GUARD_HIT = 1
+OUTCOME_GUARD_MISS = 2
+OUTCOME_ASSASSIN = 3  # The Guard's target revealed an Assassin
+OUTCOME_SEEN = 4
+OUTCOME_BARON_WIN = 5
+OUTCOME_BARON_LOSS = 6
+OUTCOME_BARON_TIE = 7
+OUTCOME_PROTECTED = 8
+OUTCOME_PRINCE = 9
+OUTCOME_SWAP = 10
+OUTCOME_JESTER = 11
+OUTCOME_SYCOPHANT = 12
+OUTCOME_CARDINAL = 13  # target is the first of the two seats that swapped
+OUTCOME_BISHOP_HIT = 14
+OUTCOME_BISHOP_MISS = 15
+OUTCOME_NAMES = ['none', 'guard_hit', 'guard_miss', 'assassin', 'seen', 'baron_win', 'baron_loss', 'baron_tie',
+                 'protected', 'prince', 'swap', 'jester', 'sycophant', 'cardinal', 'bishop_hit', 'bishop_miss']
+
+# name -> array type code
+TURN_COLUMNS = {
+    'round_id': 'I',
+    'turn': 'b',
+    'seat': 'b',
+    'card': 'b',
+    'target': 'b',
+    'guess': 'b',
+    'outcome': 'b',
+    'eliminated': 'b',  # First seat eliminated by this play
+    'deck_remaining': 'b',
+}
+
+_NUMPY_DTYPES = {'b': 'int8', 'B': 'uint8', 'h': 'int16', 'i': 'int32', 'I': 'uint32', 'q': 'int64', 'd': 'float64'}
+
+
+class ColumnWriter:
+    def __init__(self, directory, columns, chunk_rows=65536):
+        self.directory = directory
+        self.columns = dict(columns)
+        self.chunk_rows = chunk_rows
+        self.rows = 0
+        self.chunks = 0
+        self._buffered = 0
+        self.buffers = {name: array(typecode) for name, typecode in self.columns.items()}
+        os.makedirs(directory, exist_ok=True)
+        for name in self.columns:
+            open(self._column_path(name), 'wb').close()
+
+    def _column_path(self, name):
+        return os.path.join(self.directory, name + '.col')
+
+    def append(self, row):
+        # row: values in the order of `columns`
+        for buffer, value in zip(self.buffers.values(), row):
+            buffer.append(value)
+        self.rows += 1
+        self._buffered += 1
+        if self._buffered >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        if not self._buffered:
+            return
+        for name, buffer in self.buffers.items():
+            with open(self._column_path(name), 'ab') as column_file:
+                buffer.tofile(column_file)
+            del buffer[:]
+        self._buffered = 0
+        self.chunks += 1
+
+    def close(self):
+        self.flush()
+        with open(os.path.join(self.directory, 'columns.json'), 'w') as meta_file:
+            json.dump({'columns': self.columns, 'rows': self.rows, 'chunks': self.chunks}, meta_file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def load_columns(directory, names=None, as_numpy=False):
+    # Returns {name: array} (or numpy arrays) for the requested columns only.
+    with open(os.path.join(directory, 'columns.json')) as meta_file:
+        meta = json.load(meta_file)
+    names = list(meta['columns']) if names is None else names
+    loaded = {}
+    for name in names:
+        typecode = meta['columns'][name]
+        path = os.path.join(directory, name + '.col')
+        if as_numpy:
+            import numpy as np
+            loaded[name] = np.fromfile(path, dtype=_NUMPY_DTYPES[typecode])
+        else:
+            column = array(typecode)
+            with open(path, 'rb') as column_file:
+                column.frombytes(column_file.read())
+            loaded[name] = column
+    return loaded
+
+
+class TurnExporter:
+    # Subscribe with watch(game_round) before start_round; one exporter can follow many rounds.
+    def __init__(self, writer):
+        self.writer = writer
+        self.round_id = -1
+        self.game_round = None
+        self._row = None
+
+    def watch(self, game_round):
+        self.game_round = game_round
+        game_round.events.subscribe(self)
+
+    def _finish_row(self):
+        if self._row is not None:
+            self.writer.append(self._row)
+            self._row = None
+
+    def __call__(self, event):
+        kind = type(event)
+        if kind is CardPlayed:
+            self._finish_row()
+            game_round = self.game_round
+            # round_id, turn, seat, card, target, guess, outcome, eliminated, deck_remaining
+            self._row = [self.round_id, game_round.turn_count, event.player_id, event.card.card_id, -1, -1,
+                         OUTCOME_NONE, -1, len(game_round.deck.card_ids)]
+            return
+        if kind is RoundStarted:
+            self._finish_row()
+            self.round_id += 1
+            return
+        row = self._row
+        if row is None:
+            return
+        if kind is Eliminated:
+            if row[7] == -1:
+                row[7] = event.player_id
+        elif kind is GuardGuess:
+            row[4], row[5] = event.target_id, event.value
+            row[6] = OUTCOME_GUARD_HIT if event.revealed_card is not None else OUTCOME_GUARD_MISS
+        elif kind is AssassinRevealed:
+            row[4], row[6] = event.player_id, OUTCOME_ASSASSIN
+        elif kind is HandSeen:
+            if row[6] == OUTCOME_NONE:  # Baroness keeps its first look, Cardinal its swap
+                row[4], row[6] = event.target_id, OUTCOME_SEEN
+        elif kind is BaronCompare:  # Baron or Queen Mother (see the card column): win/loss is from the player's side
+            row[4] = event.target_id
+            if event.loser_id is None:
+                row[6] = OUTCOME_BARON_TIE
+            else:
+                row[6] = OUTCOME_BARON_LOSS if event.loser_id == event.player_id else OUTCOME_BARON_WIN
+        elif kind is Protected:
+            row[6] = OUTCOME_PROTECTED
+        elif kind is PrinceTarget:
+            row[4], row[6] = event.target_id, OUTCOME_PRINCE
+        elif kind is Swap:
+            row[4], row[6] = event.target_id, OUTCOME_SWAP
+        elif kind is JesterMarked:
+            row[4], row[6] = event.target_id, OUTCOME_JESTER
+        elif kind is SycophantMarked:
+            row[4], row[6] = event.target_id, OUTCOME_SYCOPHANT
+        elif kind is CardinalSwap:
+            row[4], row[6] = event.first_id, OUTCOME_CARDINAL
+        elif kind is BishopGuess:
+            row[4], row[5] = event.target_id, event.value
+            row[6] = OUTCOME_BISHOP_HIT if event.correct else OUTCOME_BISHOP_MISS
+
+    def close(self):
+        self._finish_row()
+        self.writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize per-turn export directories.")
+    parser.add_argument('directories', nargs='+')
+    args = parser.parse_args(argv)
+
+    card_names = list(CARDS_DATA_RAW)
+    plays = Counter()
+    outcomes = Counter()
+    rows = 0
+    for directory in args.directories:
+        columns = load_columns(directory, ['card', 'outcome'])
+        rows += len(columns['card'])
+        plays.update(columns['card'])
+        outcomes.update(zip(columns['card'], columns['outcome']))
+    print(f"Rows: {rows} from {len(args.directories)} directories")
+    for card_id, n in plays.most_common():
+        by_outcome = ", ".join(f"{OUTCOME_NAMES[outcome]} {count / n:.1%}"
+                               for (card, outcome), count in sorted(outcomes.items()) if card == card_id)
+        print(f"  {card_names[card_id]}: {n} plays ({by_outcome})")
+
+
+if __name__ == '__main__':
+    main()
@@ -26,12 +26,20 @@ Config.set('input', 'mouse', 'mouse,multitouch_on_demand')
 INTRO_BACKGROUND = "assets/chill.webp"
 RULES_BACKGROUND = "assets/Rules.png"
 EMPTY_CARD_IMAGE = "assets/cards/empty_card.png"
+# Set LOVELETTER_PROFILE=phases.json to time the engine phases (see Timing.py); written at game over.
+PROFILE_DUMP_PATH = os.environ.get('LOVELETTER_PROFILE')
+# CPU seats solve the last cards exactly and play the heuristic before that (see Policy.make_policy).
+# The number is the most seconds one endgame solve may take before falling back to the heuristic.
+CPU_POLICY = 'endgame:0.5'
 
 from Logic import (
-    Player, Deck, GameRound, Card,
+    Player, Deck, GameRound, RoundUI, Card, ClockScheduler, load_card_prototypes, tokens_to_win_for_player_count,
     CARD_PROTOTYPES, CARDS_DATA_RAW,
+    UI_CHANGED_ROUND, UI_CHANGED_TURN, UI_CHANGED_HANDS, UI_CHANGED_PLAYERS, UI_CHANGED_WAITING, UI_CHANGED_ALL,
     CARD_FOLDER, CARD_BACK_IMAGE, ELIMINATED_IMAGE
 )
+from Policy import BeliefTracker, make_policy
+from Timing import PhaseStats
 
 Window.size = (1000, 800)
 Window.clearcolor = (0.12, 0.07, 0.07, 1)
@@ -84,6 +92,152 @@ class CardDisplay(BoxLayout):
         self.bg.pos = self.pos
         self.bg.size = self.size
 
+def _fit_canvas_rects(instance, value):
+    # Keeps a widget's background rectangles on the widget (bind to pos and size).
+    for instruction in instance.canvas.before.children:
+        if isinstance(instruction, (Rectangle, RoundedRectangle)):
+            instruction.pos = instance.pos
+            instruction.size = instance.size
+
+class OpponentPanel(BoxLayout):
+    # One opponent seat, built once per session. update() compares the seat with what is on screen
+    # and only touches the colours, texts and images that changed.
+    def __init__(self, player_name, tokens_to_win, card_info_callback, **kwargs):
+        super().__init__(**kwargs)
+        self.orientation = 'vertical'
+        self.size_hint_y = None
+        self.height = 210
+        self.width = 160
+        self.padding = [8, 8, 8, 8]
+        self.player_name = player_name
+        self.tokens_to_win = tokens_to_win
+        self.shown = None  # (tokens, eliminated, protected, has hand, top discard) currently drawn
+        with self.canvas.before:
+            Color(0.3, 0.3, 0.4, 0.9)
+            self.border = RoundedRectangle(radius=[15,])
+            self.bg_color = Color(0.18, 0.07, 0.07, 0.92)
+            self.bg = RoundedRectangle(radius=[15,])
+        self.bind(pos=self._update_rect, size=self._update_rect)
+        name_box = BoxLayout(size_hint_y=0.15)
+        with name_box.canvas.before:
+            self.name_box_color = Color(0.1, 0.1, 0.2, 0.9)
+            RoundedRectangle(radius=[10, 10, 0, 0])
+        name_box.bind(pos=_fit_canvas_rects, size=_fit_canvas_rects)
+        self.name_label = StyledLabel(text=player_name, font_size='13sp', bold=True, color=(1, 1, 0.85, 1))
+        name_box.add_widget(self.name_label)
+        self.token_label = StyledLabel(text="", font_size='12sp', color=(1, 0.95, 0.5, 1), bold=True)
+        name_box.add_widget(self.token_label)
+        self.add_widget(name_box)
+        card_box = BoxLayout(size_hint_y=0.55)
+        self.card_image = Image(source=CARD_BACK_IMAGE, allow_stretch=True, keep_ratio=True)
+        card_box.add_widget(self.card_image)
+        self.add_widget(card_box)
+        discard_box = BoxLayout(orientation='vertical', size_hint_y=0.3)
+        discard_box.add_widget(StyledLabel(text="Discard", font_size='10sp', size_hint_y=0.3))
+        self.discard_image = ImageButton(
+            source=EMPTY_CARD_IMAGE,
+            size_hint_y=0.7,
+            card_info_callback=card_info_callback,
+            disabled=True,
+            opacity=0.3
+        )
+        discard_box.add_widget(self.discard_image)
+        self.add_widget(discard_box)
+
+    def _update_rect(self, instance, value):
+        self.border.pos = self.bg.pos = self.pos
+        self.border.size = self.bg.size = self.size
+
+    def update(self, player):
+        top_discard = player.discard_pile[-1] if player.discard_pile else None
+        shown = (player.tokens, player.is_eliminated, player.is_protected, bool(player.hand), top_discard)
+        if shown == self.shown:
+            return
+        self.shown = shown
+        if player.is_eliminated:
+            self.bg_color.rgba = (0.4, 0.08, 0.08, 0.85)
+            self.name_box_color.rgba = (0.4, 0.08, 0.08, 0.9)
+            self.name_label.text = self.player_name + " [E]"
+            self.name_label.color = (1, 0.7, 0.7, 1)
+        else:
+            self.bg_color.rgba = (0.18, 0.13, 0.18, 0.85) if player.is_protected else (0.18, 0.07, 0.07, 0.92)
+            self.name_box_color.rgba = (0.15, 0.4, 0.15, 0.9) if player.is_protected else (0.1, 0.1, 0.2, 0.9)
+            self.name_label.text = self.player_name + (" [P]" if player.is_protected else "")
+            self.name_label.color = (1, 1, 0.85, 1)
+        self.token_label.text = "★" * player.tokens + "☆" * (self.tokens_to_win - player.tokens)
+        if player.is_eliminated:
+            self.card_image.source = ELIMINATED_IMAGE
+            self.card_image.opacity = 1.0
+        else:
+            self.card_image.source = CARD_BACK_IMAGE
+            self.card_image.opacity = 1.0 if player.hand else 0.0
+        if top_discard is not None:
+            self.discard_image.source = top_discard.image_path
+            self.discard_image.card_data = top_discard
+            self.discard_image.disabled = False
+            self.discard_image.opacity = 1.0
+        else:
+            self.discard_image.source = EMPTY_CARD_IMAGE
+            self.discard_image.card_data = None
+            self.discard_image.disabled = True
+            self.discard_image.opacity = 0.3
+
+class HandCardButton(ImageButton):
+    def on_release(self):
+        self.opacity = 0.7 if self.disabled else 1.0  # The button outlives the press, which may have ended the turn
+
+class HandCardView(BoxLayout):
+    # One card of the human hand. The views are kept for the whole session and re-pointed at
+    # whatever card the slot holds.
+    def __init__(self, card_info_callback, on_card_selected, **kwargs):
+        super().__init__(**kwargs)
+        self.orientation = 'vertical'
+        self.padding = [10, 10, 10, 5]
+        self.shown = None  # (card, playable) currently drawn
+        with self.canvas.before:
+            self.shadow_color = Color(0.2, 0.4, 0.3, 0)
+            self.bg = RoundedRectangle(radius=[8,])
+        self.bind(pos=self._update_rect, size=self._update_rect)
+        card_frame = BoxLayout(padding=[2, 2, 2, 2])
+        with card_frame.canvas.before:
+            self.frame_color = Color(0.4, 0.4, 0.5, 0.4)
+            RoundedRectangle(radius=[5,])
+        card_frame.bind(pos=_fit_canvas_rects, size=_fit_canvas_rects)
+        self.card_button = HandCardButton(
+            card_info_callback=card_info_callback,
+            size_hint=(0.95, 0.95),
+            pos_hint={'center_x': 0.5, 'center_y': 0.5}
+        )
+        self.card_button.card_name = None
+        self.card_button.bind(on_press=on_card_selected)
+        card_frame.add_widget(self.card_button)
+        self.add_widget(card_frame)
+        card_info = BoxLayout(size_hint_y=None, height=25, padding=[0, 5, 0, 0])
+        with card_info.canvas.before:
+            Color(0.15, 0.15, 0.2, 0.8)
+            RoundedRectangle(radius=[0, 0, 5, 5])
+        card_info.bind(pos=_fit_canvas_rects, size=_fit_canvas_rects)
+        self.info_label = StyledLabel(text="", font_size='13sp', color=(1, 0.92, 0.7, 1), bold=True)
+        card_info.add_widget(self.info_label)
+        self.add_widget(card_info)
+
+    def _update_rect(self, instance, value):
+        self.bg.pos = (self.x + 4, self.y - 4)  # Drop shadow, visible while the card can be played
+        self.bg.size = self.size
+
+    def update(self, card, playable):
+        if (card, playable) == self.shown:
+            return
+        self.shown = (card, playable)
+        self.card_button.source = card.image_path
+        self.card_button.card_data = card
+        self.card_button.card_name = card.name
+        self.card_button.disabled = not playable
+        self.card_button.opacity = 1.0 if playable else 0.7
+        self.shadow_color.a = 0.4 if playable else 0
+        self.frame_color.rgba = (0.9, 0.8, 0.3, 0.8) if playable else (0.4, 0.4, 0.5, 0.4)
+        self.info_label.text = f"{card.name} ({card.value})"
+
 class IntroScreen(Screen):
     def __init__(self, **kwargs):
         super(IntroScreen, self).__init__(**kwargs)
@@ -161,6 +315,44 @@ class RulesScreen(Screen):
         if hasattr(self, 'game_instance') and self.game_instance:
             Clock.schedule_once(lambda dt: self.game_instance.initialize_game_setup(), 0.1)
 
+class KivyRoundUI(RoundUI):
+    # Connects a GameRound to the LoveLetterGame screen. Engine changes arrive already coalesced
+    # (one state_changed per engine step), so this is the only place the round triggers a redraw,
+    # and the UI_CHANGED_* flags say which parts of the screen need it.
+    def __init__(self, game):
+        self.game = game
+
+    def state_changed(self, changes):
+        self.game.update_ui(changes)
+
+    def set_waiting_flag(self, is_waiting):
+        self.game.waiting_for_input = is_waiting  # Drawn with the next state_changed
+
+    def has_active_popup(self):
+        return self.game.active_popup is not None
+
+    def dismiss_active_popup(self):
+        self.game.dismiss_active_popup()
+
+    def request_target_selection(self, acting_player, card, valid_targets, continuation):
+        self.game.ui_display_target_selection_popup(acting_player, card, valid_targets, continuation)
+
+    def request_guard_value(self, acting_player, target_player, possible_values, continuation):
+        self.game.ui_display_guard_value_popup(acting_player, target_player, possible_values, continuation)
+
+    def request_option(self, player, prompt_text, options, continuation):
+        self.game.ui_display_option_popup(player, prompt_text, options, continuation)
+
+    def award_round_tokens(self, winners):
+        self.game.award_round_tokens_and_check_game_over(winners)
+
+    def check_game_over_token(self, player):
+        return self.game.check_game_over_on_token_gain(player)
+
+    def game_over(self, winner):
+        self.game.handle_game_over_from_round(winner)
+
+
 class LoveLetterGame(BoxLayout):
     def __init__(self, **kwargs):
         self.game_log = ["Welcome to Love Letter Kivy!"]
@@ -174,6 +366,7 @@ class LoveLetterGame(BoxLayout):
         self.waiting_for_input = False
         self.opponent_widgets_map = {}
         self.animated_widget_details = {}
+        self.phase_stats = None  # Timing.PhaseStats for the current session when LOVELETTER_PROFILE is set
         super().__init__(**kwargs)
         self.orientation = 'vertical'
         self.padding = 15
@@ -411,13 +604,10 @@ class LoveLetterGame(BoxLayout):
         self.active_popup.open()
 
     def _load_card_prototypes_and_images(self):
-        global CARD_PROTOTYPES
-        CARD_PROTOTYPES.clear()
         missing_card_back = not os.path.exists(CARD_BACK_IMAGE)
         if missing_card_back:
             self.log_message(f"CRITICAL ERROR: Card back image not found at {CARD_BACK_IMAGE}", permanent=True)
-        for eng_name, data in CARDS_DATA_RAW.items():
-            viet_name = data['vietnamese_name']
+        def resolve_image_path(eng_name, viet_name):
             path_jpg = os.path.join(CARD_FOLDER, f"{viet_name}.jpg")
             path_png = os.path.join(CARD_FOLDER, f"{viet_name}.png")
             actual_path = next((p for p in [path_jpg, path_png] if os.path.exists(p)), None)
@@ -425,15 +615,8 @@ class LoveLetterGame(BoxLayout):
                 self.log_message(f"Warning: Image for '{eng_name}' ({viet_name}) not found. Using card back.",
                                  permanent=True)
                 actual_path = CARD_BACK_IMAGE if not missing_card_back else ""
-            CARD_PROTOTYPES[eng_name] = Card(
-                name=eng_name,
-                value=data['value'],
-                description=data['description'],
-                image_path=actual_path,
-                vietnamese_name=viet_name,
-                count_classic=data['count_classic'],
-                count_large=data['count_large']
-            )
+            return actual_path
+        load_card_prototypes(resolve_image_path)
         self.log_message(f"Card prototypes loaded: {len(CARD_PROTOTYPES)} card types", permanent=True)
 
     def setup_ui_placeholders(self):
@@ -461,7 +644,7 @@ class LoveLetterGame(BoxLayout):
         self.add_widget(welcome_layout)
 
     def prompt_player_count(self):
-        self.game_log = ["Welcome to Love Letter Kivy!", "Please select number of players (2-4)."]
+        self.game_log = ["Welcome to Love Letter Kivy!", "Please select number of players (2-8)."]
         if hasattr(self, 'message_label'):
             self.log_message("", permanent=False)
         popup_layout = BoxLayout(orientation='vertical', spacing=20, padding=[30, 30, 30, 30])
@@ -477,7 +660,7 @@ class LoveLetterGame(BoxLayout):
         title_label.bind(size=title_label.setter('text_size'))
         popup_layout.add_widget(title_label)
         subtitle = StyledLabel(
-            text="(2 - 4 người, chỉ bản cơ bản)",
+            text="(2 - 4 người: bản cơ bản, 5 - 8 người: bản mở rộng)",
             font_size=18,
             color=(0.9, 0.9, 1, 0.8),
             size_hint_y=None,
@@ -486,8 +669,8 @@ class LoveLetterGame(BoxLayout):
         )
         subtitle.bind(size=subtitle.setter('text_size'))
         popup_layout.add_widget(subtitle)
-        options_layout = GridLayout(cols=3, spacing=20, size_hint_y=None, height=70)
-        for i in range(2, 5):
+        options_layout = GridLayout(cols=4, spacing=20, size_hint_y=None, height=140)
+        for i in range(2, 9):
             btn = Button(
                 text=str(i),
                 size_hint=(1, None),
@@ -514,7 +697,7 @@ class LoveLetterGame(BoxLayout):
         self.active_popup = DarkPopup(
             title="Love Letter - Player Count",
             content=popup_layout,
-            size_hint=(0.55, 0.38),
+            size_hint=(0.6, 0.5),
             auto_dismiss=False,
             title_color=(1, 0.9, 0.8, 1),
             title_size='22sp',
@@ -530,17 +713,13 @@ class LoveLetterGame(BoxLayout):
             self.active_popup = None
         self.num_players_session = instance.player_count
         self.log_message(f"Number of players set to: {self.num_players_session}")
-        if self.num_players_session == 2:
-            self.tokens_to_win_session = 7
-        elif self.num_players_session == 3:
-            self.tokens_to_win_session = 5
-        else:
-            self.tokens_to_win_session = 4
+        self.tokens_to_win_session = tokens_to_win_for_player_count(self.num_players_session)
         self.log_message(f"Tokens needed to win: {self.tokens_to_win_session}")
         self.players_session_list = [Player(id_num=0, name="Player 1 (You)")]
         self.human_player_id = self.players_session_list[0].id
         for i in range(1, self.num_players_session):
-            self.players_session_list.append(Player(id_num=i, name=f"CPU {i}", is_cpu=True))
+            self.players_session_list.append(Player(id_num=i, name=f"CPU {i}", is_cpu=True,
+                                                    policy=make_policy(CPU_POLICY)))
         self.setup_main_ui()
         self.start_new_game_session()
 
@@ -632,6 +811,12 @@ class LoveLetterGame(BoxLayout):
         )
         self.opponents_grid.bind(minimum_width=self.opponents_grid.setter('width'))
         self.opponents_grid.bind(minimum_height=self.opponents_grid.setter('height'))
+        self.opponent_widgets_map = {}
+        for p_opponent in self.players_session_list:
+            if p_opponent.id != self.human_player_id:
+                panel = OpponentPanel(p_opponent.name, self.tokens_to_win_session, self.display_card_info_popup)
+                self.opponents_grid.add_widget(panel)
+                self.opponent_widgets_map[p_opponent.id] = panel
         self.opponents_area_scrollview.add_widget(self.opponents_grid)
         opponents_container.add_widget(self.opponents_area_scrollview)
         game_area.add_widget(opponents_container)
@@ -660,6 +845,13 @@ class LoveLetterGame(BoxLayout):
         player_hand_container.bind(pos=lambda inst, val: self._update_rect(player_hand_container, val),
                                  size=lambda inst, val: self._update_rect(player_hand_container, val))
         self.player_hand_area = BoxLayout(orientation='horizontal', spacing=20, padding=[20, 15])
+        self.hand_token_label = StyledLabel(text="", font_size='15sp', color=(1, 0.95, 0.5, 1), bold=True)
+        self.hand_card_views = []  # HandCardView per hand slot, created when the hand first gets that big
+        self.hand_eliminated_widgets = (
+            Image(source=ELIMINATED_IMAGE, allow_stretch=True),
+            StyledLabel(text="Eliminated!", color=(1, 0.5, 0.5, 1), font_size=24)
+        )
+        self.hand_shown = None
         player_hand_container.add_widget(self.player_hand_area)
         self.human_player_display_wrapper.add_widget(player_hand_container)
         game_area.add_widget(self.human_player_display_wrapper)
@@ -715,12 +907,12 @@ class LoveLetterGame(BoxLayout):
         played_card_frame.bind(pos=lambda inst, val: self._update_rect(played_card_frame, val),
                              size=lambda inst, val: self._update_rect(played_card_frame, val))
         self.last_played_card_container = RelativeLayout(size_hint=(1, 1))
-        self.last_played_card_image = Image(
+        self.last_played_card_image = ImageButton(
             source=EMPTY_CARD_IMAGE,
-            allow_stretch=True,
-            keep_ratio=True,
-            size_hint=(0.9, 0.9),
+            card_info_callback=self.display_card_info_popup,
+            size_hint=(0.95, 0.95),
             pos_hint={'center_x': 0.5, 'center_y': 0.5},
+            disabled=True,
             opacity=0.3
         )
         self.last_played_card_container.add_widget(self.last_played_card_image)
@@ -787,9 +979,27 @@ class LoveLetterGame(BoxLayout):
                 self.message_label.parent.scroll_y = 0
 
     def update_ui_full(self):
+        self.update_ui(UI_CHANGED_ALL)
+
+    def update_ui(self, changes):
+        # Redraws the parts of the screen that depend on the UI_CHANGED_* flags in changes.
         if not hasattr(self, 'score_label'):
             return
         self.cleanup_leftover_rectangles()
+        if changes & (UI_CHANGED_ROUND | UI_CHANGED_TURN | UI_CHANGED_PLAYERS):
+            self.update_status_bar()
+        if changes & (UI_CHANGED_ROUND | UI_CHANGED_TURN | UI_CHANGED_HANDS | UI_CHANGED_PLAYERS):
+            self.update_table_info()
+        if changes & (UI_CHANGED_ROUND | UI_CHANGED_HANDS):
+            self.update_last_played()
+        if changes & (UI_CHANGED_ROUND | UI_CHANGED_HANDS | UI_CHANGED_PLAYERS):
+            self.update_opponents_display()
+        if changes & (UI_CHANGED_ROUND | UI_CHANGED_TURN | UI_CHANGED_HANDS | UI_CHANGED_PLAYERS | UI_CHANGED_WAITING):
+            self.update_player_hand()
+        if changes & UI_CHANGED_ROUND:
+            self.log_message("", permanent=False)
+
+    def update_status_bar(self):
         score_texts = []
         for p in self.players_session_list:
             token_display = "★" * p.tokens + "☆" * (self.tokens_to_win_session - p.tokens)
@@ -812,11 +1022,13 @@ class LoveLetterGame(BoxLayout):
             self.turn_label.text = f"Turn: {current_player_name_round}"
             self.action_button.text = "Forfeit Round (DEBUG)"
             self.action_button.background_color = (0.8, 0.3, 0.3, 1)
+
+    def update_table_info(self):
         if self.current_round_manager and self.current_round_manager.deck:
             self.deck_count_label.text = f"{self.current_round_manager.deck.count()}"
             self.deck_image.source = CARD_BACK_IMAGE if not self.current_round_manager.deck.is_empty() else EMPTY_CARD_IMAGE
             self.deck_image.opacity = 1.0 if not self.current_round_manager.deck.is_empty() else 0.3
-            active_players = sum(1 for p in self.players_session_list if not p.is_eliminated)
+            active_players = self.current_round_manager.active_count
             total_players = len(self.players_session_list)
             self.players_remaining_label.text = f"Người chơi: {active_players}/{total_players}"
             if self.current_round_manager.round_active:
@@ -830,6 +1042,8 @@ class LoveLetterGame(BoxLayout):
             self.deck_image.opacity = 0.3
             self.round_info_label.text = "Không có vòng đấu"
             self.players_remaining_label.text = "Người chơi: 0/0"
+
+    def update_last_played(self):
         last_played_card = None
         last_played_by = None
         human_player = self.players_session_list[self.human_player_id]
@@ -842,213 +1056,60 @@ class LoveLetterGame(BoxLayout):
                     last_played_card = player.discard_pile[-1]
                     last_played_by = player
                     break
-        self.last_played_card_container.clear_widgets()
+        last_played_image = self.last_played_card_image
+        if last_played_card is not last_played_image.card_data:
+            last_played_image.card_data = last_played_card
+            last_played_image.source = last_played_card.image_path if last_played_card else EMPTY_CARD_IMAGE
+            last_played_image.disabled = last_played_card is None
+            last_played_image.opacity = 1.0 if last_played_card else 0.3
         if last_played_card:
-            card_button = ImageButton(
-                source=last_played_card.image_path,
-                card_info_callback=self.display_card_info_popup,
-                card_data=last_played_card,
-                allow_stretch=True,
-                keep_ratio=True,
-                size_hint=(0.95, 0.95),
-                pos_hint={'center_x': 0.5, 'center_y': 0.5}
-            )
-            self.last_played_card_container.add_widget(card_button)
             player_name = last_played_by.name if last_played_by else "Unknown"
             self.last_played_title.text = f"Bài của: {player_name}"
         else:
-            empty_card = Image(
-                source=EMPTY_CARD_IMAGE,
-                allow_stretch=True,
-                keep_ratio=True,
-                size_hint=(0.95, 0.95),
-                pos_hint={'center_x': 0.5, 'center_y': 0.5},
-                opacity=0.3
-            )
-            self.last_played_card_container.add_widget(empty_card)
             self.last_played_title.text = "Chưa có bài đánh ra"
-        self.update_opponents_display()
-        self.update_player_hand()
-        self.log_message("", permanent=False)
 
     def update_opponents_display(self):
-        self.opponents_grid.clear_widgets()
-        self.opponent_widgets_map.clear()
-        if self.num_players_session <= 1:
-            return
-        self.opponents_grid.cols = min(3, self.num_players_session - 1)
-        self.opponents_grid.size_hint_x = None if self.num_players_session - 1 > 3 else 1
+        # Panels are built by setup_main_ui; each one redraws only if its seat changed.
         for p_opponent in self.players_session_list:
-            if p_opponent.id == self.human_player_id:
-                continue
-            opponent_container = BoxLayout(
-                orientation='vertical',
-                size_hint_y=None,
-                height=210,
-                width=160,
-                padding=[8, 8, 8, 8]
-            )
-            with opponent_container.canvas.before:
-                Color(0.3, 0.3, 0.4, 0.9)
-                RoundedRectangle(
-                    pos=(opponent_container.pos[0]-2, opponent_container.pos[1]-2),
-                    size=(opponent_container.size[0]+4, opponent_container.size[1]+4),
-                    radius=[15,]
-                )
-                if p_opponent.is_eliminated:
-                    Color(0.4, 0.08, 0.08, 0.85)
-                elif p_opponent.is_protected:
-                    Color(0.18, 0.13, 0.18, 0.85)
-                else:
-                    Color(0.18, 0.07, 0.07, 0.92)
-                RoundedRectangle(radius=[15,])
-            opponent_container.bind(pos=self._update_rect, size=self._update_rect)
-            name_box = BoxLayout(size_hint_y=0.15)
-            with name_box.canvas.before:
-                if p_opponent.is_eliminated:
-                    Color(0.4, 0.08, 0.08, 0.9)
-                elif p_opponent.is_protected:
-                    Color(0.15, 0.4, 0.15, 0.9)
-                else:
-                    Color(0.1, 0.1, 0.2, 0.9)
-                RoundedRectangle(radius=[10, 10, 0, 0])
-            name_box.bind(pos=self._update_rect, size=self._update_rect)
-            token_text = f"{p_opponent.name}"
-            status_text = " [E]" if p_opponent.is_eliminated else " [P]" if p_opponent.is_protected else ""
-            name_label = StyledLabel(
-                text=token_text + status_text,
-                font_size='13sp',
-                bold=True,
-                color=(1, 1, 0.85, 1) if not p_opponent.is_eliminated else (1, 0.7, 0.7, 1)
-            )
-            name_box.add_widget(name_label)
-            token_label = StyledLabel(
-                text="★" * p_opponent.tokens + "☆" * (self.tokens_to_win_session - p_opponent.tokens),
-                font_size='12sp',
-                color=(1, 0.95, 0.5, 1),
-                bold=True
-            )
-            name_box.add_widget(token_label)
-            opponent_container.add_widget(name_box)
-            card_img_src = CARD_BACK_IMAGE
-            if p_opponent.is_eliminated:
-                card_img_src = ELIMINATED_IMAGE
-            elif not p_opponent.hand:
-                card_img_src = "transparent"
-            card_box = BoxLayout(size_hint_y=0.55)
-            if card_img_src == "transparent":
-                card_image = Widget()
-            elif card_img_src == CARD_BACK_IMAGE or card_img_src == ELIMINATED_IMAGE:
-                card_image = Image(source=card_img_src, allow_stretch=True, keep_ratio=True)
-            else:
-                if p_opponent.hand:
-                    card_obj = p_opponent.hand[0]
-                    card_image = ImageButton(
-                        source=card_img_src,
-                        card_info_callback=self.display_card_info_popup,
-                        card_data=card_obj
-                    )
-                else:
-                    card_image = Widget()
-            card_box.add_widget(card_image)
-            opponent_container.add_widget(card_box)
-            discard_box = BoxLayout(orientation='vertical', size_hint_y=0.3)
-            discard_box.add_widget(StyledLabel(text="Discard", font_size='10sp', size_hint_y=0.3))
-            if p_opponent.discard_pile:
-                discard_card = p_opponent.discard_pile[-1]
-                discard_image = ImageButton(
-                    source=discard_card.image_path,
-                    allow_stretch=True,
-                    keep_ratio=True,
-                    size_hint_y=0.7,
-                    card_info_callback=self.display_card_info_popup,
-                    card_data=discard_card
-                )
-            else:
-                discard_image = Image(
-                    source=EMPTY_CARD_IMAGE,
-                    allow_stretch=True,
-                    keep_ratio=True,
-                    size_hint_y=0.7,
-                    opacity=0.3
-                )
-            discard_box.add_widget(discard_image)
-            opponent_container.add_widget(discard_box)
-            self.opponents_grid.add_widget(opponent_container)
-            self.opponent_widgets_map[p_opponent.id] = opponent_container
+            panel = self.opponent_widgets_map.get(p_opponent.id)
+            if panel is not None:
+                panel.update(p_opponent)
 
     def update_player_hand(self):
         human_player = self.players_session_list[self.human_player_id]
-        self.player_hand_area.clear_widgets()
-        if human_player.is_eliminated:
-            self.player_hand_area.add_widget(Image(source=ELIMINATED_IMAGE, allow_stretch=True))
-            self.player_hand_area.add_widget(StyledLabel(text="Eliminated!", color=(1, 0.5, 0.5, 1), font_size=24))
-            return
-        if not human_player.hand:
-            return
-        is_player_turn_active = (
+        is_player_turn_active = bool(
             self.current_round_manager and
             self.current_round_manager.round_active and
             self.current_round_manager.current_player_idx == self.human_player_id and
             not self.waiting_for_input
         )
-        token_label = StyledLabel(
-            text="Token: " + "★" * human_player.tokens + "☆" * (self.tokens_to_win_session - human_player.tokens),
-            font_size='15sp',
-            color=(1, 0.95, 0.5, 1),
-            bold=True
-        )
-        self.player_hand_area.add_widget(token_label)
-        for card_obj in human_player.hand:
-            card_container = BoxLayout(
-                orientation='vertical',
-                size_hint=(1 / len(human_player.hand) if len(human_player.hand) > 0 else 1, 1),
-                padding=[10, 10, 10, 5]
-            )
-            if is_player_turn_active:
-                with card_container.canvas.before:
-                    Color(0.2, 0.4, 0.3, 0.4)
-                    RoundedRectangle(
-                        pos=(card_container.pos[0]+4, card_container.pos[1]-4),
-                        size=card_container.size,
-                        radius=[8,]
-                    )
-            card_frame = BoxLayout(padding=[2, 2, 2, 2])
-            with card_frame.canvas.before:
-                if is_player_turn_active:
-                    Color(0.9, 0.8, 0.3, 0.8)
-                else:
-                    Color(0.4, 0.4, 0.5, 0.4)
-                RoundedRectangle(radius=[5,])
-            card_frame.bind(pos=lambda inst, val: self._update_rect(inst, val),
-                        size=lambda inst, val: self._update_rect(inst, val))
-            card_button = ImageButton(
-                source=card_obj.image_path,
-                card_info_callback=self.display_card_info_popup,
-                card_data=card_obj,
-                size_hint=(0.95, 0.95),
-                pos_hint={'center_x': 0.5, 'center_y': 0.5}
-            )
-            card_button.card_name = card_obj.name
-            card_button.bind(on_press=self.on_player_card_selected)
-            card_button.disabled = not is_player_turn_active
-            card_button.opacity = 1.0 if is_player_turn_active else 0.7
-            card_frame.add_widget(card_button)
-            card_container.add_widget(card_frame)
-            card_info = BoxLayout(size_hint_y=None, height=25, padding=[0, 5, 0, 0])
-            with card_info.canvas.before:
-                Color(0.15, 0.15, 0.2, 0.8)
-                RoundedRectangle(radius=[0, 0, 5, 5])
-            card_info.bind(pos=self._update_rect, size=self._update_rect)
-            info_label = StyledLabel(
-                text=f"{card_obj.name} ({card_obj.value})",
-                font_size='13sp',
-                color=(1, 0.92, 0.7, 1),
-                bold=True
-            )
-            card_info.add_widget(info_label)
-            card_container.add_widget(card_info)
-            self.player_hand_area.add_widget(card_container)
+        shown = (human_player.is_eliminated, tuple(human_player.hand), is_player_turn_active, human_player.tokens)
+        if shown == self.hand_shown:
+            return
+        self.hand_shown = shown
+        if human_player.is_eliminated:
+            self._set_hand_area_widgets(self.hand_eliminated_widgets)
+            return
+        if not human_player.hand:
+            self._set_hand_area_widgets(())
+            return
+        self.hand_token_label.text = "Token: " + "★" * human_player.tokens + "☆" * (
+            self.tokens_to_win_session - human_player.tokens)
+        hand_size = len(human_player.hand)
+        while len(self.hand_card_views) < hand_size:
+            self.hand_card_views.append(HandCardView(self.display_card_info_popup, self.on_player_card_selected))
+        card_views = self.hand_card_views[:hand_size]
+        for card_view, card_obj in zip(card_views, human_player.hand):
+            card_view.size_hint = (1 / hand_size, 1)
+            card_view.update(card_obj, is_player_turn_active)
+        self._set_hand_area_widgets([self.hand_token_label] + card_views)
+
+    def _set_hand_area_widgets(self, widgets):
+        # Re-parents the retained widgets only when the set shown in the hand area changes.
+        if self.player_hand_area.children[::-1] != list(widgets):
+            self.player_hand_area.clear_widgets()
+            for widget in widgets:
+                self.player_hand_area.add_widget(widget)
 
     def _get_player_widget_by_id(self, player_id):
         if player_id == self.human_player_id:
@@ -1066,10 +1127,10 @@ class LoveLetterGame(BoxLayout):
         elif self.current_round_manager and not self.current_round_manager.round_active:
             self.start_new_round()
         else:
+            human_player = self.players_session_list[self.human_player_id]
             if self.current_round_manager and self.current_round_manager.round_active and \
-                    self.current_round_manager.current_player_idx == self.human_player_id:
-                self.log_message(f"{self.players_session_list[self.human_player_id].name} forfeits the round.")
-                self.log_message("DEBUG: Forfeit currently complex to reimplement cleanly. Ignored.")
+                    not human_player.is_eliminated:
+                self.current_round_manager.forfeit(human_player)
             else:
                 self.log_message("Cannot forfeit now.")
 
@@ -1108,7 +1169,7 @@ class LoveLetterGame(BoxLayout):
                 widget_to_animate = item['widget']
                 color_rgba = item['color']
                 processed_animation = True
-                if widget_to_animate not in self.animated_widget_details:
+                if not hasattr(widget_to_animate, 'canvas_anim_bg_color'):  # Panels are kept, so is their highlight
                     with widget_to_animate.canvas.before:
                         widget_to_animate.canvas_anim_bg_color = Color(*color_rgba)
                         widget_to_animate.canvas_anim_bg_rect = Rectangle(
@@ -1119,16 +1180,16 @@ class LoveLetterGame(BoxLayout):
                         pos=self._update_anim_rect_pos_size,
                         size=self._update_anim_rect_pos_size
                     )
-                    self.animated_widget_details[widget_to_animate] = {
-                        'widget': widget_to_animate,
-                        'instruction_color': widget_to_animate.canvas_anim_bg_color,
-                        'instruction_rect': widget_to_animate.canvas_anim_bg_rect,
-                        'original_bound_pos_size': True
-                    }
                 else:
                     widget_to_animate.canvas_anim_bg_color.rgba = color_rgba
                     widget_to_animate.canvas_anim_bg_rect.size = widget_to_animate.size
                     widget_to_animate.canvas_anim_bg_rect.pos = widget_to_animate.pos
+                self.animated_widget_details[widget_to_animate] = {
+                    'widget': widget_to_animate,
+                    'instruction_color': widget_to_animate.canvas_anim_bg_color,
+                    'instruction_rect': widget_to_animate.canvas_anim_bg_rect,
+                    'original_bound_pos_size': True
+                }
         if processed_animation:
             Clock.schedule_once(lambda dt: self._clear_animations_and_proceed(on_complete_callback), duration)
         elif on_complete_callback:
@@ -1145,9 +1206,12 @@ class LoveLetterGame(BoxLayout):
 
     def start_new_game_session(self):
         self.log_message(f"--- Starting New Game Session with {self.num_players_session} players ---")
+        if self.current_round_manager:
+            self.current_round_manager.cancel_cpu_thinking()
         for p in self.players_session_list:
             p.tokens = 0
         self.game_over_session_flag = False
+        self.phase_stats = PhaseStats() if PROFILE_DUMP_PATH else None
         self.start_new_round()
 
     def start_new_round(self):
@@ -1156,6 +1220,8 @@ class LoveLetterGame(BoxLayout):
             self.log_message("Game is over. Cannot start new round until new game session.")
             self.update_ui_full()
             return
+        if self.current_round_manager:
+            self.current_round_manager.cancel_cpu_thinking()  # A CPU move from the old round must not land in this one
         game_deck = Deck(self.num_players_session, self.log_message)
         game_deck.burn_one_card(self.num_players_session)
         min_cards_needed = self.num_players_session
@@ -1166,24 +1232,16 @@ class LoveLetterGame(BoxLayout):
             self.game_over_session_flag = True
             self.update_ui_full()
             return
-        ui_callbacks = {
-            'update_ui_full_callback': self.update_ui_full,
-            'set_waiting_flag_callback': self.set_waiting_for_input_flag,
-            'get_active_popup_callback': lambda: self.active_popup,
-            'dismiss_active_popup_callback': self.dismiss_active_popup,
-            'request_target_selection_callback': self.ui_display_target_selection_popup,
-            'request_guard_value_popup_callback': self.ui_display_guard_value_popup,
-            'award_round_tokens_callback': self.award_round_tokens_and_check_game_over,
-            'check_game_over_token_callback': self.check_game_over_on_token_gain,
-            'game_over_callback': self.handle_game_over_from_round,
-            'animate_effect_callback': self.ui_animate_effect,
-        }
         self.current_round_manager = GameRound(
             self.players_session_list,
             game_deck,
             self.human_player_id,
             self.log_message,
-            ui_callbacks
+            KivyRoundUI(self),
+            scheduler=ClockScheduler(),
+            belief_tracker=BeliefTracker() if any(p.policy is not None and p.policy.uses_beliefs
+                                                  for p in self.players_session_list) else None,
+            phase_stats=self.phase_stats
         )
         self.current_round_manager.start_round()
 
@@ -1196,10 +1254,6 @@ class LoveLetterGame(BoxLayout):
         card_name_to_play = instance.card_name
         self.current_round_manager.human_plays_card(card_name_to_play)
 
-    def set_waiting_for_input_flag(self, is_waiting):
-        self.waiting_for_input = is_waiting
-        self.update_ui_full()
-
     def dismiss_active_popup(self):
         if self.active_popup:
             self.active_popup.dismiss()
@@ -1222,7 +1276,6 @@ class LoveLetterGame(BoxLayout):
     def ui_display_target_selection_popup(self, acting_player_obj, card_played_obj, valid_targets_list,
                                         continuation_callback_in_gameround):
         self.dismiss_active_popup()
-        self.set_waiting_for_input_flag(True)
         popup_layout = BoxLayout(orientation='vertical', spacing=24, padding=[36, 36, 36, 36])
         header_box = BoxLayout(size_hint_y=0.3, spacing=18)
         card_image = Image(
@@ -1282,10 +1335,10 @@ class LoveLetterGame(BoxLayout):
     def ui_display_guard_value_popup(self, acting_player_obj, target_player_obj, possible_values_list,
                                 continuation_callback_in_gameround):
         self.dismiss_active_popup()
-        self.set_waiting_for_input_flag(True)
+        card_name = self.current_round_manager.resolving_card.name  # Guard or Bishop
         popup_layout = BoxLayout(orientation='vertical', spacing="15dp", padding="20dp")
         popup_layout.add_widget(StyledLabel(
-            text=f"Guard: Guess {target_player_obj.name}'s card value (not 1):",
+            text=f"{card_name}: Guess {target_player_obj.name}'s card value (not 1):",
             font_size=18,
             color=(1, 0.9, 0.7, 1),
             size_hint_y=None,
@@ -1300,7 +1353,7 @@ class LoveLetterGame(BoxLayout):
             options_grid.add_widget(btn)
         popup_layout.add_widget(options_grid)
         self.active_popup = Popup(
-            title="Guard Value Selection",
+            title=f"{card_name} Value Selection",
             content=popup_layout,
             size_hint=(0.7, 0.5),
             auto_dismiss=False,
@@ -1310,6 +1363,38 @@ class LoveLetterGame(BoxLayout):
         )
         self.active_popup.open()
 
+    def ui_display_option_popup(self, player_obj, prompt_text, options, continuation_callback_in_gameround):
+        # options: (button label, value passed back to the round)
+        self.dismiss_active_popup()
+        popup_layout = BoxLayout(orientation='vertical', spacing="15dp", padding="20dp")
+        prompt_label = StyledLabel(
+            text=prompt_text,
+            font_size=18,
+            color=(1, 0.9, 0.7, 1),
+            size_hint_y=None,
+            height=60,
+            halign='center'
+        )
+        prompt_label.bind(size=prompt_label.setter('text_size'))
+        popup_layout.add_widget(prompt_label)
+        options_grid = GridLayout(cols=len(options), spacing="10dp")
+        for label, value in options:
+            def make_callback(inst, p=player_obj, v=value):
+                self.dismiss_active_popup()
+                continuation_callback_in_gameround(p, v)
+            options_grid.add_widget(self.create_selection_button(label, make_callback))
+        popup_layout.add_widget(options_grid)
+        self.active_popup = Popup(
+            title=f"{player_obj.name}: Choose",
+            content=popup_layout,
+            size_hint=(0.7, 0.45),
+            auto_dismiss=False,
+            title_color=(1, 0.9, 0.7, 1),
+            title_size='20sp',
+            title_align='center'
+        )
+        self.active_popup.open()
+
     def display_victory_screen(self, winner):
         self.dismiss_active_popup()
         victory_layout = BoxLayout(orientation='vertical', spacing=20, padding=30)
@@ -1382,7 +1467,6 @@ class LoveLetterGame(BoxLayout):
                 final_winner_of_game = winner_of_round
         if game_ended_this_round and final_winner_of_game:
             self.handle_game_over_from_round(final_winner_of_game)
-        self.update_ui_full()
 
     def check_game_over_on_token_gain(self, player_who_gained_token):
         if self.game_over_session_flag:
@@ -1398,6 +1482,10 @@ class LoveLetterGame(BoxLayout):
         self.game_over_session_flag = True
         if self.current_round_manager:
             self.current_round_manager.round_active = False
+            self.current_round_manager.cancel_cpu_thinking()
+        if self.phase_stats is not None:
+            self.phase_stats.dump(PROFILE_DUMP_PATH)
+            self.log_message(f"Engine phase timings written to {PROFILE_DUMP_PATH}.")
         self.update_ui_full()
         self.display_victory_screen(winner_of_game)
 
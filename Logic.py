@@ -2,7 +2,17 @@
 
 import os
 import random
-from kivy.clock import Clock  # Clock is needed for CPU turn delays, a minor dependency.
+import time
+from array import array
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from Events import (
+    EventStream, TextLog, RoundStarted, TurnStarted, CardDrawn, CardPlayed, CardDiscarded, Eliminated, GuardGuess,
+    AssassinRevealed, HandSeen, BaronCompare, Protected, PrinceTarget, Swap, TokenGained, JesterMarked,
+    SycophantMarked, CardinalSwap, BishopGuess, Showdown, RoundEnded, Message, ROUND_END_ELIMINATION,
+    ROUND_END_DECK_OUT
+)
 
 # --- Constants and Raw Data ---
 
@@ -64,12 +74,232 @@ CARDS_DATA_RAW = {
                'count_classic': 0, 'count_large': 1},
 }
 
-CARD_PROTOTYPES = {}  # Will be populated by Card objects from the UI side
+CARD_PROTOTYPES = {}  # Populated by load_card_prototypes (the UI calls it with its own image resolver)
+
+# Compact integer encoding: a card's id is its position in CARDS_DATA_RAW (fits in a signed byte).
+CARD_IDS = {name: card_id for card_id, name in enumerate(CARDS_DATA_RAW)}
+CARD_BY_ID = []  # card id -> prototype, rebuilt together with CARD_PROTOTYPES
+
+# Per-composition caches derived from CARD_PROTOTYPES. All of them are dropped by
+# load_card_prototypes, so a reload from the UI never serves stale data.
+_DECK_TEMPLATES = {}  # composition key -> array('b') of card ids, copied by each Deck
+_GUESSABLE_VALUES = {}  # composition key -> sorted tuple of values a Guard/Bishop may name
+_RULESETS = {}  # composition key -> Ruleset
+
+
+def composition_key_for_player_count(num_players):
+    return 'count_classic' if num_players <= 4 else 'count_large'
+
+
+def deck_template(composition_key):
+    template = _DECK_TEMPLATES.get(composition_key)
+    if template is None:
+        template = array('b')
+        for prototype in CARD_PROTOTYPES.values():
+            template.extend([prototype.card_id] * getattr(prototype, composition_key, 0))
+        _DECK_TEMPLATES[composition_key] = template
+    return template
+
+
+def guessable_values(composition_key):
+    values = _GUESSABLE_VALUES.get(composition_key)
+    if values is None:
+        values = tuple(sorted(set(proto.value for proto in CARD_PROTOTYPES.values()
+                                  if proto.value != 1 and getattr(proto, composition_key, 0) > 0)))
+        _GUESSABLE_VALUES[composition_key] = values
+    return values
+
+
+def _invalidate_prototype_caches():
+    _DECK_TEMPLATES.clear()
+    _GUESSABLE_VALUES.clear()
+    _RULESETS.clear()
+
+
+def load_card_prototypes(image_path_resolver=None):
+    # Builds one Card per CARDS_DATA_RAW entry. Headless callers can skip the resolver;
+    # the UI passes one that checks the assets folder and falls back to the card back.
+    CARD_PROTOTYPES.clear()
+    CARD_BY_ID.clear()
+    _invalidate_prototype_caches()
+    for eng_name, data in CARDS_DATA_RAW.items():
+        viet_name = data['vietnamese_name']
+        if image_path_resolver:
+            image_path = image_path_resolver(eng_name, viet_name)
+        else:
+            image_path = os.path.join(CARD_FOLDER, f"{viet_name}.jpg")
+        CARD_PROTOTYPES[eng_name] = Card(
+            name=eng_name,
+            value=data['value'],
+            description=data['description'],
+            image_path=image_path,
+            vietnamese_name=viet_name,
+            count_classic=data['count_classic'],
+            count_large=data['count_large']
+        )
+        CARD_BY_ID.append(CARD_PROTOTYPES[eng_name])
+    return CARD_PROTOTYPES
+
+
+def tokens_to_win_for_player_count(num_players):
+    if num_players == 2:
+        return 7
+    if num_players == 3:
+        return 5
+    return 4
+
+
+# --- Turn Schedulers ---
+# GameRound never talks to an event loop directly; it asks its scheduler to run the CPU turn.
+# ClockScheduler keeps the original Kivy behaviour, ImmediateScheduler runs everything inline
+# so rounds can be played in a plain Python process.
+#
+# think(compute, on_done, min_delay) computes a CPU move and passes the result to on_done on the
+# engine's thread, no sooner than min_delay seconds later. It returns a Future (or None) that
+# GameRound.cancel_cpu_thinking cancels.
+
+class ClockScheduler:
+    cpu_delay_range = (1.0, 2.0)
+    _executor = None  # One worker thread shared by all rounds, so CPU searches never overlap
+
+    def schedule(self, callback, delay):
+        from kivy.clock import Clock  # Imported lazily so Logic.py stays importable without Kivy.
+        Clock.schedule_once(lambda dt: callback(), delay)
+
+    def think(self, compute, on_done, min_delay):
+        # compute() runs on the worker thread while Kivy keeps rendering; the artificial delay
+        # overlaps with it instead of being added on top.
+        from kivy.clock import Clock
+        if ClockScheduler._executor is None:
+            ClockScheduler._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='cpu-think')
+        ready_at = time.perf_counter() + min_delay
+
+        def work():
+            try:
+                result = compute()
+            except Exception as error:
+                def reraise(dt, error=error):
+                    raise error
+                Clock.schedule_once(reraise, 0)
+                return
+            Clock.schedule_once(lambda dt: on_done(result), max(0.0, ready_at - time.perf_counter()))
+
+        return ClockScheduler._executor.submit(work)
+
+
+class ImmediateScheduler:
+    cpu_delay_range = (0.0, 0.0)
+
+    def schedule(self, callback, delay):
+        callback()
+
+    def think(self, compute, on_done, min_delay):
+        on_done(compute())
+        return None
+
+
+# --- CPU Policies ---
+# Every CPU decision goes through a policy. GameRound applies the rules (Countess is forced,
+# targets must be valid) and only asks the policy to pick among legal options.
+
+class CpuPolicy:
+    uses_beliefs = False  # True if the policy reads game_round.belief_tracker (see Policy.BeliefTracker)
+
+    def choose_card(self, game_round, player, playable_cards):
+        raise NotImplementedError
+
+    def choose_target(self, game_round, player, card_played, valid_targets):
+        raise NotImplementedError
+
+    def choose_guess(self, game_round, player, target_player, possible_values):
+        raise NotImplementedError
+
+    def choose_redraw(self, game_round, player, card):
+        # Bishop: another player named `card` correctly; True discards it and draws a new one.
+        return card.name != 'Princess'
+
+    def cancel(self):
+        # Called from the engine thread when a move being computed is no longer wanted.
+        pass
+
+
+class RandomPolicy(CpuPolicy):
+    # The original CPU behaviour: uniform choices, never discarding the Princess voluntarily.
+    def choose_card(self, game_round, player, playable_cards):
+        if game_round.rules.has('Princess') and len(playable_cards) > 1:
+            without_princess = [c for c in playable_cards if c.name != 'Princess']
+            if without_princess:
+                playable_cards = without_princess
+        return game_round.rng.choice(playable_cards)
+
+    def choose_target(self, game_round, player, card_played, valid_targets):
+        return game_round.rng.choice(valid_targets)
+
+    def choose_guess(self, game_round, player, target_player, possible_values):
+        return game_round.rng.choice(possible_values)
+
+
+# --- Engine -> UI interface ---
+# Flags passed to RoundUI.state_changed. GameRound ORs together everything one engine step changed
+# and reports it once when the step driver goes idle, instead of asking for a redraw per action.
+UI_CHANGED_ROUND = 1  # Round started or ended
+UI_CHANGED_TURN = 2  # Current player or phase moved on
+UI_CHANGED_HANDS = 4  # Cards drawn, played, discarded or swapped
+UI_CHANGED_PLAYERS = 8  # Eliminations, protection, tokens
+UI_CHANGED_WAITING = 16  # The round started or stopped waiting for human input
+UI_CHANGED_ALL = 31
+
+
+class RoundUI:
+    # Everything GameRound asks of a front end. The base class is the headless one: it draws nothing,
+    # pays round tokens directly and cannot ask a human for input. Graphic.KivyRoundUI drives the Kivy
+    # screen; Simulation.py overrides the token hooks.
+    def state_changed(self, changes):
+        # At most once per engine step, with the UI_CHANGED_* flags of everything that step did.
+        pass
+
+    def set_waiting_flag(self, is_waiting):
+        # True just before a request_* call, False once the answer has been handled.
+        pass
+
+    def has_active_popup(self):
+        return False
+
+    def dismiss_active_popup(self):
+        pass
+
+    # Human input. The continuation is called with the answer whenever the player gives it.
+    def request_target_selection(self, acting_player, card, valid_targets, continuation):
+        # continuation(acting_player, target_id)
+        raise RuntimeError("Headless round has no UI to ask a human player for input. Use CPU seats only.")
+
+    def request_guard_value(self, acting_player, target_player, possible_values, continuation):
+        # continuation(acting_player, target_player, value)
+        raise RuntimeError("Headless round has no UI to ask a human player for input. Use CPU seats only.")
+
+    def request_option(self, player, prompt_text, options, continuation):
+        # options: (button label, value); continuation(player, value)
+        raise RuntimeError("Headless round has no UI to ask a human player for input. Use CPU seats only.")
+
+    # Tokens and the end of the game
+    def award_round_tokens(self, winners):
+        for winner in winners:
+            if winner:
+                winner.tokens += 1
+
+    def check_game_over_token(self, player):
+        return False
+
+    def game_over(self, winner):
+        pass
 
 
 # --- Core Game Logic Classes ---
 
 class Card:
+    __slots__ = ('name', 'value', 'description', 'image_path', 'vietnamese_name', 'count_classic', 'count_large',
+                 'card_id', 'is_targeting_effect')
+
     def __init__(self, name, value, description, image_path, vietnamese_name, count_classic, count_large):
         self.name = name
         self.value = value
@@ -78,6 +308,7 @@ class Card:
         self.vietnamese_name = vietnamese_name
         self.count_classic = count_classic
         self.count_large = count_large
+        self.card_id = CARD_IDS.get(name)
         self.is_targeting_effect = name not in ['Handmaid', 'Countess', 'Princess', 'Assassin', 'Count',
                                                 'Sheriff']
 
@@ -92,67 +323,78 @@ class Card:
 
 
 class Deck:
-    def __init__(self, num_players, log_callback):
-        self.cards = []
+    # Cards are stored as ids in an array('b') copied from the per-composition template and
+    # drawn from the end, so both building the deck and drawing are cheap.
+    def __init__(self, num_players, log_callback=None, rng=None):
+        self.card_ids = array('b')
         self.burned_card = None
-        self.log_callback = log_callback
+        self.log_callback = log_callback  # None keeps the deck silent (headless runs)
+        self.rng = rng if rng is not None else random  # Any object with shuffle/choice/randrange, e.g. random.Random(seed)
         self._create_deck(num_players)
         self.shuffle()
 
     def _create_deck(self, num_players):
-        self.cards = []
-        composition_key = 'count_classic' if num_players <= 4 else 'count_large'
-        self.log_callback(
-            f"Deck: Using composition for {'2-4 players (classic)' if composition_key == 'count_classic' else '5-8 players (large)'}.")
-
-        for card_name, prototype in CARD_PROTOTYPES.items():
-            count = getattr(prototype, composition_key, 0)
-            for _ in range(count):
-                self.cards.append(prototype)
-
-        if not self.cards:
-            self.log_callback("ERROR: No cards defined for this player count! Check CARD_PROTOTYPES counts.")
+        composition_key = composition_key_for_player_count(num_players)
+        if self.log_callback is not None:
+            self.log_callback(
+                f"Deck: Using composition for {'2-4 players (classic)' if composition_key == 'count_classic' else '5-8 players (large)'}.")
+
+        self.card_ids = array('b', deck_template(composition_key))
+
+        if not self.card_ids:
+            if self.log_callback is not None:
+                self.log_callback("ERROR: No cards defined for this player count! Check CARD_PROTOTYPES counts.")
             if composition_key == 'count_large' and any(
                     proto.count_classic > 0 for proto in CARD_PROTOTYPES.values()):
-                self.log_callback("Deck: Falling back to classic deck due to empty large deck definition.")
-                composition_key = 'count_classic'
-                for card_name, prototype in CARD_PROTOTYPES.items():
-                    count = getattr(prototype, composition_key, 0)
-                    for _ in range(count): self.cards.append(prototype)
+                if self.log_callback is not None:
+                    self.log_callback("Deck: Falling back to classic deck due to empty large deck definition.")
+                self.card_ids = array('b', deck_template('count_classic'))
+
+        if self.log_callback is not None:
+            self.log_callback(f"Deck: Created with {len(self.card_ids)} cards.")
 
-        self.log_callback(f"Deck: Created with {len(self.cards)} cards.")
+    @property
+    def cards(self):
+        # Prototypes in draw order (next card first). Builds a list; not for hot paths.
+        return [CARD_BY_ID[card_id] for card_id in reversed(self.card_ids)]
 
     def shuffle(self):
-        random.shuffle(self.cards)
-        self.log_callback("Deck: Shuffled.")
+        self.rng.shuffle(self.card_ids)
+        if self.log_callback is not None:
+            self.log_callback("Deck: Shuffled.")
 
     def draw(self):
-        return self.cards.pop(0) if self.cards else None
+        return CARD_BY_ID[self.card_ids.pop()] if self.card_ids else None
 
     def burn_one_card(self, num_players):
-        if num_players > 1 and self.cards:
+        if num_players > 1 and self.card_ids:
             self.burned_card = self.draw()
-            if self.burned_card:
-                self.log_callback(
-                    f"Deck: Burned one card ({self.burned_card.name}). {len(self.cards)} cards remaining.")
-            else:
-                self.log_callback("Deck: Tried to burn card, but deck was empty after draw attempt.")
+            if self.log_callback is not None:
+                if self.burned_card:
+                    self.log_callback(
+                        f"Deck: Burned one card ({self.burned_card.name}). {len(self.card_ids)} cards remaining.")
+                else:
+                    self.log_callback("Deck: Tried to burn card, but deck was empty after draw attempt.")
         elif num_players == 2:
-            if self.cards:
+            if self.card_ids:
                 self.burned_card = self.draw()
-                if self.burned_card:
+                if self.burned_card and self.log_callback is not None:
                     self.log_callback(
-                        f"Deck (2P): Burned one card ({self.burned_card.name}). {len(self.cards)} cards remaining.")
+                        f"Deck (2P): Burned one card ({self.burned_card.name}). {len(self.card_ids)} cards remaining.")
 
     def is_empty(self):
-        return not self.cards
+        return not self.card_ids
 
     def count(self):
-        return len(self.cards)
+        return len(self.card_ids)
 
 
 class Player:
-    def __init__(self, id_num, name, is_cpu=False):
+    __slots__ = ('id', 'name', 'hand', 'discard_pile', 'tokens', 'is_eliminated', 'is_protected', 'is_cpu',
+                 'sycophant_target_self', 'jester_on_player_id', 'effective_value_end_round',
+                 'discard_sum_end_round', 'policy')
+
+    def __init__(self, id_num, name, is_cpu=False, policy=None):
         self.id = id_num
         self.name = name
         self.hand = []
@@ -165,6 +407,7 @@ class Player:
         self.jester_on_player_id = None
         self.effective_value_end_round = 0
         self.discard_sum_end_round = 0
+        self.policy = policy  # CpuPolicy for this seat; None uses the round's default policy
 
     def reset_for_round(self):
         self.hand = []
@@ -214,317 +457,631 @@ class Player:
     def has_discarded(self, card_name):
         return any(c.name == card_name for c in self.discard_pile)
 
+    def get_state(self):
+        # Cards are shared immutable prototypes, so tuples of references are a complete copy.
+        return (tuple(self.hand), tuple(self.discard_pile), self.tokens, self.is_eliminated, self.is_protected,
+                self.sycophant_target_self, self.jester_on_player_id, self.effective_value_end_round,
+                self.discard_sum_end_round)
+
+    def set_state(self, state):
+        (hand, discard_pile, self.tokens, self.is_eliminated, self.is_protected, self.sycophant_target_self,
+         self.jester_on_player_id, self.effective_value_end_round, self.discard_sum_end_round) = state
+        self.hand = list(hand)
+        self.discard_pile = list(discard_pile)
+
     def __repr__(self):
         return f"Player({self.name}, Tokens:{self.tokens}, Hand:{[c.name for c in self.hand]})"
 
 
+class Ruleset(namedtuple('Ruleset', ['composition_key', 'active_cards', 'active_mask',
+                                       'guard_guess_values', 'countess_pairs', 'effects'])):
+    # Frozen view of which rules apply for one deck composition. Fetched once per round so the
+    # engine does membership tests against a frozenset instead of re-reading CARD_PROTOTYPES.
+    # effects: card id -> EffectSpec (see CARD_EFFECTS), None for cards outside the composition.
+    __slots__ = ()
+
+    @classmethod
+    def for_player_count(cls, num_players):
+        composition_key = composition_key_for_player_count(num_players)
+        ruleset = _RULESETS.get(composition_key)
+        if ruleset is None:
+            ruleset = _RULESETS[composition_key] = cls._build(composition_key)
+        return ruleset
+
+    @classmethod
+    def _build(cls, composition_key):
+        active = [proto for proto in CARD_PROTOTYPES.values() if getattr(proto, composition_key, 0) > 0]
+        active_cards = frozenset(proto.name for proto in active)
+        active_mask = 0
+        for proto in active:
+            active_mask |= 1 << proto.card_id
+        guard_guess_values = guessable_values(composition_key)  # Shared by Guard and Bishop
+        countess_pairs = tuple(('Countess', forcing) for forcing in ('King', 'Prince')
+                               if 'Countess' in active_cards and forcing in active_cards)
+        effects = tuple(CARD_EFFECTS[name] if name in active_cards else None for name in CARDS_DATA_RAW)
+        return cls(composition_key, active_cards, active_mask, guard_guess_values, countess_pairs, effects)
+
+    def has(self, card_name):
+        return card_name in self.active_cards
+
+    def must_play_countess(self, hand_names):
+        for countess, forcing in self.countess_pairs:
+            if countess in hand_names and forcing in hand_names:
+                return True
+        return False
+
+
+# Round phases. GameRound is a small state machine: every step (turn start, CPU move, effect
+# resolution, advancing) is queued and run by a flat driver loop, so all-CPU rounds run at
+# constant stack depth instead of recursing once per turn.
+PHASE_IDLE = 'idle'
+PHASE_TURN_START = 'turn_start'
+PHASE_CPU_THINKING = 'cpu_thinking'
+PHASE_AWAITING_INPUT = 'awaiting_input'
+PHASE_RESOLVING = 'resolving'
+PHASE_ADVANCING = 'advancing'
+PHASE_ROUND_OVER = 'round_over'
+
+
+RoundSnapshot = namedtuple('RoundSnapshot', [
+    'deck_card_ids', 'burned_card', 'player_states', 'current_player_idx', 'round_active', 'phase',
+    'game_over_pending_from_round', 'game_over_winner', 'round_winners', 'turn_count', 'resolving_card',
+    'eliminations'])
+
+
 class GameRound:
     # (The entire GameRound class from your original code goes here, unchanged)
-    def __init__(self, players_list, deck_obj, human_player_id, log_callback, ui_callbacks):
+    def __init__(self, players_list, deck_obj, human_player_id, log_callback=None, ui=None, scheduler=None,
+                 rng=None, default_policy=None, belief_tracker=None, event_stream=None, recorder=None,
+                 phase_stats=None):
         self.players = players_list  # List of Player objects
         self.deck = deck_obj
         self.human_player_id = human_player_id
-        self.log_message = log_callback
-        self.ui = ui_callbacks  # Dictionary of callbacks to the UI
+        self.events = event_stream if event_stream is not None else EventStream()  # Typed output, see Events.py
+        if log_callback is not None:  # Text log rendered from the events, as seen by the human seat
+            self.events.subscribe(TextLog(log_callback, players_list, human_player_id))
+        self.ui = ui if ui is not None else RoundUI()  # Front end, see RoundUI
+        self._ui_changes = 0  # UI_CHANGED_* flags not yet reported to self.ui
+        self.scheduler = scheduler if scheduler is not None else ClockScheduler()
+        self.rng = rng if rng is not None else random  # Seeded random.Random for reproducible simulations
+        self.rules = Ruleset.for_player_count(len(self.players))
+        self.default_policy = default_policy if default_policy is not None else RandomPolicy()
+        self.belief_tracker = belief_tracker  # Optional card-counting observer, fed on every card movement
+        self.recorder = recorder  # Optional Record.RoundRecorder: gets the deal, every decision and the result
+        self.phase_stats = phase_stats  # Optional Timing.PhaseStats: call counts and wall time per phase
+        if phase_stats is not None:
+            self.ui = phase_stats.wrap_ui(self.ui)
+            self._choose_target = phase_stats.wrap('cpu.target', self._choose_target)
+            self._choose_guess = phase_stats.wrap('cpu.guess', self._choose_guess)
+            self._choose_redraw = phase_stats.wrap('cpu.redraw', self._choose_redraw)
+            self._end_round_by_elimination = phase_stats.wrap('round_end.elimination', self._end_round_by_elimination)
+            self._end_round_deck_empty = phase_stats.wrap('round_end.deck_out', self._end_round_deck_empty)
 
         self.current_player_idx = 0
+        self.starting_player_idx = 0
         self.round_active = False
         self.game_over_pending_from_round = False  # If an effect causes game to end mid-round (e.g. Bishop token)
         self.game_over_winner = None
+        self.round_winners = []  # Filled when the round ends, before award_round_tokens_callback
+        self.turn_count = 0
+        self.resolving_card = None  # Card whose effect is being resolved, used as the elimination cause
+        self.eliminations = []  # (player id, card name that caused it) in elimination order
+        # Seat bitmasks (bit i = seat i; player ids are seat indexes), kept in step with is_eliminated and
+        # is_protected so turn advance and target lookups never rescan the table. Rebuilt by start_round and restore.
+        self.active_mask = 0
+        self.protected_mask = 0
+        self.active_count = 0
+        self.phase = PHASE_IDLE
+        self._steps = deque()  # Pending (step, args) pairs run by _run_steps
+        self._running_steps = False
+        self._think_generation = 0  # Bumped by cancel_cpu_thinking; CPU moves from older generations are dropped
+        self._pending_think = None  # (future or None, policy) while a CPU move is being computed
 
         # Shared mutable reference for the burned card if Prince needs it
         # self.deck.burned_card is the actual Card object
         self.shared_burned_card_ref = {'card': self.deck.burned_card}
 
     def start_round(self):
-        self.log_message("--- Starting New Round (GameRound) ---")
         for p in self.players:
             p.reset_for_round()
             drawn_card = self.deck.draw()
             if drawn_card:
                 p.add_card_to_hand(drawn_card)
             else:
-                self.log_message(f"Error: Not enough cards to deal to {p.name}. Deck empty.")
+                if self.events.enabled:
+                    self.events.emit(Message(f"Error: Not enough cards to deal to {p.name}. Deck empty."))
                 p.is_eliminated = True  # Should not happen with proper deck sizes
 
-        self.current_player_idx = random.randrange(len(self.players))
+        self._rebuild_seat_masks()
+        self.current_player_idx = self.rng.randrange(len(self.players))
+        self.starting_player_idx = self.current_player_idx
+        self.turn_count = 0
+        self.eliminations = []
+        if self.belief_tracker is not None:
+            self.belief_tracker.start_round(self)
+        if self.recorder is not None:
+            self.recorder.round_started(self)
         self.round_active = True
-        self.log_message(f"Round started. {self.players[self.current_player_idx].name} goes first.")
-        self.ui['update_ui_full_callback']()
-        self._process_current_player_turn_start()
-
-    def _execute_cpu_turn_after_delay(self, cpu_player):
+        if self.events.enabled:
+            self.events.emit(RoundStarted(self.players[self.current_player_idx].id))
+        self._ui_changes |= UI_CHANGED_ALL
+        self._queue_step(self._process_current_player_turn_start)
+
+    def snapshot(self):
+        # Full round state as immutable data; take it between steps (not while input is awaited).
+        return RoundSnapshot(
+            self.deck.card_ids[:], self.shared_burned_card_ref['card'],
+            tuple(p.get_state() for p in self.players), self.current_player_idx, self.round_active, self.phase,
+            self.game_over_pending_from_round, self.game_over_winner, tuple(self.round_winners), self.turn_count,
+            self.resolving_card, tuple(self.eliminations))
+
+    def restore(self, snapshot):
+        # A snapshot can be restored any number of times; nothing mutable is shared with it.
+        self.deck.card_ids = snapshot.deck_card_ids[:]
+        self.shared_burned_card_ref['card'] = snapshot.burned_card
+        for player, state in zip(self.players, snapshot.player_states):
+            player.set_state(state)
+        self.current_player_idx = snapshot.current_player_idx
+        self.round_active = snapshot.round_active
+        self.phase = snapshot.phase
+        self.game_over_pending_from_round = snapshot.game_over_pending_from_round
+        self.game_over_winner = snapshot.game_over_winner
+        self.round_winners = list(snapshot.round_winners)
+        self.turn_count = snapshot.turn_count
+        self.resolving_card = snapshot.resolving_card
+        self.eliminations = list(snapshot.eliminations)
+        self._rebuild_seat_masks()
+        self._steps.clear()
+
+    def _rebuild_seat_masks(self):
+        active = protected = 0
+        for seat, p in enumerate(self.players):
+            if not p.is_eliminated:
+                active |= 1 << seat
+                if p.is_protected:
+                    protected |= 1 << seat
+        self.active_mask = active
+        self.protected_mask = protected
+        self.active_count = bin(active).count('1')
+
+    def _next_active_seat(self, seat):
+        # First seat after `seat` still in the round, wrapping around; -1 if nobody is left.
+        later = self.active_mask >> (seat + 1)
+        if later:
+            return seat + 1 + (later & -later).bit_length() - 1
+        return (self.active_mask & -self.active_mask).bit_length() - 1
+
+    def _active_players(self):
+        # Players still in the round, in seat order.
+        players = self.players
+        mask = self.active_mask
+        active = []
+        while mask:
+            low = mask & -mask
+            active.append(players[low.bit_length() - 1])
+            mask ^= low
+        return active
+
+    def _queue_step(self, step, *args):
+        # Entry points (start_round, UI callbacks, scheduler callbacks) start the driver loop;
+        # steps queued from inside a running step are picked up by the loop instead of nesting.
+        self._steps.append((step, args))
+        if not self._running_steps:
+            self._run_steps()
+
+    def _run_steps(self):
+        self._running_steps = True
+        try:
+            steps = self._steps
+            while steps:
+                step, args = steps.popleft()
+                step(*args)
+                if not steps and self._ui_changes:  # The UI may queue more steps from its update
+                    changes, self._ui_changes = self._ui_changes, 0
+                    self.ui.state_changed(changes)
+        finally:
+            self._running_steps = False
+
+    def _start_cpu_thinking(self, cpu_player, min_delay):
+        # The card choice, the expensive part for searching policies, is computed by the scheduler
+        # (off the Kivy thread with ClockScheduler). Target/guess choices stay on the engine thread.
+        generation = self._think_generation
+        policy = self._policy_for(cpu_player)
+
+        def compute():
+            if generation != self._think_generation or self.rules.must_play_countess(
+                    cpu_player.get_hand_card_names()):
+                return None
+            if self.phase_stats is not None:
+                return self.phase_stats.call('cpu.card', policy.choose_card, self, cpu_player, list(cpu_player.hand))
+            return policy.choose_card(self, cpu_player, list(cpu_player.hand))
+
+        def on_done(chosen_card):
+            if generation == self._think_generation:
+                self._pending_think = None
+                self._queue_step(self._execute_cpu_turn_after_delay, cpu_player, chosen_card)
+
+        self._pending_think = (None, policy)
+        future = self.scheduler.think(compute, on_done, min_delay)
+        if self._pending_think is not None:
+            self._pending_think = (future, policy)
+
+    def cancel_cpu_thinking(self):
+        # Drops the CPU move being computed, if any. Used when the round ends, the session is reset
+        # or a player forfeits.
+        self._think_generation += 1
+        pending, self._pending_think = self._pending_think, None
+        if pending is not None:
+            future, policy = pending
+            if future is not None:
+                future.cancel()
+            policy.cancel()
+
+    def forfeit(self, player):
+        # The player leaves the round immediately, whoever's turn it is.
+        self._queue_step(self._forfeit, player)
+
+    def _forfeit(self, player):
+        if not self.round_active or player.is_eliminated: return
+        was_thinking = self.phase == PHASE_CPU_THINKING
+        self.cancel_cpu_thinking()
+        self._eliminate_player(player, cause='Forfeit')
+        if player is self.players[self.current_player_idx] or self.game_over_pending_from_round:
+            self._queue_step(self._finish_effect_and_proceed)
+        elif not self._check_round_end_by_elimination() and was_thinking:
+            self._queue_step(self._start_cpu_thinking, self.players[self.current_player_idx], 0.0)
+        self._ui_changes |= UI_CHANGED_PLAYERS
+
+    def _execute_cpu_turn_after_delay(self, cpu_player, chosen_card=None):
         if not self.round_active or cpu_player.is_eliminated:
             if self.round_active and not self.players[
                 self.current_player_idx].is_eliminated:  # If current player is still this CPU and round active
-                self._advance_to_next_turn()
+                self._queue_step(self._advance_to_next_turn)
             return
 
         if self.players[self.current_player_idx] != cpu_player:
             return
 
-        self.log_message(f"CPU ({cpu_player.name}) decides to play.")
-        self._cpu_play_turn(cpu_player)
+        self._cpu_play_turn(cpu_player, chosen_card)
 
     def _process_current_player_turn_start(self):
         if not self.round_active: return
+        self.phase = PHASE_TURN_START
 
         current_player = self.players[self.current_player_idx]
         if current_player.is_eliminated:
-            self._advance_to_next_turn()
+            self._queue_step(self._advance_to_next_turn)
             return
 
         current_player.is_protected = False
+        self.protected_mask &= ~(1 << self.current_player_idx)
 
         if not self.deck.is_empty():
-            drawn_card = self.deck.draw()
-            current_player.add_card_to_hand(drawn_card)
-            if not current_player.is_cpu:
-                self.log_message(
-                    f"You ({current_player.name}) drew {drawn_card.name}. Hand: {current_player.get_hand_card_names()}.")
+            if self.phase_stats is not None:
+                drawn_card = self.phase_stats.call('draw', self.deck.draw)
             else:
-                self.log_message(f"{current_player.name} drew a card. Hand size: {len(current_player.hand)}.")
-            self.ui['update_ui_full_callback']()
+                drawn_card = self.deck.draw()
+            current_player.add_card_to_hand(drawn_card)
+            self.turn_count += 1
+            if self.belief_tracker is not None:
+                self.belief_tracker.card_drawn(current_player, drawn_card)
+            if self.events.enabled:
+                self.events.emit(CardDrawn(current_player.id, drawn_card, len(current_player.hand)))
+            self._ui_changes |= UI_CHANGED_TURN | UI_CHANGED_HANDS
         else:
-            self.log_message("Deck is empty. Round ends by deck out.")
             self._end_round_deck_empty()
             return
 
         if current_player.is_cpu:
-            self.log_message(f"CPU ({current_player.name}) is thinking...")
-            delay_duration = random.uniform(1.0, 2.0)
-            Clock.schedule_once(lambda dt: self._execute_cpu_turn_after_delay(current_player), delay_duration)
+            min_delay, max_delay = self.scheduler.cpu_delay_range
+            delay_duration = self.rng.uniform(min_delay, max_delay) if max_delay > 0 else 0
+            self.phase = PHASE_CPU_THINKING
+            self._start_cpu_thinking(current_player, delay_duration)
         else:
-            self.log_message(f"Your turn, {current_player.name}. Choose a card to play.")
-            self.ui['set_waiting_flag_callback'](False)
-            hand_names = current_player.get_hand_card_names()
-            if self._is_card_in_current_deck('Countess') and 'Countess' in hand_names and \
-                    ((self._is_card_in_current_deck('King') and 'King' in hand_names) or \
-                     (self._is_card_in_current_deck('Prince') and 'Prince' in hand_names)):
-                self.log_message("INFO: You have Countess and King/Prince. You MUST play Countess.")
+            self.phase = PHASE_AWAITING_INPUT
+            self.ui.set_waiting_flag(False)
+            self._ui_changes |= UI_CHANGED_WAITING
+            if self.events.enabled:
+                self.events.emit(Message(f"Your turn, {current_player.name}. Choose a card to play."))
+                if self.rules.must_play_countess(current_player.get_hand_card_names()):
+                    self.events.emit(Message("INFO: You have Countess and King/Prince. You MUST play Countess."))
 
     def human_plays_card(self, card_name_played):
+        self._queue_step(self._human_plays_card, card_name_played)
+
+    def _human_plays_card(self, card_name_played):
         player = self.players[self.current_player_idx]
         if player.is_cpu or not self.round_active: return
 
         actual_card_to_play_name = card_name_played
         hand_names = player.get_hand_card_names()
-        has_king_or_prince = (self._is_card_in_current_deck('King') and 'King' in hand_names) or \
-                             (self._is_card_in_current_deck('Prince') and 'Prince' in hand_names)
-        if self._is_card_in_current_deck('Countess') and 'Countess' in hand_names and has_king_or_prince:
+        forced = self.rules.must_play_countess(hand_names)
+        if forced:
             if card_name_played != 'Countess':
-                self.log_message("Countess Rule: Auto-playing Countess as King/Prince also in hand.")
+                if self.events.enabled:
+                    self.events.emit(Message("Countess Rule: Auto-playing Countess as King/Prince also in hand."))
                 actual_card_to_play_name = 'Countess'
         card_object_played = player.play_card(actual_card_to_play_name)
         if card_object_played:
+            if self.recorder is not None and not forced:  # Forced plays are not decisions (same as for CPUs)
+                self.recorder.decision(card_object_played.card_id)
             self._handle_card_played_logic(player, card_object_played)
         else:
-            self.log_message(
-                f"ERROR: {player.name} tried to play {actual_card_to_play_name} but failed (not in hand or other issue).")
-            self.ui['set_waiting_flag_callback'](False)
-            if self.round_active: self._advance_to_next_turn()
-
-    def _cpu_play_turn(self, cpu_player):
-        self.log_message(f"CPU ({cpu_player.name})'s turn.")
+            if self.events.enabled:
+                self.events.emit(Message(f"ERROR: {player.name} tried to play {actual_card_to_play_name} "
+                                         f"but failed (not in hand or other issue)."))
+            self.ui.set_waiting_flag(False)
+            self._ui_changes |= UI_CHANGED_WAITING
+            if self.round_active: self._queue_step(self._advance_to_next_turn)
+
+    def _cpu_play_turn(self, cpu_player, chosen_card_object=None):
         hand_names = cpu_player.get_hand_card_names()
 
         # Bắt buộc chơi Countess nếu có King hoặc Prince
-        has_king_or_prince = (self._is_card_in_current_deck('King') and 'King' in hand_names) or \
-                            (self._is_card_in_current_deck('Prince') and 'Prince' in hand_names)
-        if self._is_card_in_current_deck('Countess') and 'Countess' in hand_names and has_king_or_prince:
-            self.log_message(f"CPU ({cpu_player.name}) has Countess and King/Prince, must play Countess.")
+        if self.rules.must_play_countess(hand_names):
             card_object_played = cpu_player.play_card('Countess')
             self._handle_card_played_logic(cpu_player, card_object_played)
             return
 
-        # Nếu có Princess và nhiều hơn 1 lá, tránh chơi Princess
-        playable_cards = list(cpu_player.hand)
-        if self._is_card_in_current_deck('Princess') and len(playable_cards) > 1:
-            playable_cards = [c for c in playable_cards if c.name != 'Princess']
-            if not playable_cards:
-                playable_cards = list(cpu_player.hand)  # Nếu không còn lựa chọn, chơi bất kỳ
-
-        # Chọn ngẫu nhiên 1 lá hợp lệ
-        chosen_card_object = random.choice(playable_cards) if playable_cards else random.choice(cpu_player.hand)
+        # Chính sách CPU chọn 1 lá hợp lệ (đã tính sẵn nếu CPU suy nghĩ trên luồng khác)
+        if chosen_card_object is None or chosen_card_object not in cpu_player.hand:
+            chosen_card_object = self._policy_for(cpu_player).choose_card(self, cpu_player, cpu_player.hand)
+        if self.recorder is not None:
+            self.recorder.decision(chosen_card_object.card_id)
         card_object_played = cpu_player.play_card(chosen_card_object.name)
         self._handle_card_played_logic(cpu_player, card_object_played)
 
     def _handle_card_played_logic(self, player, card_object_played):
-        self.log_message(f"{player.name} plays {card_object_played.name}.")
-        self.ui['update_ui_full_callback']()
-        if self._is_card_in_current_deck('Princess') and card_object_played.name == 'Princess':
-            self.log_message(f"{player.name} discarded the Princess and is eliminated!")
-            self._eliminate_player(player)
-            self._finish_effect_and_proceed()
-            return
+        if self.events.enabled:
+            self.events.emit(CardPlayed(player.id, card_object_played))
+        self.phase = PHASE_RESOLVING
+        self.resolving_card = card_object_played
+        if self.belief_tracker is not None:
+            self.belief_tracker.card_discarded(player, card_object_played)
+        self._ui_changes |= UI_CHANGED_HANDS
         needs_input = self._execute_card_effect(player, card_object_played)
-        if not needs_input:
+        if needs_input:
+            self.phase = PHASE_AWAITING_INPUT
+        else:
             self._finish_effect_and_proceed()
 
-    def _is_card_in_current_deck(self, card_name):
-        prototype = CARD_PROTOTYPES.get(card_name)
-        if not prototype: return False
-        composition_key = 'count_classic' if len(self.players) <= 4 else 'count_large'
-        return getattr(prototype, composition_key, 0) > 0
+    def _policy_for(self, player):
+        return player.policy if player.policy is not None else self.default_policy
+
+    def _choose_target(self, player, card_played, valid_targets):
+        target_player = self._policy_for(player).choose_target(self, player, card_played, valid_targets)
+        if self.recorder is not None:
+            self.recorder.decision(target_player.id)
+        return target_player
+
+    def _choose_guess(self, player, target_player, possible_values):
+        guessed_value = self._policy_for(player).choose_guess(self, player, target_player, possible_values)
+        if self.recorder is not None:
+            self.recorder.decision(guessed_value)
+        return guessed_value
+
+    def _choose_redraw(self, player, card):
+        redraw = self._policy_for(player).choose_redraw(self, player, card)
+        if self.recorder is not None:
+            self.recorder.decision(1 if redraw else 0)
+        return redraw
+
+    # Human answers come back through the step driver, so whatever they change reaches the UI as
+    # one state_changed call.
+    def _from_ui(self, continuation):
+        return lambda *args: self._queue_step(continuation, *args)
+
+    def _request_target_selection(self, acting_player, card, valid_targets, continuation):
+        self._start_waiting()
+        self.ui.request_target_selection(acting_player, card, valid_targets, self._from_ui(continuation))
+
+    def _request_guard_value(self, acting_player, target_player, possible_values, continuation):
+        self._start_waiting()
+        self.ui.request_guard_value(acting_player, target_player, possible_values, self._from_ui(continuation))
+
+    def _request_option(self, player, prompt_text, options, continuation):
+        self._start_waiting()
+        self.ui.request_option(player, prompt_text, options, self._from_ui(continuation))
+
+    def _start_waiting(self):
+        # The UI only opens its prompt; the redraw comes with this step's state_changed.
+        self.ui.set_waiting_flag(True)
+        self._ui_changes |= UI_CHANGED_WAITING
 
     def _get_valid_targets(self, acting_player, include_self=False, targeted_effect_requires_unprotected=True,
                            allow_no_hand=False):
+        # Walks the set bits of the active mask in seat order (the order policies and the rng see).
+        players = self.players
+        acting_bit = 1 << acting_player.id
+        candidates = self.active_mask
+        if targeted_effect_requires_unprotected:
+            candidates &= ~self.protected_mask | acting_bit  # The acting player's own Handmaid never blocks
+        if not include_self:
+            candidates &= ~acting_bit
         targets = []
-        for p in self.players:
-            if p == acting_player and not include_self:
-                continue
-            if p.is_eliminated:
-                continue
-            if targeted_effect_requires_unprotected and p.is_protected and p != acting_player:
-                continue
-            # Simplified logic from original. Needs card_object_played. Passing it would be a bigger refactor.
-            # Assume for now that this logic is sufficient as it was in the original.
-            if not p.hand and not allow_no_hand and p != acting_player:
+        while candidates:
+            low = candidates & -candidates
+            candidates ^= low
+            p = players[low.bit_length() - 1]
+            if not p.hand and not allow_no_hand and low != acting_bit:
                 continue
             targets.append(p)
         return targets
 
+    def _effect_targets(self, acting_player, card):
+        spec = self.rules.effects[card.card_id]
+        return self._get_valid_targets(acting_player, include_self=spec.self_allowed,
+                                       targeted_effect_requires_unprotected=spec.requires_unprotected,
+                                       allow_no_hand=spec.allow_no_hand)
+
     def _execute_card_effect(self, player, card):
-        card_name = card.name
-        if not self._is_card_in_current_deck(card_name):
-            self.log_message(f"{card_name} is not part of the current deck composition. Effect fizzles.")
+        # Returns True if the effect is waiting for input from a human player.
+        spec = self.rules.effects[card.card_id]
+        if spec is None:
+            if self.events.enabled:
+                self.events.emit(Message(f"{card.name} is not part of the current deck composition. Effect fizzles."))
             return False
         must_target_self = player.sycophant_target_self
         player.sycophant_target_self = False
-        effect_method_name = f"_effect_{card_name.lower().replace(' ', '_')}"
-        effect_method = getattr(self, effect_method_name, None)
-        if effect_method:
-            if card_name in ['Handmaid', 'Countess', 'Assassin', 'Count', 'Sheriff']:
-                return effect_method(player, card)
-            else:
-                return effect_method(player, card, must_target_self)
-        else:
-            self.log_message(f"Effect for {card_name} not implemented or is passive/automatic.");
+        if must_target_self and spec.targeted and not spec.self_allowed:
+            if self.events.enabled:
+                self.events.emit(Message(f"Sycophant: {player.name} must target self, but {card.name} cannot. Fizzles."))
             return False
+        if self.phase_stats is not None:
+            needs_input = self.phase_stats.call('effect.' + card.name, spec.handler,
+                                                self, player, card, must_target_self)
+        else:
+            needs_input = spec.handler(self, player, card, must_target_self)
+        return spec.asks_player and needs_input
 
     def _finish_effect_and_proceed(self):
-        self.ui['set_waiting_flag_callback'](False)
-        if self.ui['get_active_popup_callback']():
-            self.ui['dismiss_active_popup_callback']()
+        self.ui.set_waiting_flag(False)
+        if self.ui.has_active_popup():
+            self.ui.dismiss_active_popup()
+        self._ui_changes |= UI_CHANGED_WAITING | UI_CHANGED_HANDS | UI_CHANGED_PLAYERS
         if self.game_over_pending_from_round:
             self.round_active = False
-            self.ui['game_over_callback'](self.game_over_winner)
+            self.phase = PHASE_ROUND_OVER
+            if self.recorder is not None:
+                self.recorder.round_ended(self)
+            self._ui_changes |= UI_CHANGED_ROUND
+            self.ui.game_over(self.game_over_winner)
             return
         round_ended_by_elimination = self._check_round_end_by_elimination()
         if not round_ended_by_elimination and self.round_active:
-            self._advance_to_next_turn()
-        self.ui['update_ui_full_callback']()
+            self._queue_step(self._advance_to_next_turn)
 
-    def _eliminate_player(self, player_to_eliminate):
+    def _eliminate_player(self, player_to_eliminate, cause=None):
         if player_to_eliminate.is_eliminated: return
         player_to_eliminate.is_eliminated = True
-        self.log_message(f"{player_to_eliminate.name} has been eliminated!")
-        if self._is_card_in_current_deck('Sheriff') and player_to_eliminate.has_discarded('Sheriff'):
-            self.log_message(f"{player_to_eliminate.name} had Sheriff in discard and gains a token!")
+        seat_bit = 1 << player_to_eliminate.id
+        self.active_mask &= ~seat_bit
+        self.protected_mask &= ~seat_bit
+        self.active_count -= 1
+        if cause is None and self.resolving_card:
+            cause = self.resolving_card.name
+        self.eliminations.append((player_to_eliminate.id, cause))
+        if self.events.enabled:
+            self.events.emit(Eliminated(player_to_eliminate.id, cause))
+        if self.rules.has('Sheriff') and player_to_eliminate.has_discarded('Sheriff'):
+            if self.events.enabled:
+                self.events.emit(TokenGained(player_to_eliminate.id, CARD_PROTOTYPES['Sheriff']))
             player_to_eliminate.tokens += 1
-            if self.ui['check_game_over_token_callback'](player_to_eliminate):
+            if self.ui.check_game_over_token(player_to_eliminate):
                 self.game_over_pending_from_round = True
                 self.game_over_winner = player_to_eliminate
 
     def _advance_to_next_turn(self):
         if not self.round_active: return
-        attempts = 0
-        while attempts < len(self.players) * 2:
-            self.current_player_idx = (self.current_player_idx + 1) % len(self.players)
-            if not self.players[self.current_player_idx].is_eliminated:
-                break
-            attempts += 1
-        active_players_count = sum(1 for p in self.players if not p.is_eliminated)
-        if active_players_count <= 1 and self.round_active:
+        self.phase = PHASE_ADVANCING
+        next_seat = self._next_active_seat(self.current_player_idx)
+        if next_seat >= 0:
+            self.current_player_idx = next_seat
+        if self.active_count <= 1:
             self._end_round_by_elimination()
             return
-        next_player = self.players[self.current_player_idx]
-        if not next_player.is_cpu:
-            self.log_message(f"--- Your turn ({next_player.name}) ---")
-        else:
-            self.log_message(f"--- {next_player.name}'s turn ---")
-        self._process_current_player_turn_start()
+        if self.events.enabled:
+            self.events.emit(TurnStarted(self.players[self.current_player_idx].id))
+        self._queue_step(self._process_current_player_turn_start)
 
     def _check_round_end_by_elimination(self):
         if not self.round_active: return True
-        active_players = [p for p in self.players if not p.is_eliminated]
-        if len(active_players) <= 1:
-            self._end_round_by_elimination(active_players)
+        if self.active_count <= 1:
+            self._end_round_by_elimination()
             return True
         return False
 
-    def _end_round_by_elimination(self, active_players_list=None):
+    def _end_round_by_elimination(self):
         if not self.round_active: return
-        self.log_message("Round ends: one or zero players remain active.")
         self.round_active = False
-        if active_players_list is None:
-            active_players_list = [p for p in self.players if not p.is_eliminated]
-        winner = active_players_list[0] if len(active_players_list) == 1 else None
-        if winner:
-            self.log_message(f"{winner.name} is the last player remaining and wins the round!")
-        else:
-            self.log_message("All players were eliminated simultaneously! No winner this round from eliminations.")
-        self.ui['award_round_tokens_callback']([winner] if winner else [])
+        self.cancel_cpu_thinking()
+        self.phase = PHASE_ROUND_OVER
+        self.round_winners = [self.players[self.active_mask.bit_length() - 1]] if self.active_count == 1 else []
+        if self.recorder is not None:
+            self.recorder.round_ended(self)
+        if self.events.enabled:
+            self.events.emit(RoundEnded(ROUND_END_ELIMINATION, tuple(p.id for p in self.round_winners)))
+        self._award_round_tokens(self.round_winners)
+
+    def _award_round_tokens(self, winners):
+        # Jester bets are paid before the round winners get their tokens, even to eliminated players.
+        game_over_player = None
+        if winners and self.rules.has('Jester'):
+            for p in self.players:
+                if p.jester_on_player_id is None or all(w.id != p.jester_on_player_id for w in winners):
+                    continue
+                p.tokens += 1
+                if self.events.enabled:
+                    self.events.emit(TokenGained(p.id, CARD_PROTOTYPES['Jester']))
+                if game_over_player is None and self.ui.check_game_over_token(p):
+                    game_over_player = p
+        self._ui_changes |= UI_CHANGED_ROUND | UI_CHANGED_PLAYERS
+        if game_over_player is not None:
+            self.ui.game_over(game_over_player)  # The game is decided; the round winners get nothing more
+            return
+        self.ui.award_round_tokens(winners)
 
     def _end_round_deck_empty(self):
         if not self.round_active: return
-        self.log_message("Round ends: deck is empty. Comparing hands of remaining active players.")
         self.round_active = False
-        active_players_with_hands = [p for p in self.players if not p.is_eliminated and p.hand]
+        self.cancel_cpu_thinking()
+        self.phase = PHASE_ROUND_OVER
+        active_players_with_hands = [p for p in self._active_players() if p.hand]
         if not active_players_with_hands:
-            self.log_message("No active players with cards remaining. No winner this round.");
-            self.ui['award_round_tokens_callback']([])
+            self.round_winners = []
+            if self.recorder is not None:
+                self.recorder.round_ended(self)
+            if self.events.enabled:
+                self.events.emit(RoundEnded(ROUND_END_DECK_OUT, ()))
+            self._award_round_tokens([])
             return
-        is_count_in_deck = self._is_card_in_current_deck('Count')
+        is_count_in_deck = self.rules.has('Count')
         for p_obj in active_players_with_hands:
             p_obj.effective_value_end_round = p_obj.hand[0].value
-            if is_count_in_deck and p_obj.has_discarded('Count'):
-                p_obj.effective_value_end_round += 1
-                self.log_message(
-                    f"{p_obj.name} has Count in discard. Hand: {p_obj.hand[0].name}, Effective Value: {p_obj.effective_value_end_round}")
+            counts_discarded = sum(1 for c in p_obj.discard_pile if c.name == 'Count') if is_count_in_deck else 0
+            p_obj.effective_value_end_round += counts_discarded  # Each Count in the discard pile is worth +1
         active_players_with_hands.sort(key=lambda p: p.effective_value_end_round, reverse=True)
         highest_val = active_players_with_hands[0].effective_value_end_round
         winners_by_val = [p for p in active_players_with_hands if p.effective_value_end_round == highest_val]
         final_winners = []
         if len(winners_by_val) == 1:
             final_winners = winners_by_val
-            self.log_message(
-                f"{final_winners[0].name} has the highest card ({final_winners[0].hand[0].name}, effective value {final_winners[0].effective_value_end_round}) and wins!")
         else:
-            self.log_message(f"Tie in card values at {highest_val}. Comparing sum of discarded card values.")
             for p_obj in winners_by_val:
                 p_obj.discard_sum_end_round = sum(c.value for c in p_obj.discard_pile)
-                self.log_message(
-                    f"{p_obj.name} (Card: {p_obj.hand[0].name}, Eff: {p_obj.effective_value_end_round}) discard sum: {p_obj.discard_sum_end_round}")
             winners_by_val.sort(key=lambda p: p.discard_sum_end_round, reverse=True)
             highest_discard_sum = winners_by_val[0].discard_sum_end_round
             final_winners = [p for p in winners_by_val if p.discard_sum_end_round == highest_discard_sum]
-            if len(final_winners) == 1:
-                self.log_message(
-                    f"{final_winners[0].name} wins the tie-breaker with highest discard sum ({highest_discard_sum})!")
-            else:
-                self.log_message(
-                    f"Still a tie! {[p.name for p in final_winners]} win this round.")
-        self.ui['award_round_tokens_callback'](final_winners)
+        self.round_winners = final_winners
+        if self.recorder is not None:
+            self.recorder.round_ended(self)
+        if self.events.enabled:
+            winner_ids = tuple(p.id for p in final_winners)
+            self.events.emit(Showdown(
+                tuple((p.id, p.hand[0], p.effective_value_end_round, sum(c.value for c in p.discard_pile))
+                      for p in active_players_with_hands), winner_ids))
+            self.events.emit(RoundEnded(ROUND_END_DECK_OUT, winner_ids))
+        self._award_round_tokens(final_winners)
     
     def _effect_guard(self, player, card_played, must_target_self):
-        valid_targets = self._get_valid_targets(player, include_self=False, targeted_effect_requires_unprotected=True)
-        if must_target_self:  # Guard cannot target self
-            self.log_message(f"Sycophant: {player.name} must target self, but Guard cannot. Effect fizzles.")
+        valid_targets = self._effect_targets(player, card_played)
+        if not valid_targets:
+            if self.events.enabled:
+                self.events.emit(Message("Guard: No valid targets."))
             return False
-        if not valid_targets: self.log_message("Guard: No valid targets."); return False
 
         if player.is_cpu:
-            target_player = random.choice(valid_targets)
-            possible_values = sorted(list(set(proto.value for name, proto in CARD_PROTOTYPES.items()
-                                              if proto.value != 1 and self._is_card_in_current_deck(name))))
-            if not possible_values: self.log_message("Guard (CPU): No valid card values to guess!"); return False
-            guess_val = random.choice(possible_values)
-            self.log_message(f"CPU ({player.name}) plays Guard on {target_player.name}, guessing value {guess_val}.")
+            target_player = self._choose_target(player, card_played, valid_targets)
+            possible_values = self.rules.guard_guess_values
+            if not possible_values:
+                if self.events.enabled:
+                    self.events.emit(Message("Guard (CPU): No valid card values to guess!"))
+                return False
+            guess_val = self._choose_guess(player, target_player, possible_values)
             self._resolve_guard_guess(player, target_player, guess_val)
             return False
         else:
-            self.ui['request_target_selection_callback'](
+            self._request_target_selection(
                 player, card_played, valid_targets,
                 self._resolve_guard_target_selected  # GameRound method as callback
             )
@@ -532,22 +1089,26 @@ class GameRound:
 
     def _resolve_guard_target_selected(self, acting_player, target_player_id):  # Called by UI
         target_player = next(p for p in self.players if p.id == target_player_id)
+        if self.recorder is not None:
+            self.recorder.decision(target_player_id)
 
-        possible_values_to_guess = sorted(list(set(proto.value for name, proto in CARD_PROTOTYPES.items()
-                                                   if proto.value != 1 and self._is_card_in_current_deck(name))))
+        possible_values_to_guess = list(self.rules.guard_guess_values)
         if not possible_values_to_guess:
-            self.log_message(f"Guard: No valid card values to guess against {target_player.name}! Effect fizzles.");
+            if self.events.enabled:
+                self.events.emit(Message(f"Guard: No valid card values to guess against {target_player.name}! "
+                                         f"Effect fizzles."))
             self._finish_effect_and_proceed()
             return
 
-        self.ui['request_guard_value_popup_callback'](
+        self._request_guard_value(
             acting_player, target_player, possible_values_to_guess,
             self._resolve_guard_value_guessed  # GameRound method as callback
         )
         # Still waiting for input
 
     def _resolve_guard_value_guessed(self, acting_player, target_player, guessed_value):  # Called by UI
-        self.log_message(f"{acting_player.name} (Guard) guesses value {guessed_value} for {target_player.name}.")
+        if self.recorder is not None:
+            self.recorder.decision(guessed_value)
         self._resolve_guard_guess(acting_player, target_player, guessed_value)
         self._finish_effect_and_proceed()
 
@@ -556,11 +1117,13 @@ class GameRound:
 
         target_card = target_player.hand[0]
 
-        if self._is_card_in_current_deck('Assassin') and target_card.name == 'Assassin':
-            self.log_message(f"{target_player.name} reveals Assassin! {acting_player.name} is eliminated!")
-            self._eliminate_player(acting_player)
+        if self.rules.has('Assassin') and target_card.name == 'Assassin':
+            if self.events.enabled:
+                self.events.emit(AssassinRevealed(target_player.id, acting_player.id))
+            self._eliminate_player(acting_player, cause='Assassin')
 
             target_player.play_card('Assassin')  # Discard Assassin
+            new_card = None
             if not self.deck.is_empty():
                 new_card = self.deck.draw()
                 if new_card: target_player.add_card_to_hand(new_card)
@@ -568,29 +1131,38 @@ class GameRound:
                 new_card = self.shared_burned_card_ref['card']
                 target_player.add_card_to_hand(new_card)
                 self.shared_burned_card_ref['card'] = None
-
-            self.log_message(f"{target_player.name} discards Assassin and draws a new card.")
+            if self.belief_tracker is not None:
+                self.belief_tracker.card_discarded(target_player, target_card)
+                if new_card:
+                    self.belief_tracker.card_drawn(target_player, new_card)
+            if self.events.enabled:
+                self.events.emit(CardDiscarded(target_player.id, target_card))
+                if new_card:
+                    self.events.emit(CardDrawn(target_player.id, new_card, len(target_player.hand)))
             return
 
-        if target_card.value == guessed_value:
-            self.log_message(f"Correct! {target_player.name} had {target_card.name}. Eliminated.")
+        correct = target_card.value == guessed_value
+        if self.events.enabled:
+            self.events.emit(GuardGuess(acting_player.id, target_player.id, guessed_value,
+                                        target_card if correct else None))
+        if correct:
+            if self.belief_tracker is not None:
+                self.belief_tracker.card_revealed(target_player, target_card)
             self._eliminate_player(target_player)
-        else:
-            self.log_message(f"Incorrect guess. {target_player.name} did not have value {guessed_value}.")
 
     def _effect_priest(self, player, card_played, must_target_self):
-        valid_targets = self._get_valid_targets(player, include_self=False, targeted_effect_requires_unprotected=True)
-        if must_target_self:
-            self.log_message(f"Sycophant: {player.name} must target self, but Priest cannot. Fizzles.")
+        valid_targets = self._effect_targets(player, card_played)
+        if not valid_targets:
+            if self.events.enabled:
+                self.events.emit(Message("Priest: No valid targets."))
             return False
-        if not valid_targets: self.log_message("Priest: No valid targets."); return False
 
         if player.is_cpu:
-            target_player = random.choice(valid_targets)
+            target_player = self._choose_target(player, card_played, valid_targets)
             self._resolve_priest_effect(player, target_player)
             return False
         else:
-            self.ui['request_target_selection_callback'](
+            self._request_target_selection(
                 player, card_played, valid_targets,
                 self._resolve_priest_target_selected
             )
@@ -598,38 +1170,39 @@ class GameRound:
 
     def _resolve_priest_target_selected(self, acting_player, target_player_id):
         target_player = next(p for p in self.players if p.id == target_player_id)
+        if self.recorder is not None:
+            self.recorder.decision(target_player_id)
         self._resolve_priest_effect(acting_player, target_player)
         # UI does not show card for human player directly, log message is enough.
         self._finish_effect_and_proceed()
 
     def _resolve_priest_effect(self, acting_player, target_player):
+        self._look_at_hand(acting_player, target_player, CARD_PROTOTYPES['Priest'])
+
+    def _look_at_hand(self, acting_player, target_player, source_card):  # Priest, Baroness, Cardinal
         if not target_player.hand:
-            self.log_message(f"{target_player.name} has no hand to see (Priest).")
+            if self.events.enabled:
+                self.events.emit(Message(f"{target_player.name} has no hand to see ({source_card.name})."))
             return
 
-        target_card_name = target_player.hand[0].name
-        if not acting_player.is_cpu:  # Human player
-            self.log_message(
-                f"You ({acting_player.name}) use Priest on {target_player.name} and see their {target_card_name}.")
-        elif not target_player.is_cpu:  # CPU on Human
-            self.log_message(f"{acting_player.name} (Priest) looks at your hand and sees your {target_card_name}.")
-        else:  # CPU on CPU
-            self.log_message(f"{acting_player.name} (Priest) looks at {target_player.name}'s hand.")
-            # AI would store this info: acting_player.remember_card(target_player.id, target_card_name)
+        if self.belief_tracker is not None:
+            self.belief_tracker.card_seen(acting_player, target_player, target_player.hand[0])
+        if self.events.enabled:
+            self.events.emit(HandSeen(acting_player.id, target_player.id, target_player.hand[0], source_card))
 
     def _effect_baron(self, player, card_played, must_target_self):
-        valid_targets = self._get_valid_targets(player, include_self=False, targeted_effect_requires_unprotected=True)
-        if must_target_self:
-            self.log_message(f"Sycophant: {player.name} must target self, but Baron cannot. Fizzles.")
+        valid_targets = self._effect_targets(player, card_played)
+        if not valid_targets:
+            if self.events.enabled:
+                self.events.emit(Message("Baron: No valid targets."))
             return False
-        if not valid_targets: self.log_message("Baron: No valid targets."); return False
 
         if player.is_cpu:
-            target_player = random.choice(valid_targets)
+            target_player = self._choose_target(player, card_played, valid_targets)
             self._resolve_baron_effect(player, target_player)
             return False
         else:
-            self.ui['request_target_selection_callback'](
+            self._request_target_selection(
                 player, card_played, valid_targets,
                 self._resolve_baron_target_selected
             )
@@ -637,53 +1210,67 @@ class GameRound:
 
     def _resolve_baron_target_selected(self, acting_player, target_player_id):
         target_player = next(p for p in self.players if p.id == target_player_id)
+        if self.recorder is not None:
+            self.recorder.decision(target_player_id)
         self._resolve_baron_effect(acting_player, target_player)
         self._finish_effect_and_proceed()
 
     def _resolve_baron_effect(self, player, target_player):
         if not player.hand or not target_player.hand:
-            self.log_message("Baron comparison requires both players to have cards. Fizzles.")
+            if self.events.enabled:
+                self.events.emit(Message("Baron comparison requires both players to have cards. Fizzles."))
             return
 
         player_card = player.hand[0]
         opponent_card = target_player.hand[0]
+        if self.belief_tracker is not None:  # Both hands are shown in the comparison log
+            self.belief_tracker.card_revealed(player, player_card)
+            self.belief_tracker.card_revealed(target_player, opponent_card)
 
-        log_msg = f"{player.name}({player_card.name} V:{player_card.value}) vs {target_player.name}({opponent_card.name} V:{opponent_card.value}). "
         if player_card.value > opponent_card.value:
-            log_msg += f"{target_player.name} is eliminated."
-            self._eliminate_player(target_player)
+            loser = target_player
         elif opponent_card.value > player_card.value:
-            log_msg += f"{player.name} is eliminated."
-            self._eliminate_player(player)
+            loser = player
         else:
-            log_msg += "Tie. No one eliminated."
-        self.log_message(log_msg)
-
-    def _effect_handmaid(self, player, card_played):
+            loser = None
+        if self.events.enabled:
+            self.events.emit(BaronCompare(player.id, target_player.id, player_card, opponent_card,
+                                          loser.id if loser is not None else None, CARD_PROTOTYPES['Baron']))
+        if loser is not None:
+            self._eliminate_player(loser)
+
+    def _effect_handmaid(self, player, card_played, must_target_self):
         player.is_protected = True
-        self.log_message(f"{player.name} plays Handmaid and is protected.")
+        self.protected_mask |= 1 << player.id
+        if self.events.enabled:
+            self.events.emit(Protected(player.id))
         return False  # No input needed
 
     def _effect_prince(self, player, card_played, must_target_self):
         valid_targets = []
         if must_target_self:
             if not player.is_eliminated: valid_targets = [player]
-            if not valid_targets: self.log_message(
-                f"Prince (Sycophant): {player.name} must target self but invalid. Fizzles."); return False
+            if not valid_targets:
+                if self.events.enabled:
+                    self.events.emit(Message(f"Prince (Sycophant): {player.name} must target self but invalid. Fizzles."))
+                return False
         else:
             # Prince can target self, even if no hand (to draw burned card)
-            valid_targets = self._get_valid_targets(player, include_self=True,
-                                                    targeted_effect_requires_unprotected=True, allow_no_hand=True)
+            valid_targets = self._effect_targets(player, card_played)
 
-        if not valid_targets: self.log_message("Prince: No valid targets."); return False
+        if not valid_targets:
+            if self.events.enabled:
+                self.events.emit(Message("Prince: No valid targets."))
+            return False
 
         if player.is_cpu:
-            target_player = random.choice(valid_targets)
-            self.log_message(f"CPU ({player.name}) plays Prince, targeting {target_player.name}.")
+            target_player = self._choose_target(player, card_played, valid_targets)
+            if self.events.enabled:
+                self.events.emit(PrinceTarget(player.id, target_player.id))
             self._resolve_prince_effect(target_player)
             return False
         else:
-            self.ui['request_target_selection_callback'](
+            self._request_target_selection(
                 player, card_played, valid_targets,
                 self._resolve_prince_target_selected
             )
@@ -691,24 +1278,32 @@ class GameRound:
 
     def _resolve_prince_target_selected(self, acting_player, target_player_id):
         target_player = next(p for p in self.players if p.id == target_player_id)
-        self.log_message(f"{acting_player.name} (Prince) targets {target_player.name} to discard and draw.")
+        if self.recorder is not None:
+            self.recorder.decision(target_player_id)
+        if self.events.enabled:
+            self.events.emit(PrinceTarget(acting_player.id, target_player.id))
         self._resolve_prince_effect(target_player)
         self._finish_effect_and_proceed()
 
     def _resolve_prince_effect(self, target_player):  # Reusable by Bishop too
         if not target_player.hand and not self.shared_burned_card_ref[
             'card'] and self.deck.is_empty():  # Nothing to discard, nothing to draw
-            self.log_message(f"{target_player.name} has no hand and no cards to draw (Prince).")
+            if self.events.enabled:
+                self.events.emit(Message(f"{target_player.name} has no hand and no cards to draw (Prince)."))
             return
 
         discarded_card = None
         if target_player.hand:
             original_hand_card = target_player.hand[0]
             discarded_card = target_player.force_discard(self.deck, self.shared_burned_card_ref)
-            self.log_message(f"{target_player.name} discards {discarded_card.name}.")
-
-            if self._is_card_in_current_deck('Princess') and discarded_card.name == 'Princess':
-                self.log_message(f"{target_player.name} discarded Princess (forced by Prince) and is eliminated!")
+            if self.events.enabled:
+                self.events.emit(CardDiscarded(target_player.id, discarded_card))
+            if self.belief_tracker is not None:
+                self.belief_tracker.card_discarded(target_player, discarded_card)
+                if target_player.hand:
+                    self.belief_tracker.card_drawn(target_player, target_player.hand[-1])
+
+            if self.rules.has('Princess') and discarded_card.name == 'Princess':
                 self._eliminate_player(target_player)
                 return
         else:
@@ -719,30 +1314,29 @@ class GameRound:
                 new_card = self.shared_burned_card_ref['card']
                 target_player.add_card_to_hand(new_card)
                 self.shared_burned_card_ref['card'] = None
-            else:
-                self.log_message(f"{target_player.name} has no card to draw (deck and burned card empty).")
+            if self.belief_tracker is not None and target_player.hand:
+                self.belief_tracker.card_drawn(target_player, target_player.hand[-1])
 
+        if not self.events.enabled:
+            return
         if target_player.hand:
-            if not target_player.is_cpu:
-                self.log_message(f"You ({target_player.name}) draw {target_player.hand[0].name}.")
-            else:
-                self.log_message(f"{target_player.name} draws a new card.")
+            self.events.emit(CardDrawn(target_player.id, target_player.hand[-1], len(target_player.hand)))
         elif not target_player.is_eliminated:
-            self.log_message(f"{target_player.name} has no card after Prince effect (deck and burned card empty).")
+            self.events.emit(Message(f"{target_player.name} has no card after Prince effect (deck and burned card empty)."))
 
     def _effect_king(self, player, card_played, must_target_self):
-        valid_targets = self._get_valid_targets(player, include_self=False, targeted_effect_requires_unprotected=True)
-        if must_target_self:
-            self.log_message(f"Sycophant: {player.name} must target self, but King cannot. Fizzles.")
+        valid_targets = self._effect_targets(player, card_played)
+        if not valid_targets:
+            if self.events.enabled:
+                self.events.emit(Message("King: No valid targets."))
             return False
-        if not valid_targets: self.log_message("King: No valid targets."); return False
 
         if player.is_cpu:
-            target_player = random.choice(valid_targets)
+            target_player = self._choose_target(player, card_played, valid_targets)
             self._resolve_king_effect(player, target_player)
             return False
         else:
-            self.ui['request_target_selection_callback'](
+            self._request_target_selection(
                 player, card_played, valid_targets,
                 self._resolve_king_target_selected
             )
@@ -750,12 +1344,15 @@ class GameRound:
 
     def _resolve_king_target_selected(self, acting_player, target_player_id):
         target_player = next(p for p in self.players if p.id == target_player_id)
+        if self.recorder is not None:
+            self.recorder.decision(target_player_id)
         self._resolve_king_effect(acting_player, target_player)
         self._finish_effect_and_proceed()
 
     def _resolve_king_effect(self, player, target_player):
         if not player.hand or not target_player.hand:
-            self.log_message("King swap requires both players to have cards. Fizzles.");
+            if self.events.enabled:
+                self.events.emit(Message("King swap requires both players to have cards. Fizzles."))
             return
 
         player_card_obj = player.hand.pop(0)
@@ -763,15 +1360,358 @@ class GameRound:
 
         player.add_card_to_hand(opponent_card_obj)
         target_player.add_card_to_hand(player_card_obj)
+        if self.belief_tracker is not None:
+            self.belief_tracker.hands_swapped(player, target_player)
+        if self.events.enabled:
+            self.events.emit(Swap(player.id, target_player.id, opponent_card_obj, player_card_obj))
 
-        self.log_message(f"{player.name} (King) swaps hand with {target_player.name}. "
-                         f"{player.name} gets {opponent_card_obj.name}, {target_player.name} gets {player_card_obj.name}.")
+    def _effect_countess(self, player, card_played, must_target_self):
+        return False  # No effect; the CardPlayed event already records it
 
-    def _effect_countess(self, player, card_played):
-        self.log_message("Countess played. No special effect.");
-        return False
+    def _effect_assassin(self, player, card_played, must_target_self):
+        return False  # Only acts when a Guard names it (see _resolve_guard_guess)
 
-    def _effect_princess(self, player, card_played):
-        self.log_message(f"ERROR: Princess effect executed, should have been caught earlier.");
+    def _effect_count(self, player, card_played, must_target_self):
+        return False  # Counted at the deck-out showdown
+
+    def _effect_sheriff(self, player, card_played, must_target_self):
+        return False  # Checked when its owner is eliminated
+
+    def _effect_princess(self, player, card_played, must_target_self):
+        self._eliminate_player(player)  # Discarding the Princess, by choice or not, is elimination
         return False
 
+    # --- 5-8 player cards ---
+
+    def _effect_jester(self, player, card_played, must_target_self):
+        valid_targets = self._effect_targets(player, card_played)
+        if not valid_targets:
+            if self.events.enabled:
+                self.events.emit(Message("Jester: No valid targets."))
+            return False
+
+        if player.is_cpu:
+            target_player = self._choose_target(player, card_played, valid_targets)
+            self._resolve_jester_effect(player, target_player)
+            return False
+        else:
+            self._request_target_selection(
+                player, card_played, valid_targets,
+                self._resolve_jester_target_selected
+            )
+            return True
+
+    def _resolve_jester_target_selected(self, acting_player, target_player_id):
+        target_player = next(p for p in self.players if p.id == target_player_id)
+        if self.recorder is not None:
+            self.recorder.decision(target_player_id)
+        self._resolve_jester_effect(acting_player, target_player)
+        self._finish_effect_and_proceed()
+
+    def _resolve_jester_effect(self, player, target_player):
+        # Paid out in _award_round_tokens if target_player wins the round.
+        player.jester_on_player_id = target_player.id
+        if self.events.enabled:
+            self.events.emit(JesterMarked(player.id, target_player.id))
+
+    def _effect_cardinal(self, player, card_played, must_target_self):
+        # Two players with cards (the Cardinal's owner may be one of them) swap hands, then the
+        # owner looks at one of the two hands. A Sycophant mark makes the owner one of the two.
+        valid_targets = [p for p in self._effect_targets(player, card_played) if p.hand]
+        first_targets = valid_targets
+        if must_target_self:
+            first_targets = [player] if player in valid_targets else []
+        if len(valid_targets) < 2 or not first_targets:
+            if self.events.enabled:
+                self.events.emit(Message("Cardinal: Needs two players with cards to swap. Fizzles."))
+            return False
+
+        if player.is_cpu:
+            first = self._choose_target(player, card_played, first_targets)
+            second = self._choose_target(player, card_played, [p for p in valid_targets if p is not first])
+            self._resolve_cardinal_swap(player, first, second)
+            look_targets = [p for p in (first, second) if p is not player]
+            look = look_targets[0] if len(look_targets) == 1 else self._choose_target(player, card_played,
+                                                                                       look_targets)
+            self._look_at_hand(player, look, card_played)
+            return False
+        else:
+            self._request_target_selection(
+                player, card_played, first_targets,
+                self._resolve_cardinal_first_selected
+            )
+            return True
+
+    def _resolve_cardinal_first_selected(self, acting_player, target_player_id):
+        if self.recorder is not None:
+            self.recorder.decision(target_player_id)
+        second_targets = [p for p in self._effect_targets(acting_player, self.resolving_card)
+                          if p.hand and p.id != target_player_id]
+        self._request_target_selection(
+            acting_player, self.resolving_card, second_targets,
+            lambda player, second_id: self._resolve_cardinal_second_selected(player, target_player_id, second_id)
+        )
+
+    def _resolve_cardinal_second_selected(self, acting_player, first_id, second_id):
+        if self.recorder is not None:
+            self.recorder.decision(second_id)
+        first = next(p for p in self.players if p.id == first_id)
+        second = next(p for p in self.players if p.id == second_id)
+        self._resolve_cardinal_swap(acting_player, first, second)
+        look_targets = [p for p in (first, second) if p is not acting_player]
+        if len(look_targets) == 1:
+            self._look_at_hand(acting_player, look_targets[0], self.resolving_card)
+            self._finish_effect_and_proceed()
+            return
+        self._request_target_selection(
+            acting_player, self.resolving_card, look_targets,
+            self._resolve_cardinal_look_selected
+        )
+
+    def _resolve_cardinal_look_selected(self, acting_player, target_player_id):
+        if self.recorder is not None:
+            self.recorder.decision(target_player_id)
+        target_player = next(p for p in self.players if p.id == target_player_id)
+        self._look_at_hand(acting_player, target_player, self.resolving_card)
+        self._finish_effect_and_proceed()
+
+    def _resolve_cardinal_swap(self, player, first, second):
+        first_card = first.hand.pop(0)
+        second_card = second.hand.pop(0)
+        first.add_card_to_hand(second_card)
+        second.add_card_to_hand(first_card)
+        if self.belief_tracker is not None:
+            self.belief_tracker.hands_swapped(first, second)
+        if self.events.enabled:
+            self.events.emit(CardinalSwap(player.id, first.id, second.id))
+
+    def _effect_baroness(self, player, card_played, must_target_self):
+        # Looks at up to two hands. Seeing a second hand never hurts, so it is not offered as a choice.
+        valid_targets = self._effect_targets(player, card_played)
+        if not valid_targets:
+            if self.events.enabled:
+                self.events.emit(Message("Baroness: No valid targets."))
+            return False
+
+        if player.is_cpu:
+            first = self._choose_target(player, card_played, valid_targets)
+            self._look_at_hand(player, first, card_played)
+            remaining = [p for p in valid_targets if p is not first]
+            if remaining:
+                self._look_at_hand(player, self._choose_target(player, card_played, remaining), card_played)
+            return False
+        else:
+            self._request_target_selection(
+                player, card_played, valid_targets,
+                self._resolve_baroness_target_selected
+            )
+            return True
+
+    def _resolve_baroness_target_selected(self, acting_player, target_player_id):
+        if self.recorder is not None:
+            self.recorder.decision(target_player_id)
+        target_player = next(p for p in self.players if p.id == target_player_id)
+        self._look_at_hand(acting_player, target_player, self.resolving_card)
+        remaining = [p for p in self._effect_targets(acting_player, self.resolving_card) if p.id != target_player_id]
+        if not remaining:
+            self._finish_effect_and_proceed()
+            return
+        self._request_target_selection(
+            acting_player, self.resolving_card, remaining,
+            self._resolve_baroness_second_selected
+        )
+
+    def _resolve_baroness_second_selected(self, acting_player, target_player_id):
+        if self.recorder is not None:
+            self.recorder.decision(target_player_id)
+        target_player = next(p for p in self.players if p.id == target_player_id)
+        self._look_at_hand(acting_player, target_player, self.resolving_card)
+        self._finish_effect_and_proceed()
+
+    def _effect_sycophant(self, player, card_played, must_target_self):
+        valid_targets = self._effect_targets(player, card_played)
+        if not valid_targets:
+            if self.events.enabled:
+                self.events.emit(Message("Sycophant: No valid targets."))
+            return False
+
+        if player.is_cpu:
+            target_player = self._choose_target(player, card_played, valid_targets)
+            self._resolve_sycophant_effect(player, target_player)
+            return False
+        else:
+            self._request_target_selection(
+                player, card_played, valid_targets,
+                self._resolve_sycophant_target_selected
+            )
+            return True
+
+    def _resolve_sycophant_target_selected(self, acting_player, target_player_id):
+        target_player = next(p for p in self.players if p.id == target_player_id)
+        if self.recorder is not None:
+            self.recorder.decision(target_player_id)
+        self._resolve_sycophant_effect(acting_player, target_player)
+        self._finish_effect_and_proceed()
+
+    def _resolve_sycophant_effect(self, player, target_player):
+        # Consumed by _execute_card_effect on the target's next card.
+        target_player.sycophant_target_self = True
+        if self.events.enabled:
+            self.events.emit(SycophantMarked(player.id, target_player.id))
+
+    def _effect_queen_mother(self, player, card_played, must_target_self):
+        valid_targets = self._effect_targets(player, card_played)
+        if not valid_targets:
+            if self.events.enabled:
+                self.events.emit(Message("Queen Mother: No valid targets."))
+            return False
+
+        if player.is_cpu:
+            target_player = self._choose_target(player, card_played, valid_targets)
+            self._resolve_queen_mother_effect(player, target_player)
+            return False
+        else:
+            self._request_target_selection(
+                player, card_played, valid_targets,
+                self._resolve_queen_mother_target_selected
+            )
+            return True
+
+    def _resolve_queen_mother_target_selected(self, acting_player, target_player_id):
+        target_player = next(p for p in self.players if p.id == target_player_id)
+        if self.recorder is not None:
+            self.recorder.decision(target_player_id)
+        self._resolve_queen_mother_effect(acting_player, target_player)
+        self._finish_effect_and_proceed()
+
+    def _resolve_queen_mother_effect(self, player, target_player):  # Baron with the comparison reversed
+        if not player.hand or not target_player.hand:
+            if self.events.enabled:
+                self.events.emit(Message("Queen Mother comparison requires both players to have cards. Fizzles."))
+            return
+
+        player_card = player.hand[0]
+        opponent_card = target_player.hand[0]
+        if self.belief_tracker is not None:
+            self.belief_tracker.card_revealed(player, player_card)
+            self.belief_tracker.card_revealed(target_player, opponent_card)
+
+        if player_card.value > opponent_card.value:
+            loser = player
+        elif opponent_card.value > player_card.value:
+            loser = target_player
+        else:
+            loser = None
+        if self.events.enabled:
+            self.events.emit(BaronCompare(player.id, target_player.id, player_card, opponent_card,
+                                          loser.id if loser is not None else None,
+                                          CARD_PROTOTYPES['Queen Mother']))
+        if loser is not None:
+            self._eliminate_player(loser)
+
+    def _effect_bishop(self, player, card_played, must_target_self):
+        valid_targets = self._effect_targets(player, card_played)
+        if not valid_targets:
+            if self.events.enabled:
+                self.events.emit(Message("Bishop: No valid targets."))
+            return False
+
+        if player.is_cpu:
+            target_player = self._choose_target(player, card_played, valid_targets)
+            guess_val = self._choose_guess(player, target_player, self.rules.guard_guess_values)
+            return self._resolve_bishop_guess(player, target_player, guess_val)
+        else:
+            self._request_target_selection(
+                player, card_played, valid_targets,
+                self._resolve_bishop_target_selected
+            )
+            return True
+
+    def _resolve_bishop_target_selected(self, acting_player, target_player_id):
+        target_player = next(p for p in self.players if p.id == target_player_id)
+        if self.recorder is not None:
+            self.recorder.decision(target_player_id)
+        self._request_guard_value(
+            acting_player, target_player, list(self.rules.guard_guess_values),
+            self._resolve_bishop_value_guessed
+        )
+
+    def _resolve_bishop_value_guessed(self, acting_player, target_player, guessed_value):
+        if self.recorder is not None:
+            self.recorder.decision(guessed_value)
+        if not self._resolve_bishop_guess(acting_player, target_player, guessed_value):
+            self._finish_effect_and_proceed()
+
+    def _resolve_bishop_guess(self, acting_player, target_player, guessed_value):
+        # A correct guess earns a token; the target may then discard and draw (Prince effect).
+        # Returns True while a human target decides whether to redraw.
+        if not target_player.hand: return False
+
+        target_card = target_player.hand[0]
+        correct = target_card.value == guessed_value
+        if self.events.enabled:
+            self.events.emit(BishopGuess(acting_player.id, target_player.id, guessed_value, correct))
+        if not correct:
+            return False
+        if self.belief_tracker is not None:
+            self.belief_tracker.card_revealed(target_player, target_card)
+        acting_player.tokens += 1
+        if self.events.enabled:
+            self.events.emit(TokenGained(acting_player.id, CARD_PROTOTYPES['Bishop']))
+        if self.ui.check_game_over_token(acting_player):
+            self.game_over_pending_from_round = True
+            self.game_over_winner = acting_player
+            return False
+
+        if target_player.is_cpu:
+            if self._choose_redraw(target_player, target_card):
+                self._resolve_prince_effect(target_player)
+            return False
+        self._request_option(
+            target_player, f"Bishop: {acting_player.name} named your {target_card.name}. Discard it and draw?",
+            [("Discard and draw", True), ("Keep", False)],
+            self._resolve_bishop_redraw_chosen
+        )
+        return True
+
+    def _resolve_bishop_redraw_chosen(self, target_player, redraw):
+        if self.recorder is not None:
+            self.recorder.decision(1 if redraw else 0)
+        if redraw:
+            self._resolve_prince_effect(target_player)
+        self._finish_effect_and_proceed()
+
+
+# --- Card effect table ---
+# How each card resolves: the GameRound handler, called as handler(round, player, card, must_target_self),
+# plus the targeting rules it follows. Ruleset.effects indexes the active entries by card id, so
+# resolving a card is one tuple lookup. New cards or variants only need a handler and a row here.
+#   targeted: the card chooses a player, so a Sycophant mark applies to it
+#   self_allowed: the player may choose themselves (Prince, Cardinal)
+#   requires_unprotected: Handmaid protection blocks it
+#   allow_no_hand: players without a card are valid targets (Prince draws for them)
+#   asks_player: a human may be asked for input while it resolves
+EffectSpec = namedtuple('EffectSpec', ['handler', 'targeted', 'self_allowed', 'requires_unprotected',
+                                       'allow_no_hand', 'asks_player'],
+                        defaults=(False, False, True, False, False))
+
+CARD_EFFECTS = {
+    'Guard': EffectSpec(GameRound._effect_guard, targeted=True, asks_player=True),
+    'Priest': EffectSpec(GameRound._effect_priest, targeted=True, asks_player=True),
+    'Baron': EffectSpec(GameRound._effect_baron, targeted=True, asks_player=True),
+    'Handmaid': EffectSpec(GameRound._effect_handmaid),
+    'Prince': EffectSpec(GameRound._effect_prince, targeted=True, self_allowed=True, allow_no_hand=True,
+                         asks_player=True),
+    'King': EffectSpec(GameRound._effect_king, targeted=True, asks_player=True),
+    'Countess': EffectSpec(GameRound._effect_countess),
+    'Princess': EffectSpec(GameRound._effect_princess),
+    'Assassin': EffectSpec(GameRound._effect_assassin),
+    'Jester': EffectSpec(GameRound._effect_jester, targeted=True, asks_player=True),
+    'Cardinal': EffectSpec(GameRound._effect_cardinal, targeted=True, self_allowed=True, asks_player=True),
+    'Baroness': EffectSpec(GameRound._effect_baroness, targeted=True, asks_player=True),
+    'Sycophant': EffectSpec(GameRound._effect_sycophant, targeted=True, asks_player=True),
+    'Count': EffectSpec(GameRound._effect_count),
+    'Sheriff': EffectSpec(GameRound._effect_sheriff),
+    'Queen Mother': EffectSpec(GameRound._effect_queen_mother, targeted=True, asks_player=True),
+    'Bishop': EffectSpec(GameRound._effect_bishop, targeted=True, asks_player=True),
+}
@@ -0,0 +1,371 @@
+# policy.py
+# CPU policies beyond the engine's RandomPolicy, the card-counting belief tracker they can read,
+# and a wrapper to measure per-decision latency separately from the rest of the engine.
+#
+#   python Policy.py --policy heuristic --players 4 --rounds 5000
+
+import argparse
+import random
+import time
+
+from Logic import (
+    Player, Deck, GameRound, ImmediateScheduler, CpuPolicy, RandomPolicy,
+    CARDS_DATA_RAW, CARD_PROTOTYPES, deck_template, load_card_prototypes
+)
+
+MAX_CARD_VALUE = max(data['value'] for data in CARDS_DATA_RAW.values())
+CARD_VALUES_BY_ID = [data['value'] for data in CARDS_DATA_RAW.values()]
+ASSASSIN_VALUE = CARDS_DATA_RAW['Assassin']['value']  # Only the Assassin has it; naming it with a Guard is wasted
+
+
+class BeliefState:
+    # What one player can deduce about hidden cards. "Unseen" cards are those whose location this
+    # player does not know: the deck, the burned card and opponents' hands not yet seen. Known
+    # opponent hands are kept separately and are not counted as unseen.
+    __slots__ = ('player_id', 'unseen', 'unseen_by_value', 'unseen_total', 'known_hands')
+
+    def __init__(self, player_id, composition_counts):
+        self.player_id = player_id
+        self.unseen = list(composition_counts)  # card id -> unseen copies
+        self.unseen_by_value = [0] * (MAX_CARD_VALUE + 1)
+        for card_id, count in enumerate(composition_counts):
+            if count:
+                self.unseen_by_value[CARD_VALUES_BY_ID[card_id]] += count
+        self.unseen_total = sum(composition_counts)
+        self.known_hands = {}  # opponent id -> Card they are known to hold
+
+    def remove_unseen(self, card):
+        self.unseen[card.card_id] -= 1
+        self.unseen_by_value[card.value] -= 1
+        self.unseen_total -= 1
+
+    def add_unseen(self, card):
+        self.unseen[card.card_id] += 1
+        self.unseen_by_value[card.value] += 1
+        self.unseen_total += 1
+
+    def learn_hand(self, player_id, card):
+        previous = self.known_hands.get(player_id)
+        if previous is card:
+            return
+        if previous is not None:  # Stale knowledge goes back to the unseen pool
+            self.add_unseen(previous)
+        self.remove_unseen(card)
+        self.known_hands[player_id] = card
+
+    def value_probability(self, value):
+        # Chance that an unknown opponent card has this value.
+        return self.unseen_by_value[value] / self.unseen_total if self.unseen_total > 0 else 0.0
+
+
+class BeliefTracker:
+    # Keeps a BeliefState for every seat and updates it in O(1) per event as GameRound moves
+    # cards around (see the belief_tracker calls in Logic.GameRound).
+    def __init__(self):
+        self.states = {}  # player id -> BeliefState
+        self._composition_counts = {}  # composition key -> card id counts
+
+    def _counts_for(self, composition_key):
+        counts = self._composition_counts.get(composition_key)
+        if counts is None:
+            counts = [0] * len(CARDS_DATA_RAW)
+            for card_id in deck_template(composition_key):
+                counts[card_id] += 1
+            self._composition_counts[composition_key] = counts
+        return counts
+
+    def start_round(self, game_round):
+        counts = self._counts_for(game_round.rules.composition_key)
+        self.states = {}
+        for player in game_round.players:
+            state = BeliefState(player.id, counts)
+            for card in player.hand:
+                state.remove_unseen(card)
+            self.states[player.id] = state
+
+    def card_drawn(self, player, card):
+        # Only the drawer sees the card.
+        self.states[player.id].remove_unseen(card)
+
+    def card_discarded(self, player, card):
+        # Public. Observers who knew this card leave their count alone; the player's remaining card is unknown.
+        player_id = player.id
+        for state in self.states.values():
+            if state.player_id == player_id:
+                continue
+            if state.known_hands.get(player_id) is card:
+                del state.known_hands[player_id]
+            else:
+                state.remove_unseen(card)
+
+    def card_seen(self, viewer, target, card):
+        if viewer.id != target.id:
+            self.states[viewer.id].learn_hand(target.id, card)
+
+    def card_revealed(self, player, card):
+        # Shown to everyone (Baron comparison, correct Guard guess).
+        for state in self.states.values():
+            if state.player_id != player.id:
+                state.learn_hand(player.id, card)
+
+    def hands_swapped(self, player_a, player_b):
+        # Called after the swap. Each party knows what it gave away and sees what it received.
+        a_id, b_id = player_a.id, player_b.id
+        for state in self.states.values():
+            known = state.known_hands
+            if state.player_id == a_id or state.player_id == b_id:
+                me, other = (player_a, player_b) if state.player_id == a_id else (player_b, player_a)
+                if known.pop(other.id, None) is None and me.hand:
+                    state.remove_unseen(me.hand[0])
+                if other.hand:
+                    known[other.id] = other.hand[0]
+            else:
+                card_a, card_b = known.pop(a_id, None), known.pop(b_id, None)
+                if card_b is not None:
+                    known[a_id] = card_b
+                if card_a is not None:
+                    known[b_id] = card_a
+
+
+def hidden_hand_seats(hands, observer_id, known_hands):
+    # Seats (indexes into hands) whose cards the observer has not seen. Eliminated players count too:
+    # a hand knocked out without being shown is as unknown as any other. Revealed hands are in
+    # known_hands, since card_revealed teaches them to every observer.
+    return [seat for seat, hand in enumerate(hands)
+            if hand and seat != observer_id and seat not in known_hands]
+
+
+class HeuristicPolicy(CpuPolicy):
+    # Deterministic rules of thumb that only loop over the options they are given (no allocation):
+    # keep the higher card for the showdown, only Baron with a strong card left, aim at the
+    # token leader, and guess the most common value in the deck composition.
+    def __init__(self):
+        self._guess_by_composition = {}
+
+    def choose_card(self, game_round, player, playable_cards):
+        lowest = None
+        for card in playable_cards:
+            if card.name == 'Princess':
+                continue
+            if lowest is None or card.value < lowest.value:
+                lowest = card
+        if lowest is None:
+            return playable_cards[0]
+        if lowest.name == 'Baron':
+            for card in playable_cards:
+                if card is not lowest and card.value < 5 and card.name != 'Princess':
+                    return card
+        return lowest
+
+    def choose_target(self, game_round, player, card_played, valid_targets):
+        best = None
+        for target in valid_targets:
+            if target is player and len(valid_targets) > 1:
+                continue
+            if best is None or target.tokens > best.tokens:
+                best = target
+        return best
+
+    def choose_guess(self, game_round, player, target_player, possible_values):
+        composition_key = game_round.rules.composition_key
+        guess = self._guess_by_composition.get(composition_key)
+        if guess is None:
+            copies = {}
+            for proto in CARD_PROTOTYPES.values():
+                if proto.value in possible_values:
+                    copies[proto.value] = copies.get(proto.value, 0) + getattr(proto, composition_key, 0)
+            guess = max(possible_values, key=lambda value: (copies.get(value, 0), value))
+            self._guess_by_composition[composition_key] = guess
+        return guess
+
+
+class CountingPolicy(HeuristicPolicy):
+    # HeuristicPolicy informed by the round's BeliefTracker: Guard names a known card or the most
+    # likely unseen value, Baron is only played/aimed where it is expected to win.
+    uses_beliefs = True
+
+    def _belief(self, game_round, player):
+        tracker = game_round.belief_tracker
+        return tracker.states.get(player.id) if tracker is not None else None
+
+    def _baron_win_margin(self, belief, kept_value):
+        below = above = 0
+        by_value = belief.unseen_by_value
+        for value in range(MAX_CARD_VALUE + 1):
+            if value < kept_value:
+                below += by_value[value]
+            elif value > kept_value:
+                above += by_value[value]
+        return below - above
+
+    def choose_card(self, game_round, player, playable_cards):
+        belief = self._belief(game_round, player)
+        if belief is not None and len(playable_cards) == 2:
+            first, second = playable_cards
+            for baron, kept in ((first, second), (second, first)):
+                if baron.name == 'Baron' and kept.name != 'Princess':
+                    for target_id, card in belief.known_hands.items():
+                        if card.value < kept.value and not game_round.players[target_id].is_eliminated:
+                            return baron
+                    if self._baron_win_margin(belief, kept.value) <= 0 and kept.name != 'Baron':
+                        return kept
+        return HeuristicPolicy.choose_card(self, game_round, player, playable_cards)
+
+    def choose_target(self, game_round, player, card_played, valid_targets):
+        belief = self._belief(game_round, player)
+        if belief is not None:
+            known = belief.known_hands
+            name = card_played.name
+            if name == 'Guard':
+                # A Guard aimed at a known Assassin eliminates its own player, whatever the guess.
+                assassin_known = False
+                for target in valid_targets:
+                    card = known.get(target.id)
+                    if card is None:
+                        continue
+                    if card.name == 'Assassin':
+                        assassin_known = True
+                    elif card.value != 1:
+                        return target
+                if assassin_known:
+                    safe_targets = [target for target in valid_targets
+                                    if known.get(target.id) is None or known[target.id].name != 'Assassin']
+                    if safe_targets:
+                        valid_targets = safe_targets
+            elif name == 'Baron' and player.hand:
+                my_value = player.hand[0].value
+                fallback = None
+                for target in valid_targets:
+                    card = known.get(target.id)
+                    if card is None:
+                        if fallback is None:
+                            fallback = target
+                    elif card.value < my_value:
+                        return target
+                if fallback is not None:
+                    return fallback
+        return HeuristicPolicy.choose_target(self, game_round, player, card_played, valid_targets)
+
+    def choose_guess(self, game_round, player, target_player, possible_values):
+        belief = self._belief(game_round, player)
+        if belief is None:
+            return HeuristicPolicy.choose_guess(self, game_round, player, target_player, possible_values)
+        card = belief.known_hands.get(target_player.id)
+        guarding = game_round.resolving_card is not None and game_round.resolving_card.name == 'Guard'
+        if card is not None and card.value in possible_values and not (guarding and card.name == 'Assassin'):
+            return card.value
+        if guarding and ASSASSIN_VALUE in possible_values and len(possible_values) > 1:
+            possible_values = [value for value in possible_values if value != ASSASSIN_VALUE]
+        by_value = belief.unseen_by_value
+        best = possible_values[0]
+        for value in possible_values:
+            if by_value[value] >= by_value[best]:
+                best = value
+        return best
+
+
+class TimedPolicy(CpuPolicy):
+    # Wraps another policy and accumulates call counts and nanoseconds per decision kind.
+    def __init__(self, inner):
+        self.inner = inner
+        self.uses_beliefs = inner.uses_beliefs
+        self.calls = {'card': 0, 'target': 0, 'guess': 0}
+        self.total_ns = {'card': 0, 'target': 0, 'guess': 0}
+
+    def choose_card(self, game_round, player, playable_cards):
+        start = time.perf_counter_ns()
+        choice = self.inner.choose_card(game_round, player, playable_cards)
+        self.total_ns['card'] += time.perf_counter_ns() - start
+        self.calls['card'] += 1
+        return choice
+
+    def choose_target(self, game_round, player, card_played, valid_targets):
+        start = time.perf_counter_ns()
+        choice = self.inner.choose_target(game_round, player, card_played, valid_targets)
+        self.total_ns['target'] += time.perf_counter_ns() - start
+        self.calls['target'] += 1
+        return choice
+
+    def choose_guess(self, game_round, player, target_player, possible_values):
+        start = time.perf_counter_ns()
+        choice = self.inner.choose_guess(game_round, player, target_player, possible_values)
+        self.total_ns['guess'] += time.perf_counter_ns() - start
+        self.calls['guess'] += 1
+        return choice
+
+    def choose_redraw(self, game_round, player, card):
+        return self.inner.choose_redraw(game_round, player, card)
+
+    def cancel(self):
+        self.inner.cancel()
+
+    def report(self):
+        lines = [f"Decision latency for {type(self.inner).__name__}:"]
+        for kind, calls in self.calls.items():
+            mean_ns = self.total_ns[kind] / calls if calls else 0.0
+            lines.append(f"  {kind:6s}: {calls:8d} calls, {mean_ns:8.1f} ns/decision")
+        return "\n".join(lines)
+
+
+def _ismcts_policy(time_budget=0.05):
+    from Search import IsmctsPolicy  # Search imports this module
+    return IsmctsPolicy(time_budget=time_budget)
+
+
+def _endgame_policy(time_budget=None):
+    from Endgame import EndgamePolicy  # Endgame imports this module
+    return EndgamePolicy(time_budget=time_budget)
+
+
+POLICIES = {
+    'random': RandomPolicy,
+    'heuristic': HeuristicPolicy,
+    'counting': CountingPolicy,
+    'ismcts': _ismcts_policy,  # ismcts:0.02 sets the search time per move in seconds
+    'endgame': _endgame_policy,  # endgame:0.5 caps each endgame solve at that many seconds
+}
+
+
+def make_policy(name):
+    # name is a key of POLICIES, optionally followed by ':<number>' for policies that take a budget.
+    name, _, argument = name.partition(':')
+    try:
+        factory = POLICIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown CPU policy '{name}'. Choose from: {', '.join(POLICIES)}") from None
+    if not argument:
+        return factory()
+    try:
+        return factory(float(argument))
+    except (TypeError, ValueError):
+        raise ValueError(f"CPU policy '{name}' does not take the argument '{argument}'") from None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure per-decision latency of a CPU policy.")
+    parser.add_argument('--policy', default='heuristic',
+                        help=f"One of {', '.join(POLICIES)}, optionally with a budget (e.g. ismcts:0.01).")
+    parser.add_argument('--players', type=int, default=4, choices=range(2, 9))
+    parser.add_argument('--rounds', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+    try:
+        policy = make_policy(args.policy)
+    except ValueError as error:
+        parser.error(str(error))
+
+    if not CARD_PROTOTYPES:
+        load_card_prototypes()
+    rng = random.Random(args.seed)
+    timed = TimedPolicy(policy)
+    for _ in range(args.rounds):
+        players = [Player(id_num=i, name=f"CPU {i}", is_cpu=True) for i in range(args.players)]
+        deck = Deck(args.players, rng=rng)
+        deck.burn_one_card(args.players)
+        GameRound(players, deck, None, None, scheduler=ImmediateScheduler(), rng=rng,
+                  default_policy=timed, belief_tracker=BeliefTracker() if timed.uses_beliefs else None).start_round()
+    print(timed.report())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+# record.py
+# Compact binary game records. A file is a 4-byte header followed by round records, each prefixed
+# with its length as a varint so a reader can skip rounds without decoding them. Everything inside
+# a round is a small integer: card ids (positions in CARDS_DATA_RAW), seats and guessed values.
+#
+#   python Record.py sim.llr.00000 sim.llr.00001
+#
+# Round layout (after the length prefix):
+#   varint seed + 1 (0: no seed) | u8 players | u8 starting seat | u8 burned card id + 1 (0: none)
+#   u8 winners bitmask | u8 game-over seat + 1 (0: the game did not end during this round)
+#   varint deck length, deck card ids in draw order (dealt cards first)
+#   varint decision count, one byte per decision (card id, target seat, guessed value or Bishop
+#   redraw flag, in the order GameRound asked for them; forced Countess plays are not decisions)
+#
+# The game-over seat is set when a Sheriff or Bishop token won the game in the middle of the round.
+# Such a round stops right there and has no winners.
+
+import argparse
+import mmap
+import os
+from collections import Counter, namedtuple
+
+MAGIC = b'LLR'
+VERSION = 2
+HEADER = MAGIC + bytes((VERSION,))
+
+RoundRecord = namedtuple('RoundRecord', ['seed', 'num_players', 'starting_player', 'burned_card_id', 'winner_ids',
+                                         'game_over_id', 'deck_ids', 'decisions'])
+
+
+def _append_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(buf, pos):
+    value = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def encode_round(record):
+    out = bytearray()
+    _append_varint(out, record.seed + 1 if record.seed is not None else 0)
+    winners_mask = 0
+    for seat in record.winner_ids:
+        winners_mask |= 1 << seat
+    out += bytes((record.num_players, record.starting_player,
+                  record.burned_card_id + 1 if record.burned_card_id is not None else 0, winners_mask,
+                  record.game_over_id + 1 if record.game_over_id is not None else 0))
+    _append_varint(out, len(record.deck_ids))
+    out += record.deck_ids
+    _append_varint(out, len(record.decisions))
+    out += record.decisions
+    return out
+
+
+def decode_round(buf, pos):
+    seed, pos = _read_varint(buf, pos)
+    num_players, starting_player, burned, winners_mask, game_over = buf[pos:pos + 5]
+    pos += 5
+    deck_length, pos = _read_varint(buf, pos)
+    deck_ids = bytes(buf[pos:pos + deck_length])
+    pos += deck_length
+    decision_count, pos = _read_varint(buf, pos)
+    decisions = bytes(buf[pos:pos + decision_count])
+    return RoundRecord(seed - 1 if seed else None, num_players, starting_player, burned - 1 if burned else None,
+                       tuple(seat for seat in range(num_players) if winners_mask >> seat & 1),
+                       game_over - 1 if game_over else None, deck_ids, decisions)
+
+
+class RecordWriter:
+    # Append-only: opening an existing file adds rounds after the ones already there.
+    def __init__(self, path):
+        self.path = path
+        self.rounds_written = 0
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            with open(path, 'rb') as existing:
+                if existing.read(len(HEADER)) != HEADER:
+                    raise ValueError(f"{path} is not a game record file (version {VERSION})")
+        self._file = open(path, 'ab')
+        if not exists:
+            self._file.write(HEADER)
+
+    def write(self, record):
+        body = encode_round(record)
+        out = bytearray()
+        _append_varint(out, len(body))
+        out += body
+        self._file.write(out)
+        self.rounds_written += 1
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class RecordReader:
+    # Memory-maps the file and decodes rounds lazily while iterating.
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b''
+        if self.size and self._map[:len(HEADER)] != HEADER:
+            self.close()
+            raise ValueError(f"{path} is not a game record file (version {VERSION})")
+
+    def offsets(self):
+        # Start offset of every round body, found by hopping over the length prefixes.
+        buf = self._map
+        pos = len(HEADER)
+        while pos < self.size:
+            length, pos = _read_varint(buf, pos)
+            yield pos
+            pos += length
+
+    def __iter__(self):
+        buf = self._map
+        for offset in self.offsets():
+            yield decode_round(buf, offset)
+
+    def round_at(self, offset):
+        return decode_round(self._map, offset)
+
+    def close(self):
+        if self.size:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class RoundRecorder:
+    # GameRound hook (recorder=...) that writes every finished round to a RecordWriter.
+    def __init__(self, writer, seed=None):
+        self.writer = writer
+        self.seed = seed
+        self._deck_ids = b''
+        self._burned_card_id = None
+        self._starting_player = 0
+        self._decisions = bytearray()
+
+    def round_started(self, game_round):
+        # Called after the deal: every seat holds the one card it was dealt, in seat order.
+        dealt = bytes(p.hand[0].card_id for p in game_round.players if p.hand)
+        self._deck_ids = dealt + bytes(reversed(game_round.deck.card_ids))
+        burned = game_round.shared_burned_card_ref['card']
+        self._burned_card_id = burned.card_id if burned is not None else None
+        self._starting_player = game_round.current_player_idx
+        self._decisions = bytearray()
+
+    def decision(self, value):
+        self._decisions.append(value)
+
+    def round_ended(self, game_round):
+        game_over_winner = game_round.game_over_winner if game_round.game_over_pending_from_round else None
+        self.writer.write(RoundRecord(self.seed, len(game_round.players), self._starting_player, self._burned_card_id,
+                                      tuple(p.id for p in game_round.round_winners),
+                                      game_over_winner.id if game_over_winner is not None else None,
+                                      self._deck_ids, bytes(self._decisions)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize game record files.")
+    parser.add_argument('paths', nargs='+')
+    args = parser.parse_args(argv)
+
+    rounds = total_bytes = decisions = 0
+    round_wins = Counter()
+    for path in args.paths:
+        with RecordReader(path) as reader:
+            total_bytes += reader.size
+            for record in reader:
+                rounds += 1
+                decisions += len(record.decisions)
+                round_wins.update(record.winner_ids)
+    print(f"Rounds: {rounds} | Bytes: {total_bytes} ({total_bytes / rounds if rounds else 0:.1f} per round) | "
+          f"Decisions: {decisions}")
+    for seat in sorted(round_wins):
+        print(f"  Seat {seat}: {round_wins[seat]} round wins")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+# replay.py
+# Re-executes a recorded round (see Record.py) through GameRound and jumps to any turn. The deal,
+# burned card and starting seat come from the record and every seat plays back its recorded
+# decisions, so the engine reproduces the round exactly. A snapshot is kept every few turns; seeking
+# restores the nearest one at or before the target turn and replays only the turns after it.
+#
+#   python Replay.py sim.llr.00000 --round 12 --turn 5     # log of round 12 from turn 5 on
+#   python Replay.py sim.llr.00000 --verify                # replay every round, compare winners
+#
+# "Turn n" is the state after n turns have been played: the next player has not drawn yet.
+# Rounds that ended early on a forfeit replay up to the last recorded decision. Tokens are not part
+# of a record; a Sheriff or Bishop token that ended the whole game mid-round is reproduced from the
+# record's game-over seat once the last decision has been played.
+
+import argparse
+import random
+from array import array
+
+from Logic import (
+    Player, Deck, GameRound, RoundUI, ImmediateScheduler, CpuPolicy,
+    CARD_BY_ID, CARD_PROTOTYPES, PHASE_TURN_START, load_card_prototypes
+)
+from Record import RecordReader
+
+
+class ReplayError(Exception):
+    # The record asks for a choice the engine does not offer: the record and the rules disagree.
+    pass
+
+
+class _EndOfRecord(Exception):
+    pass
+
+
+class _RecordedPolicy(CpuPolicy):
+    # Plays back the record's decision bytes (card id, target seat or guessed value) in order.
+    def __init__(self, decisions):
+        self.decisions = decisions
+        self.position = 0
+
+    def _next(self, player, options, key):
+        if self.position >= len(self.decisions):
+            raise _EndOfRecord()
+        wanted = self.decisions[self.position]
+        self.position += 1
+        for option in options:
+            if key(option) == wanted:
+                return option
+        raise ReplayError(f"Decision {self.position - 1} ({wanted}) is not a legal choice for seat {player.id}.")
+
+    def choose_card(self, game_round, player, playable_cards):
+        return self._next(player, playable_cards, lambda card: card.card_id)
+
+    def choose_target(self, game_round, player, card_played, valid_targets):
+        return self._next(player, valid_targets, lambda target: target.id)
+
+    def choose_guess(self, game_round, player, target_player, possible_values):
+        return self._next(player, possible_values, lambda value: value)
+
+    def choose_redraw(self, game_round, player, card):
+        return self._next(player, (True, False), int)
+
+
+class _RecordedGameOver(RoundUI):
+    # The record only says which seat's token ended the game, so the token check answers True for
+    # that seat once every recorded decision has been played (nothing is decided after game over).
+    def __init__(self, game_over_id, policy):
+        self.game_over_id = game_over_id
+        self.policy = policy
+
+    def check_game_over_token(self, player):
+        return player.id == self.game_over_id and self.policy.position == len(self.policy.decisions)
+
+
+class _RecordedStart:
+    # Stands in for GameRound.rng, whose only job in a replay is to pick the recorded starting seat.
+    def __init__(self, starting_player):
+        self.starting_player = starting_player
+
+    def randrange(self, stop):
+        return self.starting_player
+
+    def uniform(self, a, b):
+        return a
+
+
+class _ReplayRound(GameRound):
+    # Stops at the first turn start once pause_at turns have been played.
+    pause_at = 0
+
+    def _process_current_player_turn_start(self):
+        if (self.round_active and self.turn_count >= self.pause_at
+                and not self.players[self.current_player_idx].is_eliminated):
+            self.phase = PHASE_TURN_START
+            return
+        GameRound._process_current_player_turn_start(self)
+
+
+class Replayer:
+    def __init__(self, record, log_callback=None, checkpoint_interval=4):
+        if not CARD_PROTOTYPES:
+            load_card_prototypes()
+        self.record = record
+        self.checkpoint_interval = max(1, checkpoint_interval)
+        self._policy = _RecordedPolicy(record.decisions)
+        players = [Player(id_num=i, name=f"Seat {i}", is_cpu=True, policy=self._policy)
+                   for i in range(record.num_players)]
+        deck = Deck(record.num_players, rng=random.Random(0))
+        deck.card_ids = array('b', reversed(record.deck_ids))  # Draw order -> pop-from-the-end order
+        deck.burned_card = CARD_BY_ID[record.burned_card_id] if record.burned_card_id is not None else None
+        self.round = _ReplayRound(players, deck, None, log_callback,
+                                  _RecordedGameOver(record.game_over_id, self._policy),
+                                  scheduler=ImmediateScheduler(), rng=_RecordedStart(record.starting_player))
+        self._checkpoints = {}  # turn -> (snapshot, decision position), every checkpoint_interval turns
+        self.last_turn = None  # Set when the decisions run out before the round is over (forfeit)
+        self._run(self.round.start_round)
+
+    @property
+    def turn(self):
+        return self.round.turn_count
+
+    @property
+    def finished(self):
+        return not self.round.round_active or self.turn == self.last_turn
+
+    def _run(self, entry, *args):
+        game_round = self.round
+        start_turn = game_round.turn_count
+        try:
+            entry(*args)
+        except _EndOfRecord:
+            self.last_turn = start_turn
+            self.seek(start_turn)
+            return
+        turn = game_round.turn_count
+        if game_round.round_active and turn % self.checkpoint_interval == 0 and turn not in self._checkpoints:
+            self._checkpoints[turn] = (game_round.snapshot(), self._policy.position)
+
+    def step(self):
+        # Plays one turn. Returns False once there is nothing left to play.
+        if self.finished:
+            return False
+        self.round.pause_at = self.round.turn_count + 1
+        self._run(self.round._queue_step, self.round._process_current_player_turn_start)
+        return not self.finished
+
+    def seek(self, turn):
+        # Leaves the round after `turn` turns (or at its end, if it is shorter). Events are only
+        # emitted for turns played with step(), not for the ones replayed to get here.
+        game_round = self.round
+        best = max((t for t in self._checkpoints if t <= turn), default=None)
+        if best is not None and (game_round.turn_count > turn or not game_round.round_active
+                                 or game_round.turn_count < best):
+            snapshot, position = self._checkpoints[best]
+            game_round.restore(snapshot)
+            self._policy.position = position
+        events_enabled = game_round.events.enabled
+        game_round.events.enabled = False
+        try:
+            while game_round.turn_count < turn and self.step():
+                pass
+        finally:
+            game_round.events.enabled = events_enabled
+        return game_round.turn_count
+
+
+def verify(path):
+    # Replays every round of a record file; returns (rounds, mismatching round indexes).
+    mismatches = []
+    rounds = 0
+    with RecordReader(path) as reader:
+        for index, record in enumerate(reader):
+            rounds += 1
+            replayer = Replayer(record, checkpoint_interval=64)
+            while replayer.step():
+                pass
+            game_round = replayer.round
+            winner_ids = tuple(p.id for p in game_round.round_winners)
+            game_over_id = game_round.game_over_winner.id if game_round.game_over_pending_from_round else None
+            if replayer.last_turn is None and (winner_ids, game_over_id) != (record.winner_ids, record.game_over_id):
+                mismatches.append(index)
+    return rounds, mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay rounds from a game record file.")
+    parser.add_argument('path')
+    parser.add_argument('--round', type=int, default=0, help="Index of the round in the file.")
+    parser.add_argument('--turn', type=int, default=0, help="Start the log after this many turns.")
+    parser.add_argument('--verify', action='store_true', help="Replay every round and compare the winners "
+                                                                   "and any mid-round game over.")
+    args = parser.parse_args(argv)
+
+    if args.verify:
+        rounds, mismatches = verify(args.path)
+        print(f"Replayed {rounds} rounds: {len(mismatches)} mismatches {mismatches[:10]}")
+        return
+
+    with RecordReader(args.path) as reader:
+        record = next((r for index, r in enumerate(reader) if index == args.round), None)
+    if record is None:
+        parser.error(f"{args.path} has no round {args.round}")
+    replayer = Replayer(record, log_callback=print)
+    replayer.seek(args.turn)
+    print(f"--- After turn {replayer.turn} ---")
+    for player in replayer.round.players:
+        status = "out" if player.is_eliminated else ", ".join(player.get_hand_card_names())
+        print(f"Seat {player.id}: {status} | discards: {[c.name for c in player.discard_pile]}")
+    while replayer.step():
+        pass
+
+
+if __name__ == '__main__':
+    main()
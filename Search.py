@@ -0,0 +1,287 @@
+# search.py
+# Information-set Monte Carlo Tree Search CPU. Each iteration restores a private copy of the real
+# round, deals the cards the searching player cannot see (opponent hands, deck order, burned card)
+# at random, then plays the round out through the normal GameRound engine. One tree is shared by
+# all determinizations; children are keyed by the choice (card name, target id, guessed value).
+#
+#   python Search.py --players 4 --rounds 200 --budget 0.05 --opponents random
+
+import argparse
+import math
+import random
+import time
+from array import array
+
+from Logic import (
+    Player, Deck, GameRound, RoundUI, ImmediateScheduler, CpuPolicy, RandomPolicy,
+    CARD_BY_ID, CARD_PROTOTYPES, load_card_prototypes
+)
+from Policy import BeliefTracker, HeuristicPolicy, hidden_hand_seats, make_policy
+
+
+class _Node:
+    __slots__ = ('children', 'visits', 'reward', 'available')
+
+    def __init__(self):
+        self.children = {}  # choice key -> _Node
+        self.visits = 0
+        self.reward = 0.0  # Summed from the point of view of the player who made the choice
+        self.available = 0  # Iterations in which this choice was legal (ISMCTS availability count)
+
+
+def _card_key(card):
+    return card.name
+
+
+def _target_key(target):
+    return target.id
+
+
+def _guess_key(value):
+    return value
+
+
+class _TreeWalker(CpuPolicy):
+    # Policy installed on every seat of the search round. Walks the tree while it can, expands one
+    # new node per iteration, then hands over to the rollout policy.
+    def __init__(self, exploration, rollout_policy, rng):
+        self.exploration = exploration
+        self.rollout_policy = rollout_policy
+        self.node = None
+        self.path = []  # (node, player id) pairs to back up
+        self.rng = rng
+
+    def reset(self, root):
+        self.node = root
+        self.path = []
+
+    def _select(self, player, options, key):
+        node = self.node
+        children = node.children
+        untried = None
+        best = best_score = None
+        for option in options:
+            child = children.get(key(option))
+            if child is None:
+                if untried is None:
+                    untried = []
+                untried.append(option)
+                continue
+            child.available += 1
+            if untried is None:
+                score = child.reward / child.visits + self.exploration * math.sqrt(
+                    math.log(child.available) / child.visits)
+                if best is None or score > best_score:
+                    best, best_score = option, score
+        if untried is not None:
+            best = untried[0] if len(untried) == 1 else self.rng.choice(untried)
+            child = _Node()
+            child.available = 1
+            children[key(best)] = child
+            self.node = None  # Expanded: the rest of the iteration is a rollout
+        else:
+            child = children[key(best)]
+            self.node = child
+        self.path.append((child, player.id))
+        return best
+
+    def choose_card(self, game_round, player, playable_cards):
+        if self.node is None:
+            return self.rollout_policy.choose_card(game_round, player, playable_cards)
+        if len(playable_cards) > 1 and game_round.rules.has('Princess'):
+            without_princess = [c for c in playable_cards if c.name != 'Princess']
+            if without_princess:
+                playable_cards = without_princess
+        return self._select(player, playable_cards, _card_key)
+
+    def choose_target(self, game_round, player, card_played, valid_targets):
+        if self.node is None:
+            return self.rollout_policy.choose_target(game_round, player, card_played, valid_targets)
+        return self._select(player, valid_targets, _target_key)
+
+    def choose_guess(self, game_round, player, target_player, possible_values):
+        if self.node is None:
+            return self.rollout_policy.choose_guess(game_round, player, target_player, possible_values)
+        return self._select(player, possible_values, _guess_key)
+
+
+class IsmctsPolicy(CpuPolicy):
+    # Searches when asked for a card, then answers the target/guess questions of the same turn from
+    # the most visited branch below the chosen card. Decisions the search did not reach fall back
+    # to HeuristicPolicy. time_budget is seconds per move; max_iterations makes a search repeatable.
+    uses_beliefs = True  # Known opponent hands are kept fixed when determinizing, if a tracker is present
+
+    def __init__(self, time_budget=0.05, max_iterations=None, exploration=0.7, seed=None, rollout_policy=None):
+        self.time_budget = time_budget
+        self.max_iterations = max_iterations
+        self.rng = random.Random(seed)
+        self.fallback = HeuristicPolicy()
+        self._walker = _TreeWalker(exploration, rollout_policy if rollout_policy is not None else RandomPolicy(),
+                                   self.rng)
+        self._search_rounds = {}  # player count -> GameRound reused between searches
+        self._plan = None  # Node below the chosen card for the turn being played
+        self._plan_turn = None
+        self.searches = 0
+        self.iterations = 0
+        self.elapsed = 0.0
+        self.last_iterations = 0
+        self.last_elapsed = 0.0
+        self._cancel_requested = False
+
+    def cancel(self):
+        # May be called from another thread; the search loop stops at the next iteration.
+        self._cancel_requested = True
+
+    def _search_round(self, num_players):
+        search_round = self._search_rounds.get(num_players)
+        if search_round is None:
+            players = [Player(id_num=i, name=f"Search {i}", is_cpu=True, policy=self._walker)
+                       for i in range(num_players)]
+            deck = Deck(num_players, rng=self.rng)
+            search_round = GameRound(players, deck, None, None, RoundUI(),
+                                     scheduler=ImmediateScheduler(), rng=self.rng)
+            self._search_rounds[num_players] = search_round
+        return search_round
+
+    def _determinize(self, search_round, observer_id, known_hands):
+        # Everything the observer has not seen goes back into one pool and is dealt out again.
+        pool = list(search_round.deck.card_ids)
+        burned = search_round.shared_burned_card_ref['card']
+        if burned is not None:
+            pool.append(burned.card_id)
+        players = search_round.players
+        hidden = [players[seat] for seat in hidden_hand_seats([p.hand for p in players], observer_id, known_hands)]
+        for player in hidden:
+            pool.extend(card.card_id for card in player.hand)
+        self.rng.shuffle(pool)
+        for player in hidden:
+            player.hand = [CARD_BY_ID[pool.pop()] for _ in player.hand]
+        if burned is not None:
+            search_round.shared_burned_card_ref['card'] = CARD_BY_ID[pool.pop()]
+        search_round.deck.card_ids = array('b', pool)
+
+    def _rewards(self, search_round):
+        rewards = [0.0] * len(search_round.players)
+        winners = search_round.round_winners
+        for winner in winners:
+            rewards[winner.id] = 1.0 / len(winners)
+        return rewards
+
+    def search(self, game_round, player):
+        # Returns the root node; its children are the card choices for `player`.
+        search_round = self._search_round(len(game_round.players))
+        start_state = game_round.snapshot()
+        tracker = game_round.belief_tracker
+        belief = tracker.states.get(player.id) if tracker is not None else None
+        known_hands = belief.known_hands if belief is not None else {}
+        seat = search_round.players[player.id]
+        walker = self._walker
+        root = _Node()
+        self._cancel_requested = False
+
+        start = time.perf_counter()
+        deadline = start + self.time_budget
+        iterations = 0
+        while True:
+            search_round.restore(start_state)
+            self._determinize(search_round, player.id, known_hands)
+            walker.reset(root)
+            search_round._queue_step(search_round._cpu_play_turn, seat)
+            rewards = self._rewards(search_round)
+            for node, player_id in walker.path:
+                node.visits += 1
+                node.reward += rewards[player_id]
+            iterations += 1
+            if self._cancel_requested:
+                break
+            if self.max_iterations is not None:
+                if iterations >= self.max_iterations:
+                    break
+            elif time.perf_counter() >= deadline:
+                break
+        elapsed = time.perf_counter() - start
+
+        self.searches += 1
+        self.iterations += iterations
+        self.elapsed += elapsed
+        self.last_iterations = iterations
+        self.last_elapsed = elapsed
+        return root
+
+    def _most_visited(self, node, options, key):
+        best = best_child = None
+        for option in options:
+            child = node.children.get(key(option))
+            if child is not None and (best_child is None or child.visits > best_child.visits):
+                best, best_child = option, child
+        return best, best_child
+
+    def choose_card(self, game_round, player, playable_cards):
+        self._plan = None
+        if len(playable_cards) > 1 and playable_cards[0].name == playable_cards[1].name:
+            choice, child = playable_cards[0], None  # Nothing to decide; targets fall back to the heuristic
+        else:
+            root = self.search(game_round, player)
+            choice, child = self._most_visited(root, playable_cards, _card_key)
+            if choice is None:
+                return self.fallback.choose_card(game_round, player, playable_cards)
+        self._plan = child
+        self._plan_turn = (game_round, game_round.turn_count, player.id)
+        return choice
+
+    def _planned(self, game_round, player, options, key):
+        if self._plan is None or self._plan_turn != (game_round, game_round.turn_count, player.id):
+            return None
+        choice, self._plan = self._most_visited(self._plan, options, key)
+        return choice
+
+    def choose_target(self, game_round, player, card_played, valid_targets):
+        choice = self._planned(game_round, player, valid_targets, _target_key)
+        if choice is None:
+            return self.fallback.choose_target(game_round, player, card_played, valid_targets)
+        return choice
+
+    def choose_guess(self, game_round, player, target_player, possible_values):
+        choice = self._planned(game_round, player, possible_values, _guess_key)
+        if choice is None:
+            return self.fallback.choose_guess(game_round, player, target_player, possible_values)
+        return choice
+
+    def report(self):
+        rate = self.iterations / self.elapsed if self.elapsed > 0 else 0.0
+        per_search = self.iterations / self.searches if self.searches else 0.0
+        return (f"ISMCTS: {self.searches} searches, {self.iterations} rollouts in {self.elapsed:.2f}s "
+                f"({rate:,.0f} rollouts/sec, {per_search:.0f} per move)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play rounds with an ISMCTS CPU in seat 0 and report its strength and speed.")
+    parser.add_argument('--players', type=int, default=4, choices=range(2, 9))
+    parser.add_argument('--rounds', type=int, default=200)
+    parser.add_argument('--budget', type=float, default=0.05, help="Search time per move in seconds.")
+    parser.add_argument('--opponents', default='random', help="CPU policy for the other seats.")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if not CARD_PROTOTYPES:
+        load_card_prototypes()
+    rng = random.Random(args.seed)
+    searcher = IsmctsPolicy(time_budget=args.budget, seed=args.seed)
+    players = [Player(id_num=0, name="ISMCTS", is_cpu=True, policy=searcher)]
+    players += [Player(id_num=i, name=f"CPU {i}", is_cpu=True, policy=make_policy(args.opponents))
+                for i in range(1, args.players)]
+    wins = 0.0
+    for _ in range(args.rounds):
+        deck = Deck(args.players, rng=rng)
+        deck.burn_one_card(args.players)
+        game_round = GameRound(players, deck, None, None, scheduler=ImmediateScheduler(), rng=rng,
+                               belief_tracker=BeliefTracker())
+        game_round.start_round()
+        if players[0] in game_round.round_winners:
+            wins += 1.0 / len(game_round.round_winners)
+    print(f"Seat 0 round share: {wins / args.rounds:.2%} (fair share {1 / args.players:.2%})")
+    print(searcher.report())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+# simulation.py
+# Headless Monte Carlo harness: plays complete all-CPU game sessions through the real
+# Player/Deck/GameRound engine and aggregates statistics.
+#
+#   python Simulation.py --players 4 --sessions 10000 --workers 8 --seed 42 --policies heuristic,random
+#
+# Work is split into fixed-size shards. Each shard gets its own random.Random seeded from the
+# master seed, so results are identical for a given seed regardless of how many workers run them.
+# --record PATH writes every round to PATH.<shard> in the Record.py format; --export DIR writes
+# per-turn columns to DIR.<shard>/ (see Export.py). --profile adds per-phase engine timings
+# (see Timing.py) to the report; --profile-dump PATH also writes them as JSON.
+
+import argparse
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from Logic import (
+    Player, Deck, GameRound, RoundUI, ImmediateScheduler,
+    CARD_PROTOTYPES, load_card_prototypes, tokens_to_win_for_player_count
+)
+from Export import ColumnWriter, TurnExporter, TURN_COLUMNS
+from Policy import BeliefTracker, make_policy
+from Record import RecordWriter, RoundRecorder
+from Timing import PhaseStats
+
+
+class SimulationStats:
+    def __init__(self, num_players):
+        self.num_players = num_players
+        self.sessions = 0
+        self.rounds = 0
+        self.session_wins = Counter()  # seat -> sessions won
+        self.round_wins = Counter()  # seat -> rounds won (ties credit every tied seat)
+        self.round_lengths = Counter()  # turns played -> number of rounds
+        self.elimination_causes = Counter()  # card name -> eliminations caused
+        self.elapsed = 0.0
+        self.seed = None
+        self.phase_stats = None  # Timing.PhaseStats when profiling
+
+    def record_round(self, game_round):
+        self.rounds += 1
+        self.round_lengths[game_round.turn_count] += 1
+        for winner in game_round.round_winners:
+            self.round_wins[winner.id] += 1
+        for _, cause in game_round.eliminations:
+            self.elimination_causes[cause or 'Unknown'] += 1
+
+    def record_session(self, winner_seat):
+        self.sessions += 1
+        if winner_seat is not None:
+            self.session_wins[winner_seat] += 1
+
+    def report(self):
+        lines = [f"Players: {self.num_players} | Sessions: {self.sessions} | Rounds: {self.rounds} | "
+                 f"Elapsed: {self.elapsed:.2f}s | Seed: {self.seed}"]
+        if self.elapsed > 0:
+            lines.append(f"Throughput: {self.sessions / self.elapsed:.1f} games/sec, "
+                         f"{self.rounds / self.elapsed:.1f} rounds/sec")
+        lines.append("Win rate per seat (sessions | rounds):")
+        for seat in range(self.num_players):
+            session_rate = self.session_wins[seat] / self.sessions if self.sessions else 0.0
+            round_rate = self.round_wins[seat] / self.rounds if self.rounds else 0.0
+            lines.append(f"  Seat {seat}: {session_rate:6.2%} | {round_rate:6.2%}")
+        if self.round_lengths:
+            total_turns = sum(length * n for length, n in self.round_lengths.items())
+            lines.append(f"Round length (turns): min {min(self.round_lengths)}, "
+                         f"mean {total_turns / self.rounds:.2f}, max {max(self.round_lengths)}")
+            for length in sorted(self.round_lengths):
+                lines.append(f"  {length:3d}: {self.round_lengths[length]}")
+        lines.append("Eliminations by card:")
+        for card_name, n in self.elimination_causes.most_common():
+            lines.append(f"  {card_name}: {n}")
+        if self.phase_stats is not None:
+            lines.append("Engine phases:")
+            lines.append(self.phase_stats.report())
+        return "\n".join(lines)
+
+    def merge(self, other):
+        self.sessions += other.sessions
+        self.rounds += other.rounds
+        self.session_wins.update(other.session_wins)
+        self.round_wins.update(other.round_wins)
+        self.round_lengths.update(other.round_lengths)
+        self.elimination_causes.update(other.elimination_causes)
+        if other.phase_stats is not None:
+            if self.phase_stats is None:
+                self.phase_stats = PhaseStats()
+            self.phase_stats.merge(other.phase_stats)
+        return self
+
+
+class _SessionUI(RoundUI):
+    # Pays round tokens and remembers the first seat to reach the target.
+    def __init__(self, tokens_to_win):
+        self.tokens_to_win = tokens_to_win
+        self.winner = None
+
+    def award_round_tokens(self, winners):
+        for winner in winners:
+            if winner is None:
+                continue
+            winner.tokens += 1
+            if winner.tokens >= self.tokens_to_win and self.winner is None:
+                self.winner = winner
+
+    def check_game_over_token(self, player):
+        return player.tokens >= self.tokens_to_win
+
+    def game_over(self, winner):
+        if self.winner is None:
+            self.winner = winner
+
+
+def play_session(num_players, stats=None, rng=None, policy_names=None, recorder=None, exporter=None,
+                 phase_stats=None):
+    # Plays rounds until a seat reaches the token target. Returns the winning seat id.
+    # policy_names is cycled over the seats (e.g. ['heuristic', 'random']); None keeps RandomPolicy.
+    players = [Player(id_num=i, name=f"CPU {i}", is_cpu=True,
+                      policy=make_policy(policy_names[i % len(policy_names)]) if policy_names else None)
+               for i in range(num_players)]
+    session_ui = _SessionUI(tokens_to_win_for_player_count(num_players))
+    scheduler = ImmediateScheduler()
+    uses_beliefs = any(p.policy is not None and p.policy.uses_beliefs for p in players)
+
+    while session_ui.winner is None:
+        deck = Deck(num_players, rng=rng)
+        deck.burn_one_card(num_players)
+        game_round = GameRound(players, deck, None, None, session_ui, scheduler=scheduler, rng=rng,
+                               belief_tracker=BeliefTracker() if uses_beliefs else None, recorder=recorder,
+                               phase_stats=phase_stats)
+        if exporter is not None:
+            exporter.watch(game_round)
+        game_round.start_round()
+        if stats is not None:
+            stats.record_round(game_round)
+
+    winner_seat = session_ui.winner.id
+    if stats is not None:
+        stats.record_session(winner_seat)
+    return winner_seat
+
+
+def shard_seeds(master_seed, num_shards):
+    seed_stream = random.Random(master_seed)
+    return [seed_stream.getrandbits(64) for _ in range(num_shards)]
+
+
+def run_shard(num_players, num_sessions, seed, policy_names=None, record_path=None, export_dir=None,
+              profile=False):
+    # Entry point for pool workers: each call owns its own seeded stream (and output files, if any).
+    if not CARD_PROTOTYPES:
+        load_card_prototypes()
+    rng = random.Random(seed)
+    stats = SimulationStats(num_players)
+    if profile:
+        stats.phase_stats = PhaseStats()
+    writer = RecordWriter(record_path) if record_path is not None else None
+    recorder = RoundRecorder(writer, seed) if writer is not None else None
+    exporter = TurnExporter(ColumnWriter(export_dir, TURN_COLUMNS)) if export_dir is not None else None
+    try:
+        for _ in range(num_sessions):
+            play_session(num_players, stats, rng, policy_names, recorder, exporter, stats.phase_stats)
+    finally:
+        if writer is not None:
+            writer.close()
+        if exporter is not None:
+            exporter.close()
+    return stats
+
+
+def run_simulation(num_players, num_sessions, workers=1, seed=None, shard_size=250, policy_names=None,
+                   record_path=None, export_dir=None, profile=False):
+    if seed is None:
+        seed = random.randrange(2 ** 63)
+    shard_sizes = [shard_size] * (num_sessions // shard_size)
+    if num_sessions % shard_size:
+        shard_sizes.append(num_sessions % shard_size)
+    seeds = shard_seeds(seed, len(shard_sizes))
+    record_paths = [f"{record_path}.{i:05d}" if record_path is not None else None for i in range(len(shard_sizes))]
+    export_dirs = [f"{export_dir}.{i:05d}" if export_dir is not None else None for i in range(len(shard_sizes))]
+
+    stats = SimulationStats(num_players)
+    start = time.perf_counter()
+    if workers <= 1 or len(shard_sizes) <= 1:
+        for size, shard_seed, shard_record_path, shard_export_dir in zip(shard_sizes, seeds, record_paths, export_dirs):
+            stats.merge(run_shard(num_players, size, shard_seed, policy_names, shard_record_path, shard_export_dir,
+                                  profile))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for shard_stats in pool.map(run_shard, [num_players] * len(shard_sizes), shard_sizes, seeds,
+                                        [policy_names] * len(shard_sizes), record_paths, export_dirs,
+                                        [profile] * len(shard_sizes)):
+                stats.merge(shard_stats)
+    stats.elapsed = time.perf_counter() - start
+    stats.seed = seed
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate all-CPU Love Letter game sessions.")
+    parser.add_argument('--players', type=int, default=4, choices=range(2, 9))
+    parser.add_argument('--sessions', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seed', type=int, default=None, help="Master seed; same seed gives identical results.")
+    parser.add_argument('--shard-size', type=int, default=250, help="Sessions per worker task.")
+    parser.add_argument('--policies', default=None,
+                        help="Comma-separated CPU policies cycled over the seats, e.g. heuristic,random or "
+                             "ismcts:0.01,endgame (seconds of search per move).")
+    parser.add_argument('--record', default=None, metavar='PATH',
+                        help="Write every round to PATH.<shard> as a binary game record.")
+    parser.add_argument('--export', default=None, metavar='DIR',
+                        help="Write per-turn columns to DIR.<shard>/ for analysis (see Export.py).")
+    parser.add_argument('--profile', action='store_true', help="Time every engine phase and report it.")
+    parser.add_argument('--profile-dump', default=None, metavar='PATH',
+                        help="Write the phase timings to PATH as JSON (implies --profile).")
+    args = parser.parse_args(argv)
+    policy_names = args.policies.split(',') if args.policies else None
+    if policy_names:
+        for name in policy_names:
+            make_policy(name)  # Fail fast on unknown names before starting workers
+    stats = run_simulation(args.players, args.sessions, args.workers, args.seed, args.shard_size, policy_names,
+                           args.record, args.export, args.profile or args.profile_dump is not None)
+    print(stats.report())
+    if args.profile_dump is not None:
+        stats.phase_stats.dump(args.profile_dump)
+
+
+if __name__ == '__main__':
+    main()
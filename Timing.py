@@ -0,0 +1,107 @@
+# timing.py
+# Opt-in per-phase timing for GameRound. Pass a PhaseStats as GameRound(..., phase_stats=...) and it
+# collects call counts and wall time for:
+#
+#   draw                    Deck.draw at the start of a turn
+#   cpu.card                policy.choose_card (on the think thread with ClockScheduler)
+#   cpu.target / cpu.guess / cpu.redraw   the other CPU decisions
+#   effect.<Card>           one card effect, from the effect table lookup to its return
+#   ui.<method>             every RoundUI call (ui.state_changed is the Kivy redraw)
+#   round_end.elimination / round_end.deck_out   winner scoring and token awards
+#
+# Times are inclusive: an effect's time contains the CPU decisions and UI callbacks it triggers.
+# Without a PhaseStats the engine pays one `is not None` check at each of these sites.
+#
+#   python Simulation.py --sessions 2000 --profile --profile-dump phases.json
+#   python Timing.py phases.json
+
+import argparse
+import json
+import time
+
+
+class PhaseStats:
+    def __init__(self):
+        self.phases = {}  # phase -> [calls, total ns, max ns]
+
+    def add(self, phase, elapsed_ns):
+        entry = self.phases.get(phase)
+        if entry is None:
+            self.phases[phase] = [1, elapsed_ns, elapsed_ns]
+            return
+        entry[0] += 1
+        entry[1] += elapsed_ns
+        if elapsed_ns > entry[2]:
+            entry[2] = elapsed_ns
+
+    def call(self, phase, func, *args):
+        start = time.perf_counter_ns()
+        try:
+            return func(*args)
+        finally:
+            self.add(phase, time.perf_counter_ns() - start)
+
+    def wrap(self, phase, func):
+        def timed(*args):
+            return self.call(phase, func, *args)
+        return timed
+
+    def wrap_ui(self, ui):
+        return _TimedUI(self, ui)
+
+    def merge(self, other):
+        for phase, (calls, total_ns, max_ns) in other.phases.items():
+            entry = self.phases.setdefault(phase, [0, 0, 0])
+            entry[0] += calls
+            entry[1] += total_ns
+            entry[2] = max(entry[2], max_ns)
+        return self
+
+    def to_dict(self):
+        return {phase: {'calls': calls, 'total_ns': total_ns, 'max_ns': max_ns}
+                for phase, (calls, total_ns, max_ns) in self.phases.items()}
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        for phase, entry in data.items():
+            stats.phases[phase] = [entry['calls'], entry['total_ns'], entry['max_ns']]
+        return stats
+
+    def dump(self, path):
+        with open(path, 'w') as dump_file:
+            json.dump(self.to_dict(), dump_file, indent=1, sort_keys=True)
+
+    def report(self):
+        lines = [f"{'phase':28s} {'calls':>10s} {'total ms':>10s} {'mean us':>9s} {'max us':>9s}"]
+        for phase, (calls, total_ns, max_ns) in sorted(self.phases.items(), key=lambda item: -item[1][1]):
+            lines.append(f"{phase:28s} {calls:10d} {total_ns / 1e6:10.1f} {total_ns / calls / 1e3:9.1f} "
+                         f"{max_ns / 1e3:9.1f}")
+        return "\n".join(lines)
+
+
+class _TimedUI:
+    # Stands in for a Logic.RoundUI; every method is timed as 'ui.<name>' on first use.
+    def __init__(self, stats, ui):
+        self._stats = stats
+        self._ui = ui
+
+    def __getattr__(self, name):
+        method = self._stats.wrap('ui.' + name, getattr(self._ui, name))
+        setattr(self, name, method)
+        return method
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print (and combine) PhaseStats dumps.")
+    parser.add_argument('paths', nargs='+')
+    args = parser.parse_args(argv)
+    stats = PhaseStats()
+    for path in args.paths:
+        with open(path) as dump_file:
+            stats.merge(PhaseStats.from_dict(json.load(dump_file)))
+    print(stats.report())
+
+
+if __name__ == '__main__':
+    main()
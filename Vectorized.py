@@ -0,0 +1,283 @@
+# vectorized.py
+# Batch round simulator for the classic 16-card deck (2-4 players). Plays thousands of rounds in
+# lockstep with NumPy arrays, using the same rules and the same uniformly random CPU behaviour as
+# GameRound, so its statistics can be compared with the object engine (see cross_check).
+# Requires numpy, which the game itself does not need: pip install -r requirements-analysis.txt
+#
+#   python Vectorized.py --players 4 --rounds 200000 --cross-check 20000
+
+import argparse
+import random
+import time
+from collections import Counter
+
+import numpy as np
+
+from Logic import (
+    Player, Deck, GameRound, ImmediateScheduler, CARDS_DATA_RAW, CARD_PROTOTYPES, load_card_prototypes
+)
+
+# In the classic deck every card has a distinct value, so the value doubles as the card id. 0 = no card.
+GUARD, PRIEST, BARON, HANDMAID, PRINCE, KING, COUNTESS, PRINCESS = range(1, 9)
+CLASSIC_CARD_NAMES = {data['value']: name for name, data in CARDS_DATA_RAW.items() if data['count_classic'] > 0}
+CLASSIC_TEMPLATE = np.array([data['value'] for data in CARDS_DATA_RAW.values()
+                             for _ in range(data['count_classic'])], dtype=np.int8)
+GUARD_GUESSES = np.array(sorted(value for value in CLASSIC_CARD_NAMES if value != GUARD), dtype=np.int8)
+DECK_SIZE = len(CLASSIC_TEMPLATE)
+
+
+class VectorStats:
+    def __init__(self, num_players):
+        self.num_players = num_players
+        self.rounds = 0
+        self.round_wins = np.zeros(num_players, dtype=np.int64)  # by seat
+        self.first_player_wins = 0  # rounds won by the seat that moved first
+        self.round_lengths = Counter()  # turns played -> rounds
+        self.elimination_causes = Counter()  # card name -> eliminations caused
+        self.elapsed = 0.0
+
+    def merge(self, other):
+        self.rounds += other.rounds
+        self.round_wins += other.round_wins
+        self.first_player_wins += other.first_player_wins
+        self.round_lengths.update(other.round_lengths)
+        self.elimination_causes.update(other.elimination_causes)
+        return self
+
+    def mean_round_length(self):
+        return sum(length * n for length, n in self.round_lengths.items()) / self.rounds if self.rounds else 0.0
+
+    def report(self):
+        lines = [f"Players: {self.num_players} | Rounds: {self.rounds} | Elapsed: {self.elapsed:.2f}s"]
+        if self.elapsed > 0:
+            lines.append(f"Throughput: {self.rounds / self.elapsed:.1f} rounds/sec")
+        for seat in range(self.num_players):
+            lines.append(f"  Seat {seat}: {self.round_wins[seat] / self.rounds:6.2%}")
+        lines.append(f"First player win rate: {self.first_player_wins / self.rounds:6.2%}")
+        lines.append(f"Mean round length: {self.mean_round_length():.3f} turns")
+        lines.append("Eliminations by card:")
+        for card_name, n in self.elimination_causes.most_common():
+            lines.append(f"  {card_name}: {n}")
+        return "\n".join(lines)
+
+
+def _pick_random(mask, rng):
+    # For each row, index of a uniformly chosen True column (-1 when the row has none).
+    counts = mask.sum(axis=1)
+    choice = (rng.random(len(mask)) * counts).astype(np.int64)
+    picked = (np.cumsum(mask, axis=1) > choice[:, None]).argmax(axis=1)
+    return np.where(counts > 0, picked, -1)
+
+
+def simulate_rounds(num_players, num_rounds, seed=None):
+    if not 2 <= num_players <= 4:
+        raise ValueError("The vectorized engine only covers the classic deck (2-4 players).")
+    rng = np.random.default_rng(seed)
+    games, seats = num_rounds, num_players
+    rows = np.arange(games)
+    stats = VectorStats(num_players)
+    start_time = time.perf_counter()
+
+    # Shuffle: one permutation of the template per game. Card 0 is burned, then one card is dealt per seat.
+    decks = CLASSIC_TEMPLATE[np.argsort(rng.random((games, DECK_SIZE)), axis=1)]
+    burned = decks[:, 0].copy()
+    hand = decks[:, 1:1 + seats].copy()
+    deck_pos = np.full(games, 1 + seats)
+    eliminated = np.zeros((games, seats), dtype=bool)
+    protected = np.zeros((games, seats), dtype=bool)
+    discard_sum = np.zeros((games, seats), dtype=np.int64)
+    winners = np.zeros((games, seats), dtype=bool)
+    current = rng.integers(0, seats, games)
+    first_player = current.copy()
+    turns = np.zeros(games, dtype=np.int64)
+    active = np.ones(games, dtype=bool)
+    causes = np.zeros(9, dtype=np.int64)
+
+    def eliminate(g, seat_idx, cause_values):
+        newly = ~eliminated[g, seat_idx]
+        eliminated[g, seat_idx] = True
+        np.add.at(causes, cause_values[newly], 1)
+
+    while active.any():
+        g = rows[active]
+        cur = current[g]
+        protected[g, cur] = False
+
+        # Deck out: compare remaining hands, then discard sums; every remaining tie wins.
+        out = deck_pos[g] >= DECK_SIZE
+        if out.any():
+            go = g[out]
+            alive = ~eliminated[go] & (hand[go] > 0)
+            values = np.where(alive, hand[go], -1)
+            best = alive & (values == values.max(axis=1, keepdims=True))
+            sums = np.where(best, discard_sum[go], -1)
+            winners[go] = best & (sums == sums.max(axis=1, keepdims=True))
+            active[go] = False
+            g, cur = g[~out], cur[~out]
+            if not len(g):
+                break
+
+        drawn = decks[g, deck_pos[g]]
+        deck_pos[g] += 1
+        turns[g] += 1
+        held = hand[g, cur]
+
+        # CPU card choice: Countess is forced by King/Prince, the Princess is never played
+        # voluntarily, otherwise either card with equal probability.
+        coin = rng.random(len(g)) < 0.5
+        play_drawn = np.where(held == PRINCESS, True, np.where(drawn == PRINCESS, False, coin))
+        held_forcing = (held == KING) | (held == PRINCE)
+        drawn_forcing = (drawn == KING) | (drawn == PRINCE)
+        play_drawn = np.where((drawn == COUNTESS) & held_forcing, True, play_drawn)
+        play_drawn = np.where((held == COUNTESS) & drawn_forcing, False, play_drawn)
+        played = np.where(play_drawn, drawn, held)
+        keep = np.where(play_drawn, held, drawn)
+        hand[g, cur] = keep
+        discard_sum[g, cur] += played
+
+        # Target pools, as in GameRound._get_valid_targets.
+        others = ~eliminated[g] & ~protected[g] & (hand[g] > 0)
+        others[np.arange(len(g)), cur] = False
+        prince_pool = ~eliminated[g] & ~protected[g]
+        prince_pool[np.arange(len(g)), cur] = True
+        target = np.where(played == PRINCE, _pick_random(prince_pool, rng), _pick_random(others, rng))
+        has_target = target >= 0
+        safe_target = np.where(has_target, target, 0)
+        target_card = hand[g, safe_target]
+
+        sel = (played == GUARD) & has_target
+        guesses = GUARD_GUESSES[rng.integers(0, len(GUARD_GUESSES), len(g))]
+        hit = sel & (target_card == guesses)
+        eliminate(g[hit], target[hit], np.full(hit.sum(), GUARD))
+
+        sel = (played == BARON) & has_target
+        lose_target = sel & (keep > target_card)
+        lose_self = sel & (target_card > keep)
+        eliminate(g[lose_target], target[lose_target], np.full(lose_target.sum(), BARON))
+        eliminate(g[lose_self], cur[lose_self], np.full(lose_self.sum(), BARON))
+
+        sel = played == HANDMAID
+        protected[g[sel], cur[sel]] = True
+
+        sel = (played == PRINCE) & has_target
+        if sel.any():
+            pg, pt = g[sel], target[sel]
+            discarded = hand[pg, pt]
+            discard_sum[pg, pt] += discarded
+            from_deck = deck_pos[pg] < DECK_SIZE
+            from_burned = ~from_deck & (burned[pg] > 0)
+            new_card = np.where(from_deck, decks[pg, np.minimum(deck_pos[pg], DECK_SIZE - 1)],
+                                np.where(from_burned, burned[pg], 0))
+            deck_pos[pg] += from_deck
+            burned[pg[from_burned]] = 0
+            hand[pg, pt] = new_card  # Also covers a target with no hand, who just draws
+            lost = discarded == PRINCESS
+            eliminate(pg[lost], pt[lost], np.full(lost.sum(), PRINCE))
+
+        sel = (played == KING) & has_target
+        kg, kc, kt = g[sel], cur[sel], target[sel]
+        hand[kg, kc], hand[kg, kt] = hand[kg, kt], hand[kg, kc].copy()
+
+        # Round end by elimination, otherwise advance to the next seat still in the round.
+        alive_count = (~eliminated[g]).sum(axis=1)
+        over = alive_count <= 1
+        if over.any():
+            go = g[over]
+            winners[go] = ~eliminated[go]
+            active[go] = False
+        g, cur = g[~over], cur[~over]
+        next_seat = cur.copy()
+        pending = np.ones(len(g), dtype=bool)
+        for offset in range(1, seats):
+            candidate = (cur + offset) % seats
+            take = pending & ~eliminated[g, candidate]
+            next_seat[take] = candidate[take]
+            pending &= ~take
+        current[g] = next_seat
+
+    stats.rounds = games
+    stats.round_wins += winners.sum(axis=0)
+    stats.first_player_wins = int(winners[rows, first_player].sum())
+    lengths, counts = np.unique(turns, return_counts=True)
+    stats.round_lengths.update(dict(zip(lengths.tolist(), counts.tolist())))
+    for value in CLASSIC_CARD_NAMES:
+        if causes[value]:
+            stats.elimination_causes[CLASSIC_CARD_NAMES[value]] += int(causes[value])
+    stats.elapsed = time.perf_counter() - start_time
+    return stats
+
+
+def simulate_rounds_with_game_round(num_players, num_rounds, seed=None):
+    # Same statistics from the object engine, one independent round at a time.
+    if not CARD_PROTOTYPES:
+        load_card_prototypes()
+    rng = random.Random(seed)
+    scheduler = ImmediateScheduler()
+    stats = VectorStats(num_players)
+    start_time = time.perf_counter()
+    for _ in range(num_rounds):
+        players = [Player(id_num=i, name=f"CPU {i}", is_cpu=True) for i in range(num_players)]
+        deck = Deck(num_players, rng=rng)
+        deck.burn_one_card(num_players)
+        game_round = GameRound(players, deck, None, None, scheduler=scheduler, rng=rng)
+        game_round.start_round()
+        stats.rounds += 1
+        stats.round_lengths[game_round.turn_count] += 1
+        for winner in game_round.round_winners:
+            stats.round_wins[winner.id] += 1
+            if winner.id == game_round.starting_player_idx:
+                stats.first_player_wins += 1
+        for _, cause in game_round.eliminations:
+            stats.elimination_causes[cause] += 1
+    stats.elapsed = time.perf_counter() - start_time
+    return stats
+
+
+def cross_check(num_players, num_rounds, seed=None, z=4.0):
+    # Compares the two engines on rates that any rules mismatch would shift. Each rate must agree
+    # within z standard errors of the difference. Returns (ok, list of (metric, vector, object, limit)).
+    vector = simulate_rounds(num_players, num_rounds, seed)
+    reference = simulate_rounds_with_game_round(num_players, num_rounds, seed)
+
+    def rate_check(name, a, b, per_round_count=False):
+        pa, pb = a / vector.rounds, b / reference.rounds
+        if per_round_count:  # Can exceed one per round; use a Poisson variance
+            variance = a / vector.rounds ** 2 + b / reference.rounds ** 2
+        else:
+            pooled = (a + b) / (vector.rounds + reference.rounds)
+            variance = pooled * (1 - pooled) * (1 / vector.rounds + 1 / reference.rounds)
+        return name, pa, pb, max(z * variance ** 0.5, 1e-9)
+
+    checks = [rate_check(f"seat {seat} win rate", vector.round_wins[seat], reference.round_wins[seat])
+              for seat in range(num_players)]
+    checks.append(rate_check("first player win rate", vector.first_player_wins, reference.first_player_wins))
+    for card_name in sorted(set(vector.elimination_causes) | set(reference.elimination_causes)):
+        checks.append(rate_check(f"{card_name} eliminations per round",
+                                 vector.elimination_causes[card_name], reference.elimination_causes[card_name],
+                                 per_round_count=True))
+    for length in sorted(set(vector.round_lengths) | set(reference.round_lengths)):
+        checks.append(rate_check(f"rounds lasting {length} turns",
+                                 vector.round_lengths[length], reference.round_lengths[length]))
+    ok = all(abs(pa - pb) <= limit for _, pa, pb, limit in checks)
+    return ok, checks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vectorized classic-deck Love Letter round simulator.")
+    parser.add_argument('--players', type=int, default=4, choices=range(2, 5))
+    parser.add_argument('--rounds', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--cross-check', type=int, default=0, metavar='ROUNDS',
+                        help="Also compare against GameRound over this many rounds.")
+    args = parser.parse_args(argv)
+    print(simulate_rounds(args.players, args.rounds, args.seed).report())
+    if args.cross_check:
+        ok, checks = cross_check(args.players, args.cross_check, args.seed)
+        for name, pa, pb, limit in checks:
+            flag = "" if abs(pa - pb) <= limit else "  <-- MISMATCH"
+            print(f"  {name}: vector {pa:.4f} | GameRound {pb:.4f} | limit {limit:.4f}{flag}")
+        print("Cross-check", "passed" if ok else "FAILED")
+
+
+if __name__ == '__main__':
+    main()